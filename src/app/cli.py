@@ -1,10 +1,12 @@
 import typer
 from rich.console import Console
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+from rich.table import Table
 from pathlib import Path
-from src.app.dag import SelfHealingDAG
 from src.app.config import Config
+import json
+import os
 import sys
 
 app = typer.Typer()
@@ -28,10 +30,10 @@ def run(
         help="Enable interactive fallback mode"
     ),
     temperature: float = typer.Option(
-        1.0,
+        None,
         "--temperature",
         "-t",
-        help="Temperature for probability calibration"
+        help="Temperature for probability calibration (defaults to the snapshot's calibrated value or 1.0)"
     )
 ):
     console.print(Panel.fit(
@@ -45,6 +47,8 @@ def run(
         console.print("[yellow]Please train the model first using: make train[/yellow]")
         raise typer.Exit(1)
     
+    from src.app.dag import SelfHealingDAG
+    
     console.print(f"\n[green]Loading model from: {model_path}[/green]")
     
     with Progress(
@@ -58,11 +62,12 @@ def run(
             user_input_callback=user_input_callback if interactive else None,
             interactive=interactive
         )
-        dag.set_temperature(temperature)
+        if temperature is not None:
+            dag.set_temperature(temperature)
         progress.update(task, completed=True)
     
     console.print(f"[green]✓ Model loaded successfully![/green]")
-    console.print(f"[dim]Temperature: {temperature} | Interactive: {interactive}[/dim]\n")
+    console.print(f"[dim]Temperature: {dag.inference_node.temperature} | Interactive: {interactive}[/dim]\n")
     
     console.print("[bold]Enter text to classify (or 'quit' to exit):[/bold]\n")
     
@@ -95,6 +100,14 @@ def run(
             
             console.print(f"\n[bold green]Final Decision:[/bold green] {result['final_label']} [dim](via {result['decision_via']})[/dim]")
             console.print(f"[dim]Request ID: {result['request_id']}[/dim]")
+            
+            for name, task_result in (result.get('tasks') or {}).items():
+                if name == dag.inference_node.primary_task:
+                    continue
+                console.print(
+                    f"  {name}: [yellow]{task_result['final_label']}[/yellow] "
+                    f"({task_result['confidence']:.1%}, via {task_result['decision_via']})"
+                )
         
         except KeyboardInterrupt:
             console.print("\n\n[cyan]Interrupted. Goodbye![/cyan]")
@@ -109,6 +122,17 @@ def logs(
     lines: int = typer.Option(10, "--lines", "-n", help="Number of log lines to show"),
     json_format: bool = typer.Option(False, "--json", "-j", help="Show JSON logs")
 ):
+    if json_format and Config.LOG_STORAGE == "compact":
+        from src.app.utils.log_store import tail_entries
+        entries = tail_entries(lines)
+        if not entries:
+            console.print(f"[yellow]No logs found at {Config.COMPACT_LOG_CONFIG['directory']}[/yellow]")
+            return
+        console.print(f"\n[bold cyan]Last {lines} log entries:[/bold cyan]\n")
+        for entry in entries:
+            console.print(json.dumps(entry))
+        return
+    
     log_file = Config.LOG_JSONL_FILE if json_format else Config.LOG_FILE
     
     if not log_file.exists():
@@ -122,5 +146,582 @@ def logs(
         for line in log_lines[-lines:]:
             console.print(line.strip())
 
+@app.command("classify-file")
+def classify_file(
+    input_path: str = typer.Argument(..., help="JSONL or CSV file with texts to classify"),
+    output_path: str = typer.Argument(..., help="JSONL file to write results to"),
+    model_path: str = typer.Option(
+        str(Config.CHECKPOINTS_DIR / "model"),
+        "--model-path",
+        "-m",
+        help="Path to the trained model"
+    ),
+    text_field: str = typer.Option("text", "--text-field", help="Field/column holding the text"),
+    id_field: str = typer.Option(None, "--id-field", help="Field/column copied to the output as id"),
+    batch_size: int = typer.Option(None, "--batch-size", "-b", help="Inference batch size (defaults to tuned profile)"),
+    fallback_workers: int = typer.Option(
+        Config.BULK_CONFIG["fallback_workers"],
+        "--fallback-workers",
+        help="Threads running the fallback stage in parallel"
+    ),
+    restart: bool = typer.Option(False, "--restart", help="Ignore any checkpoint and start from the beginning"),
+    temperature: float = typer.Option(None, "--temperature", "-t", help="Temperature for probability calibration")
+):
+    from src.app.dag import SelfHealingDAG
+    from src.app.utils.bulk import BulkClassifier
+    
+    if not Path(input_path).exists():
+        console.print(f"[red]Error: Input not found at {input_path}[/red]")
+        raise typer.Exit(1)
+    if not Path(model_path).exists():
+        console.print(f"[red]Error: Model not found at {model_path}[/red]")
+        raise typer.Exit(1)
+    
+    dag = SelfHealingDAG(model_path=model_path, interactive=False)
+    if temperature is not None:
+        dag.set_temperature(temperature)
+    classifier = BulkClassifier(
+        dag,
+        input_path,
+        output_path,
+        text_field=text_field,
+        id_field=id_field,
+        batch_size=batch_size,
+        fallback_workers=fallback_workers
+    )
+    if restart:
+        classifier.checkpoint_path.unlink(missing_ok=True)
+    
+    resume_from = classifier.load_checkpoint()["processed"]
+    if resume_from:
+        console.print(f"[yellow]Resuming after {resume_from} already classified records[/yellow]")
+    
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        TextColumn("{task.completed} records"),
+        TimeElapsedColumn(),
+        console=console
+    ) as progress:
+        task = progress.add_task("Classifying...", total=None)
+        stats = classifier.run(progress_callback=lambda n: progress.advance(task, n))
+    
+    console.print(f"[green]✓ Classified {stats['processed']} records → {stats['output']}[/green]")
+
+@app.command()
+def clarify(
+    ticket_id: str = typer.Option(None, "--ticket", help="Resolve a single ticket"),
+    answer: str = typer.Option(None, "--answer", "-a", help="Answer for --ticket (yes/no)"),
+    limit: int = typer.Option(20, "--limit", "-n", help="Number of pending tickets to review")
+):
+    from src.app.utils.clarification_store import ClarificationStore, resume_clarification
+    
+    store = ClarificationStore()
+    
+    if ticket_id:
+        if not answer:
+            ticket = store.get(ticket_id)
+            if ticket is None:
+                console.print(f"[red]Error: Unknown ticket {ticket_id}[/red]")
+                raise typer.Exit(1)
+            answer = user_input_callback(ticket["question"])
+        tickets = [(ticket_id, answer)]
+    else:
+        pending = store.list_pending(limit)
+        if not pending:
+            console.print("[green]No pending clarifications[/green]")
+            return
+        
+        console.print(f"\n[bold cyan]{len(pending)} pending clarification(s)[/bold cyan]")
+        tickets = []
+        for ticket in pending:
+            console.print(f"\n[dim]{ticket['ticket_id']} ({ticket['created_at']})[/dim]")
+            console.print(f"  Text: {ticket['state']['text']}")
+            response = typer.prompt(f"  {ticket['question']} [skip]", default="", show_default=False)
+            if response.strip():
+                tickets.append((ticket["ticket_id"], response.strip()))
+    
+    for ticket_id, answer in tickets:
+        try:
+            result = resume_clarification(ticket_id, answer, store=store)
+        except (KeyError, ValueError) as e:
+            console.print(f"[red]Error: {e.args[0]}[/red]")
+            continue
+        console.print(f"[bold green]Final Decision:[/bold green] {result['final_label']} [dim](via {result['decision_via']}, request {result['request_id']})[/dim]")
+
+@app.command("bench-startup")
+def bench_startup(
+    repeats: int = typer.Option(3, "--repeats", "-r", help="Cold starts per entry point"),
+    record: bool = typer.Option(True, "--record/--no-record", help="Append results to the startup history")
+):
+    from src.app.utils.startup_bench import ENTRY_POINTS, load_history, record_results, measure_entry_point
+    
+    history = load_history()
+    previous = history[-1]["results"] if history else {}
+    results = []
+    
+    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), console=console) as progress:
+        task = progress.add_task("Measuring...", total=None)
+        for name in ENTRY_POINTS:
+            progress.update(task, description=f"Cold-starting {name}...")
+            results.append(measure_entry_point(name, repeats))
+    
+    table = Table(title="Cold start time")
+    for column in ["entry point", "median s", "min s", "previous s", "slowest imports"]:
+        table.add_column(column)
+    for result in results:
+        name = result["entry_point"]
+        before = previous.get(name)
+        imports = ", ".join(f"{i['module']} {i['cumulative_ms']:.0f}ms" for i in result["top_imports"][:3])
+        status = "" if result["returncode"] == 0 else f" [red](exit {result['returncode']})[/red]"
+        table.add_row(
+            name + status,
+            f"{result['median_s']:.3f}",
+            f"{result['min_s']:.3f}",
+            f"{before:.3f}" if before is not None else "-",
+            imports
+        )
+    console.print(table)
+    
+    if record:
+        record_results(results)
+        console.print(f"[dim]Recorded to {Config.STARTUP_BENCH_FILE}[/dim]")
+
+@app.command("export-snapshot")
+def export_snapshot_command(
+    model_path: str = typer.Option(
+        str(Config.CHECKPOINTS_DIR / "model"),
+        "--model-path",
+        "-m",
+        help="Path to the trained model"
+    ),
+    output: str = typer.Option(str(Config.SNAPSHOT_FILE), "--output", "-o", help="Snapshot file to write"),
+    temperature: float = typer.Option(1.0, "--temperature", "-t", help="Calibrated temperature stored in the snapshot"),
+    dtype: str = typer.Option("float32", "--dtype", help="Weight dtype: float32, bfloat16 or float16")
+):
+    from src.app.model.snapshot import export_snapshot
+    
+    if not Path(model_path).exists():
+        console.print(f"[red]Error: Model not found at {model_path}[/red]")
+        raise typer.Exit(1)
+    
+    try:
+        path = export_snapshot(model_path, output, temperature=temperature, dtype=dtype)
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+    
+    size_mb = path.stat().st_size / 1024 / 1024
+    console.print(f"[green]✓ Wrote {dtype} snapshot to {path} ({size_mb:.1f} MB)[/green]")
+    console.print(f"[dim]Serve it with --model-path {path}[/dim]")
+
+def _parse_int_list(value: str):
+    return [int(v) for v in value.split(",") if v.strip()]
+
+@app.command()
+def tune(
+    model_path: str = typer.Option(
+        str(Config.CHECKPOINTS_DIR / "model"),
+        "--model-path",
+        "-m",
+        help="Path to the trained model"
+    ),
+    samples: str = typer.Option(None, "--samples", "-s", help="Text/JSONL file with sample inputs (defaults to logged inputs)"),
+    threads: str = typer.Option(
+        ",".join(map(str, Config.TUNING_CONFIG["thread_options"])),
+        "--threads",
+        help="Comma-separated intra-op thread counts to try"
+    ),
+    batch_sizes: str = typer.Option(
+        ",".join(map(str, Config.TUNING_CONFIG["batch_sizes"])),
+        "--batch-sizes",
+        help="Comma-separated batch sizes to try"
+    ),
+    workers: str = typer.Option(
+        ",".join(map(str, Config.TUNING_CONFIG["worker_options"])),
+        "--workers",
+        help="Comma-separated worker process counts to try"
+    ),
+    max_latency_ms: float = typer.Option(None, "--max-latency-ms", help="p95 batch latency budget for the chosen profile"),
+    output: str = typer.Option(str(Config.TUNING_PROFILE_FILE), "--output", "-o", help="Where to write the chosen profile")
+):
+    from src.app.nodes.inference_node import InferenceNode
+    from src.app.utils.tuning import (
+        load_sample_texts, benchmark_profile, benchmark_workers,
+        pareto_frontier, choose_profile, save_profile
+    )
+    
+    if not Path(model_path).exists():
+        console.print(f"[red]Error: Model not found at {model_path}[/red]")
+        raise typer.Exit(1)
+    
+    texts = load_sample_texts(samples, limit=Config.TUNING_CONFIG["sample_limit"])
+    cores = os.cpu_count() or 1
+    thread_options = [t for t in _parse_int_list(threads) if t <= cores] or [cores]
+    worker_options = _parse_int_list(workers)
+    
+    console.print(f"[cyan]Tuning on {len(texts)} sample texts, {cores} CPU cores[/cyan]")
+    node = InferenceNode(model_path)
+    results = []
+    
+    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), console=console) as progress:
+        task = progress.add_task("Sweeping...", total=None)
+        for worker_count in worker_options:
+            for thread_count in thread_options:
+                if worker_count * thread_count > cores:
+                    continue
+                for batch_size in _parse_int_list(batch_sizes):
+                    progress.update(task, description=f"workers={worker_count} threads={thread_count} batch={batch_size}")
+                    if worker_count == 1:
+                        result = benchmark_profile(node, texts, thread_count, batch_size)
+                    else:
+                        result = benchmark_workers(model_path, texts, thread_count, batch_size, worker_count)
+                    results.append(result)
+    
+    frontier = pareto_frontier(results)
+    chosen = choose_profile(frontier, max_latency_ms)
+    
+    table = Table(title="Throughput / latency sweep")
+    for column in ["workers", "threads", "batch", "items/s", "p50 ms", "p95 ms", ""]:
+        table.add_column(column)
+    for result in sorted(results, key=lambda r: -r["throughput"]):
+        marker = "[green]chosen[/green]" if result is chosen else ("pareto" if result in frontier else "")
+        table.add_row(
+            str(result["workers"]), str(result["threads"]), str(result["batch_size"]),
+            f"{result['throughput']:.1f}", f"{result['p50_ms']:.1f}", f"{result['p95_ms']:.1f}", marker
+        )
+    console.print(table)
+    
+    path = save_profile(chosen, output)
+    console.print(f"\n[green]✓ Saved profile to {path}[/green]")
+    console.print(f"[dim]Serve with WORKERS={chosen['workers']} to match the chosen profile[/dim]")
+
+@app.command()
+def evaluate(
+    model_path: str = typer.Option(
+        str(Config.CHECKPOINTS_DIR / "model"),
+        "--model-path",
+        "-m",
+        help="Checkpoint directory or snapshot to evaluate"
+    ),
+    dataset: str = typer.Option(Config.DATASET_NAME, "--dataset", "-d", help="Hugging Face dataset name or local JSONL/CSV file"),
+    split: str = typer.Option(Config.EVALUATION_CONFIG["split"], "--split", help="Dataset split"),
+    max_samples: int = typer.Option(None, "--max-samples", "-n", help="Evaluate a seeded random subset"),
+    batch_size: int = typer.Option(Config.EVALUATION_CONFIG["batch_size"], "--batch-size", "-b", help="Inference batch size"),
+    max_length: int = typer.Option(Config.TRAINING_CONFIG["max_seq_length"], "--max-length", help="Truncation length"),
+    use_cache: bool = typer.Option(True, "--cache/--no-cache", help="Reuse cached logits for this checkpoint and split"),
+    output: str = typer.Option(None, "--output", "-o", help="Write the metrics as JSON")
+):
+    from src.app.model.evaluation import cached_logits, evaluate_logits, load_split
+    
+    if not Path(model_path).exists():
+        console.print(f"[red]Error: Model not found at {model_path}[/red]")
+        raise typer.Exit(1)
+    
+    texts, labels = load_split(dataset, split, max_samples=max_samples)
+    console.print(f"[cyan]Evaluating {model_path} on {dataset}/{split} ({len(texts)} samples)[/cyan]")
+    
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        TextColumn("{task.completed}/{task.total}"),
+        TimeElapsedColumn(),
+        console=console
+    ) as progress:
+        task = progress.add_task("Running inference...", total=len(texts))
+        run = cached_logits(
+            model_path, texts, labels, dataset, split,
+            max_samples=max_samples, batch_size=batch_size, max_length=max_length,
+            use_cache=use_cache, progress_callback=lambda n: progress.advance(task, n)
+        )
+    
+    metrics = evaluate_logits(run["logits"], run["labels"])
+    metrics["samples_per_second"] = metrics["samples"] / run["seconds"] if run["seconds"] else None
+    metrics["cached_logits"] = run["cached"]
+    
+    table = Table(title=f"Evaluation: {dataset}/{split}")
+    table.add_column("Metric")
+    table.add_column("Value")
+    table.add_row("Samples", str(metrics["samples"]))
+    table.add_row("Accuracy", f"{metrics['accuracy']:.4f}")
+    table.add_row("F1", f"{metrics['f1']:.4f}")
+    table.add_row("Temperature", f"{metrics['temperature']:.3f}")
+    table.add_row("ECE before / after", f"{metrics['ece_before']:.4f} / {metrics['ece_after']:.4f}")
+    for route, value in metrics["routing"].items():
+        calibrated = metrics["routing_calibrated"][route]
+        table.add_row(f"Route {route}", f"{value['share']:.1%} (calibrated {calibrated['share']:.1%})")
+    throughput = f"{metrics['samples_per_second']:.1f}" if metrics["samples_per_second"] else "-"
+    table.add_row("Samples/sec", throughput + (" (cached logits)" if run["cached"] else ""))
+    console.print(table)
+    
+    if output:
+        with open(output, "w") as f:
+            json.dump(metrics, f, indent=2)
+        console.print(f"[green]✓ Metrics written to {output}[/green]")
+
+@app.command()
+def loadtest(
+    input_path: str = typer.Option(None, "--input", "-i", help="JSONL/CSV inputs to replay (defaults to logged traffic)"),
+    url: str = typer.Option(None, "--url", help="Base URL of a running server; omit to drive the DAG in-process"),
+    model_path: str = typer.Option(
+        str(Config.CHECKPOINTS_DIR / "model"),
+        "--model-path",
+        "-m",
+        help="Path to the trained model (in-process target)"
+    ),
+    mode: str = typer.Option("closed", "--mode", help="closed, fixed (open-loop constant rate) or poisson"),
+    rate: float = typer.Option(None, "--rate", "-r", help="Arrival rate in requests/s for open-loop modes"),
+    concurrency: int = typer.Option(4, "--concurrency", "-c", help="Closed-loop clients / open-loop max in flight"),
+    requests: int = typer.Option(None, "--requests", "-n", help="Requests to send (defaults to one pass over the inputs)"),
+    text_field: str = typer.Option("text", "--text-field", help="Field/column holding the text"),
+    seed: int = typer.Option(None, "--seed", help="Seed for Poisson arrivals"),
+    output: str = typer.Option(None, "--output", "-o", help="Write the full JSON report here")
+):
+    from src.app.utils.loadgen import LoadGenerator, InProcessTarget, HttpTarget, load_replay_records
+    
+    if input_path and not Path(input_path).exists():
+        console.print(f"[red]Error: Input not found at {input_path}[/red]")
+        raise typer.Exit(1)
+    records = load_replay_records(input_path, text_field=text_field)
+    if not records:
+        console.print("[red]Error: No inputs to replay[/red]")
+        raise typer.Exit(1)
+    
+    if url:
+        target = HttpTarget(url)
+    else:
+        if not Path(model_path).exists():
+            console.print(f"[red]Error: Model not found at {model_path}[/red]")
+            raise typer.Exit(1)
+        from src.app.dag import SelfHealingDAG
+        target = InProcessTarget(SelfHealingDAG(model_path=model_path, interactive=False, log_requests=False))
+    
+    try:
+        generator = LoadGenerator(
+            target, records, mode=mode, concurrency=concurrency,
+            rate=rate, num_requests=requests, seed=seed
+        )
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+    
+    console.print(f"[cyan]Replaying {generator.num_requests} requests ({mode}) against {url or model_path}[/cyan]")
+    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), TimeElapsedColumn(), console=console) as progress:
+        progress.add_task("Sending...", total=None)
+        report = generator.run()
+    
+    table = Table(title="Load test")
+    table.add_column("Metric")
+    table.add_column("Value")
+    table.add_row("Requests", str(report["requests"]))
+    table.add_row("Throughput", f"{report['throughput']:.1f} req/s")
+    table.add_row("Error rate", f"{report['error_rate']:.2%}")
+    for name, value in report["latency_ms"].items():
+        table.add_row(f"Latency {name}", f"{value:.1f} ms" if value is not None else "-")
+    diffs = report["decision_diffs"]
+    if diffs["compared"]:
+        table.add_row("Decision diffs", f"{diffs['changed']}/{diffs['compared']} ({diffs['diff_rate']:.2%})")
+    console.print(table)
+    
+    for sample in diffs["samples"][:5]:
+        console.print(f"[yellow]{sample['logged']} → {sample['replayed']}[/yellow] {sample['text'][:80]}")
+    
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+        console.print(f"[green]✓ Report written to {output}[/green]")
+
+@app.command()
+def prune(
+    model_path: str = typer.Option(
+        str(Config.CHECKPOINTS_DIR / "model"),
+        "--model-path",
+        "-m",
+        help="DistilBERT checkpoint or snapshot to prune"
+    ),
+    output_dir: str = typer.Option(
+        str(Config.CHECKPOINTS_DIR / "pruned"),
+        "--output",
+        "-o",
+        help="Where to save the pruned checkpoint"
+    ),
+    speedup: float = typer.Option(Config.PRUNING_CONFIG["target_speedup"], "--speedup", "-s", help="Target estimated speedup"),
+    levels: str = typer.Option(
+        ",".join(str(level) for level in Config.PRUNING_CONFIG["levels"]),
+        "--levels",
+        help="Comma-separated speedups to include in the report"
+    ),
+    dataset: str = typer.Option(Config.DATASET_NAME, "--dataset", "-d", help="Hugging Face dataset name or local JSONL/CSV file"),
+    max_samples: int = typer.Option(Config.PRUNING_CONFIG["max_samples"], "--max-samples", "-n", help="Validation samples for scoring and the report"),
+    finetune: bool = typer.Option(False, "--finetune", help="Recover accuracy with a short LoRA fine-tune"),
+    profile: str = typer.Option(None, "--profile", help="Training profile for --finetune: auto, cpu or default")
+):
+    from src.app.model.pruning import prune_model
+    
+    if not Path(model_path).exists():
+        console.print(f"[red]Error: Model not found at {model_path}[/red]")
+        raise typer.Exit(1)
+    
+    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), TimeElapsedColumn(), console=console) as progress:
+        task = progress.add_task("Loading...", total=None)
+        try:
+            result = prune_model(
+                model_path, output_dir,
+                target_speedup=speedup,
+                levels=[float(level) for level in levels.split(",") if level.strip()],
+                finetune=finetune,
+                dataset_name=dataset,
+                max_samples=max_samples,
+                profile=profile,
+                progress_callback=lambda message: progress.update(task, description=message)
+            )
+        except ValueError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            raise typer.Exit(1)
+    
+    table = Table(title="Pruning: latency vs accuracy")
+    table.add_column("Target")
+    table.add_column("Layers")
+    table.add_column("FFN width")
+    table.add_column("Params")
+    table.add_column("Accuracy")
+    table.add_column("Latency (ms/sample)")
+    table.add_column("Speedup (est / measured)")
+    for row in result["levels"]:
+        table.add_row(
+            f"{row['target_speedup']}x",
+            str(row["n_layers"]),
+            f"{row['ffn_fraction']:.0%}",
+            f"{row['parameters'] / 1e6:.1f}M",
+            f"{row['accuracy']:.4f}",
+            f"{row['latency_ms_per_sample']:.2f}",
+            f"{row['estimated_speedup']:.2f}x / {row['measured_speedup']:.2f}x"
+        )
+    console.print(table)
+    
+    if "finetuned_accuracy" in result:
+        console.print(f"Accuracy after LoRA fine-tune: {result['finetuned_accuracy']:.4f}")
+    console.print(f"[green]✓ Pruned checkpoint saved to {result['output_dir']}[/green]")
+    console.print(f"[dim]Report written to {result['report_file']}[/dim]")
+
+@app.command()
+def distill(
+    teacher_path: str = typer.Option(
+        str(Config.CHECKPOINTS_DIR / "model"),
+        "--teacher",
+        "-t",
+        help="Teacher checkpoint (LoRA adapters are merged)"
+    ),
+    output_dir: str = typer.Option(
+        str(Config.DISTILLATION_CONFIG["output_dir"]),
+        "--output",
+        "-o",
+        help="Where to save the student checkpoint"
+    ),
+    layers: int = typer.Option(Config.DISTILLATION_CONFIG["student_layers"], "--layers", "-l", help="Transformer layers in the student"),
+    dataset: str = typer.Option(Config.DATASET_NAME, "--dataset", "-d", help="Hugging Face dataset name or local JSONL/CSV file"),
+    max_samples: int = typer.Option(Config.DISTILLATION_CONFIG["max_samples"], "--max-samples", "-n", help="Labelled training samples"),
+    use_logs: bool = typer.Option(True, "--logs/--no-logs", help="Add unlabelled texts from the prediction logs"),
+    profile: str = typer.Option(None, "--profile", help="Training profile: auto, cpu or default")
+):
+    from src.app.model.distillation import distill as run_distillation
+    
+    if not Path(teacher_path).exists():
+        console.print(f"[red]Error: Teacher not found at {teacher_path}[/red]")
+        raise typer.Exit(1)
+    
+    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), TimeElapsedColumn(), console=console) as progress:
+        task = progress.add_task("Loading...", total=None)
+        try:
+            result = run_distillation(
+                teacher_path, output_dir,
+                n_layers=layers,
+                dataset_name=dataset,
+                max_samples=max_samples,
+                use_logs=use_logs,
+                profile=profile,
+                progress_callback=lambda message: progress.update(task, description=message)
+            )
+        except ValueError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            raise typer.Exit(1)
+    
+    benchmark = result["benchmark"]
+    table = Table(title="Distillation: teacher vs student")
+    table.add_column("Model")
+    table.add_column("Params")
+    table.add_column("Accuracy")
+    table.add_column("Throughput (samples/s)")
+    table.add_column("Accept rate")
+    table.add_column("Temperature")
+    for name in ("teacher", "student"):
+        row = benchmark[name]
+        table.add_row(
+            name,
+            f"{row['parameters'] / 1e6:.1f}M",
+            f"{row['accuracy']:.4f}",
+            f"{row['samples_per_second']:.1f}",
+            f"{row['accept_rate']:.2%}",
+            f"{row['temperature']:.3f}"
+        )
+    console.print(table)
+    
+    accept_agreement = benchmark["accept_path_agreement"]
+    console.print(f"Agreement: {benchmark['agreement']:.2%} overall, "
+                  f"{'n/a' if accept_agreement is None else f'{accept_agreement:.2%}'} on accepted predictions")
+    console.print(f"Speedup: {benchmark['speedup']:.2f}x with {result['logged_texts']} logged texts in training")
+    console.print(f"[green]✓ Student saved to {result['student']}[/green]")
+    console.print(f"[dim]Report written to {result['report_file']}[/dim]")
+
+@app.command("update-model")
+def update_model(
+    base_path: str = typer.Option(
+        None,
+        "--base",
+        "-b",
+        help="Checkpoint or LoRA adapter to start from (default: latest version, else checkpoints/model)"
+    ),
+    dataset: str = typer.Option(Config.DATASET_NAME, "--dataset", "-d", help="Replay dataset: Hugging Face name or local JSONL/CSV file"),
+    replay_ratio: float = typer.Option(Config.INCREMENTAL_CONFIG["replay_ratio"], "--replay-ratio", "-r", help="Replay samples per correction"),
+    since: str = typer.Option(None, "--since", help="Only use corrections logged after this ISO timestamp"),
+    profile: str = typer.Option(None, "--profile", help="Training profile: auto, cpu or default")
+):
+    from src.app.model.incremental import incremental_update
+    
+    if base_path is not None and not Path(base_path).exists():
+        console.print(f"[red]Error: Model not found at {base_path}[/red]")
+        raise typer.Exit(1)
+    
+    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), TimeElapsedColumn(), console=console) as progress:
+        task = progress.add_task("Loading...", total=None)
+        try:
+            result = incremental_update(
+                base_path,
+                dataset_name=dataset,
+                replay_ratio=replay_ratio,
+                since=since,
+                profile=profile,
+                progress_callback=lambda message: progress.update(task, description=message)
+            )
+        except ValueError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            raise typer.Exit(1)
+    
+    table = Table(title=f"Incremental update: {result['version']}")
+    table.add_column("Metric")
+    table.add_column("Before")
+    table.add_column("After")
+    before, after = result["before"], result["after"]
+    for name, key in (("Fallback rate", "fallback_rate"), ("Clarify", "ask_clarify"), ("Escalate", "escalate")):
+        table.add_row(f"{name} (recent traffic)", f"{before['recent'][key]:.2%}", f"{after['recent'][key]:.2%}")
+    table.add_row("Corrections matched", f"{before['corrections_matched']:.2%}", f"{after['corrections_matched']:.2%}")
+    table.add_row("Held-out accuracy", f"{before['heldout_accuracy']:.4f}", f"{after['heldout_accuracy']:.4f}")
+    console.print(table)
+    
+    console.print(f"Trained on {result['corrections']} corrections and {result['replay_samples']} replay samples; "
+                  f"fallback rate change on {result['recent_samples']} recent requests: {result['fallback_rate_change']:+.2%}")
+    console.print(f"[green]✓ Saved {result['version']} to {result['path']}[/green]")
+    console.print(f"[dim]Report written to {result['report_file']}[/dim]")
+
 if __name__ == "__main__":
     app()
@@ -36,6 +36,17 @@ class Config:
         "max_seq_length": 512
     }
     
+    TRAINING_PROFILE = os.environ.get("TRAINING_PROFILE", "auto")
+    CPU_TRAINING_PROFILE = {
+        "bf16": "auto",
+        "dataloader_num_workers": None,
+        "group_by_length": True,
+        "gradient_accumulation_steps": int(os.environ.get("GRAD_ACCUM_STEPS", "1")),
+        "torch_threads": None
+    }
+    
+    SNAPSHOT_FILE = CHECKPOINTS_DIR / "model.snapshot"
+    
     CONFIDENCE_THRESHOLDS = {
         "accept": 0.75,
         "clarify": 0.50,
@@ -46,6 +57,201 @@ class Config:
     
     LOG_FILE = LOGS_DIR / "app.log"
     LOG_JSONL_FILE = LOGS_DIR / "app.jsonl"
+    STARTUP_BENCH_FILE = LOGS_DIR / "startup_bench.jsonl"
+    TRAINING_THROUGHPUT_FILE = LOGS_DIR / "training_throughput.jsonl"
+    LOG_STORAGE = os.environ.get("LOG_STORAGE", "jsonl")
+    
+    SERVING_CONFIG = {
+        "host": "0.0.0.0",
+        "port": int(os.environ.get("PORT", "5000")),
+        "workers": int(os.environ.get("WORKERS", "1")),
+        "threads_per_worker": None,
+        "preload_zero_shot": True,
+        "backlog": 2048,
+        "restart_backoff_seconds": 1.0,
+        "max_restarts_per_minute": 10
+    }
+
+    TUNING_PROFILE_FILE = CHECKPOINTS_DIR / "tuning_profile.json"
+    TUNING_CONFIG = {
+        "thread_options": [1, 2, 4, 8, 16],
+        "batch_sizes": [1, 4, 8, 16, 32],
+        "worker_options": [1, 2, 4],
+        "sample_limit": 256,
+        "default_batch_size": 16,
+        "worker_timeout_seconds": 600
+    }
+    
+    BULK_CONFIG = {
+        "fallback_workers": 4,
+        "checkpoint_every": 1000
+    }
+    
+    BATCH_ENDPOINT_CONFIG = {
+        "max_items": 1000,
+        "max_payload_bytes": 5 * 1024 * 1024,
+        "max_in_flight_items": 4000
+    }
+    
+    ADMISSION_CONFIG = {
+        "max_in_flight": int(os.environ.get("MAX_IN_FLIGHT", "8")),
+        "max_queue": int(os.environ.get("MAX_QUEUE", "32")),
+        "queue_timeout_ms": float(os.environ.get("QUEUE_TIMEOUT_MS", "2000")),
+        "degrade": os.environ.get("DEGRADE_UNDER_PRESSURE", "0") == "1",
+        "degrade_queue_depth": 1
+    }
+    
+    CLARIFICATION_CONFIG = {
+        "mode": os.environ.get("CLARIFICATION_MODE", "sync"),
+        "store_path": LOGS_DIR / "clarifications.db"
+    }
+    
+    DEADLINE_CONFIG = {
+        "default_deadline_ms": None,
+        "background_workers": 2,
+        "max_background_jobs": 64,
+        "zero_shot_cache_size": 10000,
+        "latency_ewma_alpha": 0.2
+    }
+    
+    NEAR_DUPLICATE_CONFIG = {
+        "enabled": os.environ.get("NEAR_DUPLICATE", "0") == "1",
+        "threshold": 0.9,
+        "num_perm": 64,
+        "bands": 16,
+        "shingle_size": 5,
+        "max_entries": 50000
+    }
+    
+    EMBEDDING_FALLBACK_CONFIG = {
+        "enabled": os.environ.get("EMBEDDING_FALLBACK", "0") == "1",
+        "index_path": DATA_DIR / "embedding_index.npz",
+        "sources": ["user_clarification", "user_confirmed", "backup_model_escalation", "backup_model_fallback"],
+        "k": 5,
+        "min_similarity": 0.9,
+        "min_neighbours": 3,
+        "min_agreement": 0.8,
+        "max_entries": 50000,
+        "save_every": 25
+    }
+    
+    STAGED_PIPELINE_CONFIG = {
+        "enabled": os.environ.get("STAGED_PIPELINE", "0") == "1",
+        "tokenizer_workers": int(os.environ.get("TOKENIZER_WORKERS", "1")),
+        "postprocess_workers": 1,
+        "queue_size": 4
+    }
+    
+    SINGLE_FLIGHT_CONFIG = {
+        "enabled": os.environ.get("SINGLE_FLIGHT", "1") == "1"
+    }
+    
+    SHADOW_CONFIG = {
+        "model_path": os.environ.get("SHADOW_MODEL_PATH"),
+        "sample_rate": float(os.environ.get("SHADOW_SAMPLE_RATE", "0.1")),
+        "queue_size": 1000,
+        "batch_size": 16,
+        "latency_window": 10000,
+        "log_file": LOGS_DIR / "shadow.jsonl"
+    }
+    
+    MONITORING_CONFIG = {
+        "windows": {"1m": 60, "15m": 900, "1h": 3600},
+        "bucket_seconds": 10,
+        "confidence_bins": 100,
+        "max_alerts": 20,
+        "drift": {
+            "window": "15m",
+            "baseline_window": "1h",
+            "lower": None,
+            "upper": None,
+            "tolerance": 0.1,
+            "min_samples": 50,
+            "cooldown_seconds": 300,
+            "exclude_paths": ["near_duplicate", "degraded"]
+        }
+    }
+    
+    MODEL_MANAGER_CONFIG = {
+        "budget_mb": float(os.environ.get("MODEL_MEMORY_BUDGET_MB", "3072")),
+        "idle_ttl_seconds": float(os.environ.get("MODEL_IDLE_TTL", "900")),
+        "reap_interval_seconds": 60
+    }
+    
+    MULTITASK_CONFIG = {
+        "primary_task": "sentiment",
+        "extra_tasks": os.environ.get("MULTITASK_TASKS", ""),
+        "thresholds": {
+            "emotion": {"accept": 0.5, "clarify": 0.25}
+        }
+    }
+    
+    PROGRESSIVE_CONFIG = {
+        "enabled": os.environ.get("PROGRESSIVE", "0") == "1",
+        "short_length": 128,
+        "full_length": 512,
+        "head_fraction": 0.25,
+        "audit_rate": 0.02
+    }
+    
+    EVALUATION_CONFIG = {
+        "split": "test",
+        "batch_size": 64,
+        "cache_dir": CHECKPOINTS_DIR / "eval_cache",
+        "calibration_fraction": 0.5,
+        "seed": 42
+    }
+    
+    COMPACT_LOG_CONFIG = {
+        "directory": LOGS_DIR / "compact",
+        "max_segment_entries": int(os.environ.get("LOG_SEGMENT_ENTRIES", "50000")),
+        "max_segment_bytes": int(os.environ.get("LOG_SEGMENT_MB", "64")) * 1024 * 1024,
+        "max_segments": int(os.environ.get("LOG_MAX_SEGMENTS", "0")) or None,
+        "known_text_cache": 10000,
+        "known_text_ttl_seconds": 300,
+        "flush_entries": 200,
+        "flush_seconds": 5.0
+    }
+    
+    PRUNING_CONFIG = {
+        "target_speedup": 2.0,
+        "levels": [1.0, 1.5, 2.0, 3.0],
+        "ffn_fractions": [1.0, 0.75, 0.5, 0.25],
+        "split": "test",
+        "max_samples": 1000,
+        "batch_size": 32,
+        "latency_repeats": 3,
+        "finetune_epochs": 1,
+        "finetune_samples": 5000,
+        "seed": 42,
+        "report_file": LOGS_DIR / "pruning_report.json"
+    }
+    
+    DISTILLATION_CONFIG = {
+        "student_layers": 3,
+        "temperature": 2.0,
+        "alpha": 0.5,
+        "num_train_epochs": 3,
+        "learning_rate": 5e-5,
+        "max_samples": 5000,
+        "eval_samples": 1000,
+        "max_log_texts": 5000,
+        "output_dir": CHECKPOINTS_DIR / "student",
+        "report_file": LOGS_DIR / "distillation_report.json"
+    }
+    
+    INCREMENTAL_CONFIG = {
+        "sources": ["user_clarification", "user_confirmed", "backup_model_escalation", "backup_model_fallback"],
+        "min_corrections": 10,
+        "replay_ratio": 4.0,
+        "max_replay": 2000,
+        "num_train_epochs": 2,
+        "learning_rate": 1e-4,
+        "eval_samples": 500,
+        "recent_samples": 1000,
+        "versions_dir": CHECKPOINTS_DIR / "versions",
+        "report_file": LOGS_DIR / "incremental_report.json"
+    }
     
     WANDB_PROJECT = "self-healing-classifier"
     WANDB_ENTITY = None
@@ -55,5 +261,3 @@ class Config:
         cls.DATA_DIR.mkdir(parents=True, exist_ok=True)
         cls.LOGS_DIR.mkdir(parents=True, exist_ok=True)
         cls.CHECKPOINTS_DIR.mkdir(parents=True, exist_ok=True)
-
-Config.ensure_dirs()
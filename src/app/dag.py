@@ -1,10 +1,23 @@
-from typing import Dict, Any, Optional, Callable
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Optional, Callable, Iterator, List, Tuple
 from langgraph.graph import StateGraph, END
 from typing_extensions import TypedDict
+from src.app.model.manager import ModelManager, model_manager as default_model_manager
 from src.app.nodes.inference_node import InferenceNode
 from src.app.nodes.confidence_node import ConfidenceCheckNode
 from src.app.nodes.fallback_node import FallbackNode
 from src.app.nodes.final_decision_node import FinalDecisionNode
+from src.app.nodes.progressive import ProgressiveInference
+from src.app.nodes.multitask_node import MultiTaskInferenceNode, configured_tasks
+from src.app.utils.tuning import load_profile, apply_profile
+from src.app.utils.clarification_store import ClarificationStore, resume_clarification
+from src.app.utils.near_duplicate import NearDuplicateIndex
+from src.app.utils.shadow import ShadowEvaluator
+from src.app.utils.single_flight import SingleFlight, flight_key
+from src.app.utils.staged import StagedInference
+from src.app.utils.vector_index import VectorIndex
+from src.app.config import Config
 
 class ClassificationState(TypedDict, total=False):
     text: str
@@ -20,6 +33,18 @@ class ClassificationState(TypedDict, total=False):
     fallback_strategy: Optional[str]
     fallback_question: Optional[str]
     user_response: Optional[str]
+    clarification_pending: bool
+    deadline: Optional[float]
+    deadline_fallback: bool
+    degraded: bool
+    ticket_id: Optional[str]
+    near_duplicate: bool
+    duplicate_similarity: float
+    inference_latency_ms: float
+    inference_pass: str
+    tasks: Dict[str, Dict[str, Any]]
+    embedding: List[float]
+    nearest_neighbours: Optional[Dict[str, Any]]
     final_label: str
     final_decision_via: str
     backup_model: Optional[Dict[str, Any]]
@@ -27,33 +52,134 @@ class ClassificationState(TypedDict, total=False):
     decision_via: str
     log_entry: Dict[str, Any]
 
+TASK_FIELDS = [
+    "label", "probs", "confidence", "status", "fallback_activated",
+    "fallback_strategy", "backup_model", "deadline_fallback", "final_label"
+]
+
 class SelfHealingDAG:
     def __init__(
         self,
         model_path: str,
         user_input_callback: Optional[Callable] = None,
         interactive: bool = True,
-        device: str = "cpu"
+        device: str = "cpu",
+        clarification_mode: str = None,
+        near_duplicate: Optional[bool] = None,
+        shadow_model_path: Optional[str] = None,
+        tasks: Optional[Dict[str, str]] = None,
+        progressive: Optional[bool] = None,
+        single_flight: Optional[bool] = None,
+        embedding_fallback: Optional[bool] = None,
+        staged: Optional[bool] = None,
+        model_manager: Optional[ModelManager] = None,
+        log_requests: bool = True
     ):
-        self.inference_node = InferenceNode(model_path, device=device)
+        self.model_manager = model_manager or default_model_manager
+        self.tuning_profile = load_profile()
+        if self.tuning_profile and self.tuning_profile.get("workers") == Config.SERVING_CONFIG["workers"]:
+            apply_profile(self.tuning_profile)
+        self.batch_size = (self.tuning_profile or {}).get(
+            "batch_size", Config.TUNING_CONFIG["default_batch_size"]
+        )
+        
+        tasks = configured_tasks() if tasks is None else tasks
+        if embedding_fallback is None:
+            embedding_fallback = Config.EMBEDDING_FALLBACK_CONFIG["enabled"]
+        if tasks:
+            primary_task = Config.MULTITASK_CONFIG["primary_task"]
+            self.inference_node = MultiTaskInferenceNode(
+                {primary_task: model_path, **tasks},
+                primary_task=primary_task,
+                device=device,
+                model_manager=self.model_manager
+            )
+        else:
+            self.inference_node = InferenceNode(
+                model_path,
+                device=device,
+                return_embeddings=bool(embedding_fallback),
+                model_manager=self.model_manager
+            )
+        self.embedding_index = VectorIndex(
+            Config.EMBEDDING_FALLBACK_CONFIG["index_path"]
+        ) if embedding_fallback and not tasks else None
         self.confidence_node = ConfidenceCheckNode()
-        self.fallback_node = FallbackNode(user_input_callback=user_input_callback)
-        self.final_decision_node = FinalDecisionNode()
+        if progressive is None:
+            progressive = Config.PROGRESSIVE_CONFIG["enabled"]
+        self.progressive = ProgressiveInference(self.inference_node) if progressive else None
+        if staged is None:
+            staged = Config.STAGED_PIPELINE_CONFIG["enabled"]
+        self.staged = StagedInference(self.inference_node) if staged and not progressive and not tasks else None
+        self.clarification_mode = clarification_mode or Config.CLARIFICATION_CONFIG["mode"]
+        self.fallback_node = FallbackNode(
+            user_input_callback=user_input_callback,
+            defer_clarification=self.clarification_mode == "deferred",
+            model_manager=self.model_manager,
+            neighbour_index=self.embedding_index
+        )
+        self.final_decision_node = FinalDecisionNode(log_requests=log_requests)
+        self.task_routes = self._build_task_routes(tasks or {}, user_input_callback)
         self.interactive = interactive
+        self._fallback_executor = None
+        self._clarification_store = None
+        
+        if near_duplicate is None:
+            near_duplicate = Config.NEAR_DUPLICATE_CONFIG["enabled"]
+        self.near_duplicate_index = NearDuplicateIndex() if near_duplicate else None
+        
+        shadow_model_path = shadow_model_path or Config.SHADOW_CONFIG["model_path"]
+        self.shadow = ShadowEvaluator(
+            candidate_path=shadow_model_path,
+            device=device,
+            log_file=Config.SHADOW_CONFIG["log_file"]
+        ) if shadow_model_path else None
+        
+        if single_flight is None:
+            single_flight = Config.SINGLE_FLIGHT_CONFIG["enabled"] and user_input_callback is None
+        self.single_flight = SingleFlight() if single_flight else None
         
         self.graph = self._build_graph()
     
+    def _build_task_routes(self, tasks: Dict[str, str], user_input_callback: Optional[Callable]):
+        routes = {}
+        for task in tasks:
+            thresholds = Config.MULTITASK_CONFIG["thresholds"].get(task, {})
+            routes[task] = (
+                ConfidenceCheckNode(
+                    threshold_accept=thresholds.get("accept"),
+                    threshold_clarify=thresholds.get("clarify")
+                ),
+                FallbackNode(
+                    zero_shot_labels=list(self.inference_node.label_maps[task].values()),
+                    model_manager=self.model_manager
+                )
+            )
+        return routes
+    
     def _build_graph(self):
         workflow = StateGraph(ClassificationState)
         
+        workflow.add_node("duplicate_check", self._duplicate_check_wrapper)
         workflow.add_node("inference", self._inference_wrapper)
+        workflow.add_node("task_routing", self._task_routing_wrapper)
         workflow.add_node("confidence_check", self._confidence_wrapper)
         workflow.add_node("fallback", self._fallback_wrapper)
         workflow.add_node("final_decision", self._final_decision_wrapper)
+        workflow.add_node("suspend", self._suspend_wrapper)
         
-        workflow.set_entry_point("inference")
+        workflow.set_entry_point("duplicate_check")
         
-        workflow.add_edge("inference", "confidence_check")
+        workflow.add_conditional_edges(
+            "duplicate_check",
+            self._is_near_duplicate,
+            {
+                "duplicate": "final_decision",
+                "inference": "inference"
+            }
+        )
+        workflow.add_edge("inference", "task_routing")
+        workflow.add_edge("task_routing", "confidence_check")
         
         workflow.add_conditional_edges(
             "confidence_check",
@@ -64,14 +190,75 @@ class SelfHealingDAG:
             }
         )
         
-        workflow.add_edge("fallback", "final_decision")
+        workflow.add_conditional_edges(
+            "fallback",
+            self._should_suspend,
+            {
+                "suspend": "suspend",
+                "final": "final_decision"
+            }
+        )
         workflow.add_edge("final_decision", END)
+        workflow.add_edge("suspend", END)
         
         return workflow.compile()
     
+    def _duplicate_check_wrapper(self, state: ClassificationState) -> ClassificationState:
+        if self.near_duplicate_index is None:
+            return state
+        
+        match = self.near_duplicate_index.lookup(state["text"])
+        if match is None:
+            return state
+        
+        decision, similarity = match
+        return {
+            **state,
+            **decision,
+            "near_duplicate": True,
+            "duplicate_similarity": similarity,
+            "final_decision_via": "near_duplicate"
+        }
+    
+    def _is_near_duplicate(self, state: ClassificationState) -> str:
+        return "duplicate" if state.get("near_duplicate") else "inference"
+    
     def _inference_wrapper(self, state: ClassificationState) -> ClassificationState:
-        result = self.inference_node.run(state["text"])
-        return {**state, **result}
+        start = time.perf_counter()
+        result = self._infer([state["text"]])[0]
+        state = {**state, **result, "inference_latency_ms": (time.perf_counter() - start) * 1000}
+        self._shadow_submit(state)
+        return state
+    
+    def _infer(self, texts: List[str]) -> List[Dict[str, Any]]:
+        if self.progressive is not None:
+            return self.progressive.run_batch(texts, self._accepts)
+        if self.staged is not None:
+            return self.staged.run_batch(texts)
+        if len(texts) == 1:
+            return [self.inference_node.run(texts[0])]
+        return self.inference_node.run_batch(texts)
+    
+    def _accepts(self, result: Dict[str, Any]) -> bool:
+        return self.confidence_node.run(result)["action"] == "accept"
+    
+    def _shadow_submit(self, state: ClassificationState):
+        if self.shadow is not None:
+            self.shadow.submit(state)
+    
+    def _task_routing_wrapper(self, state: ClassificationState) -> ClassificationState:
+        if not state.get("tasks") or not self.task_routes:
+            return state
+        
+        tasks = dict(state["tasks"])
+        for task, (confidence_node, fallback_node) in self.task_routes.items():
+            routed = confidence_node.run(tasks[task])
+            routed = fallback_node.run({**routed, "deadline": state.get("deadline")}, interactive=False)
+            tasks[task] = {
+                field: routed.get(field) for field in TASK_FIELDS
+            }
+            tasks[task]["decision_via"] = routed.get("final_decision_via")
+        return {**state, "tasks": tasks}
     
     def _confidence_wrapper(self, state: ClassificationState) -> ClassificationState:
         result = self.confidence_node.run(state)
@@ -82,18 +269,179 @@ class SelfHealingDAG:
         return {**state, **result}
     
     def _final_decision_wrapper(self, state: ClassificationState) -> ClassificationState:
+        if state.get("tasks"):
+            state = self._with_primary_task(state)
         result = self.final_decision_node.run(state)
+        self._remember_decision(state)
         return {**state, **result}
     
+    def _with_primary_task(self, state: ClassificationState) -> ClassificationState:
+        primary = {field: state.get(field) for field in TASK_FIELDS}
+        primary["final_label"] = state.get("final_label") or state["label"]
+        primary["decision_via"] = state.get("final_decision_via", "direct_prediction")
+        return {**state, "tasks": {**state["tasks"], self.inference_node.primary_task: primary}}
+    
+    def _remember_decision(self, state: ClassificationState):
+        self._index_resolution(state)
+        if self.near_duplicate_index is None:
+            return
+        if state.get("near_duplicate") or state.get("deadline_fallback") or state.get("final_decision_via") == "degraded":
+            return
+        self.near_duplicate_index.add(state["text"], state)
+    
+    def _index_resolution(self, state: Dict[str, Any]):
+        if self.embedding_index is None or state.get("embedding") is None:
+            return
+        source = state.get("final_decision_via")
+        if source in Config.EMBEDDING_FALLBACK_CONFIG["sources"]:
+            self.embedding_index.add(state["embedding"], state["final_label"], source)
+    
+    def _suspend_wrapper(self, state: ClassificationState) -> ClassificationState:
+        ticket_id = self.clarification_store.create(state)
+        return {**state, "ticket_id": ticket_id}
+    
+    def _should_suspend(self, state: ClassificationState) -> str:
+        return "suspend" if state.get("clarification_pending") else "final"
+    
+    @property
+    def clarification_store(self) -> ClarificationStore:
+        if self._clarification_store is None:
+            self._clarification_store = ClarificationStore()
+        return self._clarification_store
+    
     def _should_use_fallback(self, state: ClassificationState) -> str:
         if state["action"] in ["ask_clarify", "escalate"]:
             return "fallback"
         return "final"
     
-    def run(self, text: str) -> Dict[str, Any]:
+    def run(self, text: str, deadline_ms: Optional[float] = None, degraded: bool = False) -> Dict[str, Any]:
+        deadline_ms = deadline_ms or Config.DEADLINE_CONFIG["default_deadline_ms"]
+        if self.single_flight is None:
+            return self._invoke(text, deadline_ms, degraded)
+        
+        final_state, shared = self.single_flight.do(
+            (flight_key(text), deadline_ms, degraded),
+            lambda: self._invoke(text, deadline_ms, degraded)
+        )
+        if not shared:
+            return final_state
+        state = {**final_state, "text": text}
+        if final_state.get("clarification_pending"):
+            return self._suspend_wrapper({key: value for key, value in state.items() if key != "ticket_id"})
+        return {**state, **self.final_decision_node.run(state)}
+    
+    def _invoke(self, text: str, deadline_ms: Optional[float], degraded: bool = False) -> Dict[str, Any]:
         initial_state = {"text": text}
+        if deadline_ms:
+            initial_state["deadline"] = time.monotonic() + deadline_ms / 1000
+        if degraded:
+            initial_state["degraded"] = True
         final_state = self.graph.invoke(initial_state)
+        if degraded:
+            final_state = {**final_state, "degraded": final_state.get("final_decision_via") == "degraded"}
         return final_state
     
+    def run_batch(
+        self,
+        texts: List[str],
+        fallback_workers: int = None,
+        batch_size: int = None
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        decided, pending = self.submit_batch(texts, fallback_workers=fallback_workers, batch_size=batch_size)
+        yield from decided
+        
+        for future in as_completed(pending):
+            yield future.idx, future.result()
+    
+    def submit_batch(
+        self,
+        texts: List[str],
+        fallback_workers: int = None,
+        offset: int = 0,
+        batch_size: int = None,
+        degraded: bool = False
+    ) -> Tuple[List[Tuple[int, Dict[str, Any]]], List[Future]]:
+        decided = []
+        pending = []
+        to_infer = []
+        for idx, text in enumerate(texts):
+            state = self._duplicate_check_wrapper({"text": text})
+            if self._is_near_duplicate(state) == "duplicate":
+                decided.append((offset + idx, self._final_decision_wrapper(state)))
+            else:
+                to_infer.append(idx)
+        
+        batch_size = batch_size or max(len(to_infer), 1)
+        chunks = [to_infer[i:i + batch_size] for i in range(0, len(to_infer), batch_size)]
+        if self.staged is not None:
+            submitted = [(time.perf_counter(), self.staged.submit([texts[idx] for idx in chunk])) for chunk in chunks]
+        
+        for position, chunk in enumerate(chunks):
+            if self.staged is not None:
+                start, future = submitted[position]
+                inferences = future.result()
+            else:
+                start = time.perf_counter()
+                inferences = self._infer([texts[idx] for idx in chunk])
+            latency_ms = (time.perf_counter() - start) * 1000 / len(chunk)
+            
+            for idx, inference in zip(chunk, inferences):
+                state = {"text": texts[idx], **inference, "inference_latency_ms": latency_ms}
+                self._shadow_submit(state)
+                state = self._confidence_wrapper(self._task_routing_wrapper(state))
+                if self._should_use_fallback(state) == "fallback":
+                    if degraded:
+                        state = {**state, "degraded": True}
+                    executor = self._get_fallback_executor(fallback_workers)
+                    future = executor.submit(self._complete_with_fallback, state)
+                    future.idx = offset + idx
+                    pending.append(future)
+                else:
+                    decided.append((offset + idx, self._final_decision_wrapper(state)))
+        
+        return decided, pending
+    
+    def _complete_with_fallback(self, state: ClassificationState) -> ClassificationState:
+        state = self._fallback_wrapper(state)
+        if state.get("degraded"):
+            state = {**state, "degraded": state.get("final_decision_via") == "degraded"}
+        if self._should_suspend(state) == "suspend":
+            return self._suspend_wrapper(state)
+        return self._final_decision_wrapper(state)
+    
+    def _get_fallback_executor(self, workers: int = None) -> ThreadPoolExecutor:
+        if self._fallback_executor is None:
+            self._fallback_executor = ThreadPoolExecutor(
+                max_workers=workers or Config.BULK_CONFIG["fallback_workers"],
+                thread_name_prefix="fallback"
+            )
+        return self._fallback_executor
+    
+    def get_stats(self) -> Dict[str, Any]:
+        stats = {"fallback": dict(self.fallback_node.stats)}
+        if self.near_duplicate_index is not None:
+            stats["near_duplicate"] = self.near_duplicate_index.stats()
+        if self.shadow is not None:
+            stats["shadow"] = self.shadow.stats()
+        if self.progressive is not None:
+            stats["progressive"] = self.progressive.stats()
+        if self.single_flight is not None:
+            stats["single_flight"] = self.single_flight.stats()
+        if self.embedding_index is not None:
+            stats["embedding_index"] = self.embedding_index.stats()
+        if self.staged is not None:
+            stats["pipeline"] = self.staged.stats()
+        return stats
+    
+    def resume(self, ticket_id: str, answer: str) -> Dict[str, Any]:
+        result = resume_clarification(
+            ticket_id,
+            answer,
+            store=self.clarification_store,
+            final_decision_node=self.final_decision_node
+        )
+        self._index_resolution(result)
+        return result
+    
     def set_temperature(self, temperature: float):
         self.inference_node.set_temperature(temperature)
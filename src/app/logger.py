@@ -1,5 +1,6 @@
 import json
 import logging
+import threading
 import uuid
 from datetime import datetime
 from pathlib import Path
@@ -9,6 +10,21 @@ from src.app.config import Config
 
 class StructuredLogger:
     def __init__(self):
+        self.logger = None
+        self.file_logger = None
+        self.compact_writer = None
+        self._configure_lock = threading.Lock()
+    
+    def _ensure_configured(self):
+        if self.file_logger is not None:
+            return
+        
+        with self._configure_lock:
+            if self.file_logger is None:
+                self._configure()
+    
+    def _configure(self):
+        Config.ensure_dirs()
         structlog.configure(
             processors=[
                 structlog.processors.TimeStamper(fmt="iso"),
@@ -30,6 +46,10 @@ class StructuredLogger:
             ]
         )
         self.file_logger = logging.getLogger(__name__)
+        
+        if Config.LOG_STORAGE == "compact":
+            from src.app.utils.log_store import CompactLogWriter
+            self.compact_writer = CompactLogWriter()
     
     def log_inference(
         self,
@@ -44,8 +64,11 @@ class StructuredLogger:
         fallback_question: Optional[str] = None,
         user_response: Optional[str] = None,
         final_label: Optional[str] = None,
-        final_decision_via: Optional[str] = None
+        final_decision_via: Optional[str] = None,
+        tasks: Optional[Dict[str, Dict[str, Any]]] = None
     ):
+        self._ensure_configured()
+        
         log_entry = {
             "timestamp": datetime.now().isoformat(),
             "request_id": request_id,
@@ -72,8 +95,22 @@ class StructuredLogger:
             }
         }
         
-        with open(Config.LOG_JSONL_FILE, 'a') as f:
-            f.write(json.dumps(log_entry) + '\n')
+        if tasks:
+            log_entry["tasks"] = {
+                name: {
+                    "pred_label": task.get("label"),
+                    "confidence": task.get("confidence"),
+                    "final_label": task.get("final_label") or task.get("label"),
+                    "via": task.get("decision_via") or "direct_prediction"
+                }
+                for name, task in tasks.items()
+            }
+        
+        if self.compact_writer is not None:
+            self.compact_writer.write(log_entry)
+        else:
+            with open(Config.LOG_JSONL_FILE, 'a') as f:
+                f.write(json.dumps(log_entry) + '\n')
         
         self.file_logger.info(f"Request {request_id}: {final_label or pred_label} (confidence: {confidence:.2%})")
         
@@ -0,0 +1,228 @@
+import copy
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import numpy as np
+import torch
+import torch.nn.functional as F
+from datasets import Dataset, DatasetDict
+from transformers import Trainer
+from src.app.config import Config
+from src.app.model.evaluation import compute_logits, load_eval_model, load_split, softmax
+from src.app.model.pruning import prune_layers, transformer_blocks
+from src.app.model.temperature_scaling import TemperatureScaling
+from src.app.model.trainer import ModelTrainer
+
+
+def build_student(teacher, n_layers: int):
+    teacher_layers = len(transformer_blocks(teacher))
+    if not 1 <= n_layers < teacher_layers:
+        raise ValueError(f"Student needs between 1 and {teacher_layers - 1} layers, got {n_layers}")
+    keep = np.linspace(0, teacher_layers - 1, n_layers).round().astype(int).tolist()
+    student = prune_layers(copy.deepcopy(teacher), keep)
+    return student.train()
+
+
+def logged_texts(limit: int) -> List[str]:
+    from src.app.utils.log_store import iter_log_entries
+
+    seen = set()
+    texts = []
+    for entry in iter_log_entries():
+        text = entry.get("input_text")
+        if text and text not in seen:
+            seen.add(text)
+            texts.append(text)
+            if len(texts) >= limit:
+                break
+    return texts
+
+
+class DistillationTrainer(Trainer):
+    def __init__(self, *args, temperature: float = None, alpha: float = None, **kwargs):
+        config = Config.DISTILLATION_CONFIG
+        self.temperature = temperature or config["temperature"]
+        self.alpha = config["alpha"] if alpha is None else alpha
+        kwargs["args"].remove_unused_columns = False
+        super().__init__(*args, **kwargs)
+
+    def compute_loss(self, model, inputs, return_outputs=False, num_items_in_batch=None):
+        labels = inputs.get("labels")
+        teacher_logits = inputs.get("teacher_logits")
+        outputs = model(**{k: v for k, v in inputs.items() if k not in ("labels", "teacher_logits")})
+        logits = outputs.logits
+
+        soft = F.kl_div(
+            F.log_softmax(logits / self.temperature, dim=-1),
+            F.softmax(teacher_logits.float() / self.temperature, dim=-1),
+            reduction="batchmean"
+        ) * self.temperature ** 2
+        labeled = labels >= 0
+        hard = F.cross_entropy(logits[labeled], labels[labeled]) if labeled.any() else logits.new_zeros(())
+        loss = self.alpha * soft + (1 - self.alpha) * hard
+        return (loss, outputs) if return_outputs else loss
+
+
+class StudentTrainer(ModelTrainer):
+    trainer_class = DistillationTrainer
+
+    def __init__(self, teacher_path: str = None, dataset_name: str = None, n_layers: int = None):
+        super().__init__(dataset_name=dataset_name)
+        self.teacher_path = str(teacher_path or Config.CHECKPOINTS_DIR / "model")
+        self.n_layers = n_layers or Config.DISTILLATION_CONFIG["student_layers"]
+        self.teacher = None
+        self.calibration = None
+        self.holdout = None
+
+    def load_teacher(self):
+        self.tokenizer, self.teacher = load_eval_model(self.teacher_path)
+        self.teacher = self.teacher.float().eval()
+        self.model = build_student(self.teacher, self.n_layers)
+        return self.teacher
+
+    def prepare_data(self, max_samples: int = None, extra_texts: Optional[List[str]] = None):
+        config = Config.DISTILLATION_CONFIG
+        max_samples = max_samples or config["max_samples"]
+        train_texts, train_labels = load_split(self.dataset_name, "train", max_samples=max_samples)
+        eval_texts, eval_labels = load_split(self.dataset_name, "test", max_samples=config["eval_samples"])
+
+        extra_texts = list(extra_texts or [])
+        texts = list(train_texts) + extra_texts
+        labels = np.concatenate([train_labels, np.full(len(extra_texts), -100)]).astype(int)
+        eval_labels = np.asarray(eval_labels)
+        order = np.random.RandomState(Config.EVALUATION_CONFIG["seed"]).permutation(len(eval_texts))
+        split = int(len(order) * Config.EVALUATION_CONFIG["calibration_fraction"])
+        fit_idx, held_out = order[:split], order[split:]
+        self.calibration = ([eval_texts[i] for i in fit_idx], eval_labels[fit_idx])
+        self.holdout = ([eval_texts[i] for i in held_out], eval_labels[held_out])
+
+        def encode(split_texts, split_labels):
+            max_length = Config.TRAINING_CONFIG["max_seq_length"]
+            teacher_logits = compute_logits(self.teacher, self.tokenizer, split_texts, max_length=max_length)
+            encoded = self.tokenizer(split_texts, truncation=True, max_length=max_length)
+            return Dataset.from_dict({
+                **encoded,
+                "labels": [int(label) for label in split_labels],
+                "teacher_logits": teacher_logits.tolist()
+            })
+
+        self.dataset = DatasetDict({"train": encode(texts, labels), "test": encode(eval_texts, eval_labels)})
+        return self.dataset
+
+    def train(self, output_dir: str = None, profile: str = None):
+        config = Config.DISTILLATION_CONFIG
+        output_dir = Path(output_dir or config["output_dir"])
+        self.training_overrides.update({
+            "num_train_epochs": config["num_train_epochs"],
+            "learning_rate": config["learning_rate"]
+        })
+        trainer, eval_results = super().train(output_dir=output_dir, profile=profile)
+
+        texts, labels = self.calibration
+        student = trainer.model.eval()
+        scaler = TemperatureScaling(None)
+        temperature, _, _ = scaler.fit_logits(
+            torch.from_numpy(compute_logits(student, self.tokenizer, texts)), torch.from_numpy(labels)
+        )
+        held_texts, held_labels = self.holdout
+        held_logits = compute_logits(student, self.tokenizer, held_texts)
+        student.config.calibrated_temperature = temperature
+        student.save_pretrained(output_dir)
+        eval_results["calibration"] = {
+            "temperature": temperature,
+            "ece_before": float(scaler._compute_ece(softmax(held_logits), held_labels)),
+            "ece_after": float(scaler._compute_ece(softmax(held_logits, temperature), held_labels)),
+            "calibration_samples": len(texts),
+            "held_out_samples": len(held_texts)
+        }
+        return trainer, eval_results
+
+
+def benchmark_student(
+    teacher,
+    student,
+    tokenizer,
+    texts: List[str],
+    labels: Optional[np.ndarray] = None,
+    teacher_temperature: float = 1.0,
+    student_temperature: float = 1.0,
+    batch_size: int = None
+) -> Dict[str, Any]:
+    accept = Config.CONFIDENCE_THRESHOLDS["accept"]
+    results = {}
+    probs = {}
+    for name, model, temperature in (
+        ("teacher", teacher, teacher_temperature),
+        ("student", student, student_temperature)
+    ):
+        start = time.perf_counter()
+        logits = compute_logits(model.eval(), tokenizer, texts, batch_size=batch_size)
+        seconds = time.perf_counter() - start
+        probs[name] = softmax(logits, temperature)
+        results[name] = {
+            "samples_per_second": len(texts) / seconds if seconds else None,
+            "parameters": sum(p.numel() for p in model.parameters()),
+            "accept_rate": float((probs[name].max(axis=1) >= accept).mean()),
+            "temperature": temperature
+        }
+        if labels is not None:
+            results[name]["accuracy"] = float((probs[name].argmax(axis=1) == labels).mean())
+
+    agree = probs["teacher"].argmax(axis=1) == probs["student"].argmax(axis=1)
+    student_accepts = probs["student"].max(axis=1) >= accept
+    results["agreement"] = float(agree.mean())
+    results["accept_path_agreement"] = float(agree[student_accepts].mean()) if student_accepts.any() else None
+    results["speedup"] = results["student"]["samples_per_second"] / results["teacher"]["samples_per_second"]
+    return results
+
+
+def distill(
+    teacher_path: str = None,
+    output_dir: str = None,
+    n_layers: int = None,
+    dataset_name: str = None,
+    max_samples: int = None,
+    use_logs: bool = True,
+    profile: str = None,
+    progress_callback=None
+) -> Dict[str, Any]:
+    config = Config.DISTILLATION_CONFIG
+    output_dir = Path(output_dir or config["output_dir"])
+    report_progress = progress_callback or (lambda message: None)
+    student_trainer = StudentTrainer(teacher_path, dataset_name=dataset_name, n_layers=n_layers)
+    report_progress("Loading teacher...")
+    student_trainer.load_teacher()
+    extra_texts = logged_texts(config["max_log_texts"]) if use_logs else []
+    report_progress(f"Scoring {len(extra_texts)} logged texts and the training split with the teacher...")
+    student_trainer.prepare_data(max_samples=max_samples, extra_texts=extra_texts)
+    report_progress(f"Training {student_trainer.n_layers}-layer student...")
+    trainer, eval_results = student_trainer.train(output_dir=output_dir, profile=profile)
+    report_progress("Benchmarking student against teacher...")
+
+    texts, labels = student_trainer.holdout
+    benchmark = benchmark_student(
+        student_trainer.teacher,
+        trainer.model,
+        student_trainer.tokenizer,
+        texts,
+        labels,
+        teacher_temperature=float(getattr(student_trainer.teacher.config, "calibrated_temperature", 1.0)),
+        student_temperature=eval_results["calibration"]["temperature"]
+    )
+    report = {
+        "teacher": student_trainer.teacher_path,
+        "student": str(output_dir),
+        "student_layers": student_trainer.n_layers,
+        "train_samples": len(student_trainer.dataset["train"]),
+        "logged_texts": len(extra_texts),
+        "calibration": eval_results["calibration"],
+        "benchmark": benchmark
+    }
+
+    report_file = Path(config["report_file"])
+    report_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_file, "w") as f:
+        json.dump(report, f, indent=2)
+    report["report_file"] = str(report_file)
+    return report
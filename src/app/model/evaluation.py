@@ -0,0 +1,181 @@
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import torch
+from sklearn.metrics import accuracy_score, f1_score
+from src.app.config import Config
+from src.app.model.snapshot import is_snapshot, load_merged_model, load_snapshot
+from src.app.model.temperature_scaling import TemperatureScaling
+
+
+def load_eval_model(model_path: str):
+    if is_snapshot(model_path):
+        tokenizer, model, _, _ = load_snapshot(model_path)
+    else:
+        from transformers import AutoTokenizer
+        tokenizer = AutoTokenizer.from_pretrained(model_path)
+        model = load_merged_model(model_path)
+    return tokenizer, model.eval()
+
+
+def load_split(
+    dataset_name: str,
+    split: str,
+    max_samples: Optional[int] = None,
+    text_field: str = "text",
+    label_field: str = "label"
+) -> Tuple[List[str], np.ndarray]:
+    from datasets import load_dataset
+
+    path = Path(dataset_name)
+    if path.is_file():
+        file_format = "csv" if path.suffix.lower() == ".csv" else "json"
+        dataset = load_dataset(file_format, data_files={split: str(path)}, split=split)
+    else:
+        dataset = load_dataset(dataset_name, split=split)
+    if max_samples:
+        dataset = dataset.shuffle(seed=Config.EVALUATION_CONFIG["seed"]).select(range(min(max_samples, len(dataset))))
+    return list(dataset[text_field]), np.asarray(dataset[label_field])
+
+
+def compute_logits(
+    model,
+    tokenizer,
+    texts: List[str],
+    batch_size: int = None,
+    max_length: int = None,
+    device: str = "cpu",
+    progress_callback=None
+) -> np.ndarray:
+    batch_size = batch_size or Config.EVALUATION_CONFIG["batch_size"]
+    max_length = max_length or Config.TRAINING_CONFIG["max_seq_length"]
+    encoded = tokenizer(texts, truncation=True, max_length=max_length)["input_ids"]
+    order = np.argsort([len(ids) for ids in encoded], kind="stable")
+
+    model.to(device)
+    logits = None
+    with torch.inference_mode():
+        for start in range(0, len(order), batch_size):
+            idx = order[start:start + batch_size]
+            batch = tokenizer.pad(
+                [{"input_ids": encoded[i]} for i in idx],
+                return_tensors="pt"
+            )
+            batch = {k: v.to(device) for k, v in batch.items()}
+            out = model(**batch).logits.float().cpu().numpy()
+            if logits is None:
+                logits = np.zeros((len(texts), out.shape[1]), dtype=np.float32)
+            logits[idx] = out
+            if progress_callback:
+                progress_callback(len(idx))
+
+    return logits if logits is not None else np.zeros((0, 2), dtype=np.float32)
+
+
+def cache_key(model_path: str, dataset_name: str, split: str, max_samples: Optional[int], max_length: int) -> str:
+    path = Path(model_path)
+    files = [path] if path.is_file() else sorted(p for p in path.glob("*") if p.is_file())
+    fingerprint = [(p.name, p.stat().st_size, int(p.stat().st_mtime)) for p in files]
+    payload = json.dumps([str(path.resolve()), fingerprint, dataset_name, split, max_samples, max_length])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def cached_logits(
+    model_path: str,
+    texts: List[str],
+    labels: np.ndarray,
+    dataset_name: str,
+    split: str,
+    max_samples: Optional[int] = None,
+    batch_size: int = None,
+    max_length: int = None,
+    use_cache: bool = True,
+    cache_dir: Optional[Path] = None,
+    progress_callback=None
+) -> Dict[str, Any]:
+    max_length = max_length or Config.TRAINING_CONFIG["max_seq_length"]
+    cache_dir = Path(cache_dir or Config.EVALUATION_CONFIG["cache_dir"])
+    cache_file = cache_dir / f"{cache_key(model_path, dataset_name, split, max_samples, max_length)}.npz"
+
+    if use_cache and cache_file.exists():
+        cached = np.load(cache_file)
+        return {
+            "logits": cached["logits"],
+            "labels": cached["labels"],
+            "cached": True,
+            "seconds": float(cached["seconds"]),
+            "cache_file": str(cache_file)
+        }
+
+    tokenizer, model = load_eval_model(model_path)
+    start = time.perf_counter()
+    logits = compute_logits(
+        model, tokenizer, texts,
+        batch_size=batch_size, max_length=max_length, progress_callback=progress_callback
+    )
+    seconds = time.perf_counter() - start
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    np.savez(cache_file, logits=logits, labels=labels, seconds=seconds)
+    return {"logits": logits, "labels": labels, "cached": False, "seconds": seconds, "cache_file": str(cache_file)}
+
+
+def softmax(logits: np.ndarray, temperature: float = 1.0) -> np.ndarray:
+    scaled = logits / temperature
+    scaled = scaled - scaled.max(axis=1, keepdims=True)
+    exp = np.exp(scaled)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+def routing_distribution(probs: np.ndarray, labels: np.ndarray, thresholds: Dict[str, float] = None) -> Dict[str, Any]:
+    thresholds = thresholds or Config.CONFIDENCE_THRESHOLDS
+    confidence = probs.max(axis=1)
+    correct = probs.argmax(axis=1) == labels
+    routes = {
+        "accept": confidence >= thresholds["accept"],
+        "ask_clarify": (confidence >= thresholds["clarify"]) & (confidence < thresholds["accept"]),
+        "escalate": confidence < thresholds["clarify"]
+    }
+    return {
+        route: {
+            "share": float(mask.mean()) if len(mask) else 0.0,
+            "accuracy": float(correct[mask].mean()) if mask.any() else None
+        }
+        for route, mask in routes.items()
+    }
+
+
+def evaluate_logits(
+    logits: np.ndarray,
+    labels: np.ndarray,
+    thresholds: Dict[str, float] = None,
+    calibration_fraction: float = None,
+    seed: int = None
+) -> Dict[str, Any]:
+    config = Config.EVALUATION_CONFIG
+    calibration_fraction = calibration_fraction or config["calibration_fraction"]
+    predictions = logits.argmax(axis=1)
+    average = "binary" if logits.shape[1] == 2 else "macro"
+
+    order = np.random.RandomState(config["seed"] if seed is None else seed).permutation(len(labels))
+    split = int(len(order) * calibration_fraction)
+    fit_idx, held_out = order[:split], order[split:]
+
+    scaler = TemperatureScaling(None)
+    temperature, _, _ = scaler.fit_logits(torch.from_numpy(logits[fit_idx]), torch.from_numpy(labels[fit_idx]))
+
+    held_logits, held_labels = logits[held_out], labels[held_out]
+    return {
+        "samples": int(len(labels)),
+        "accuracy": float(accuracy_score(labels, predictions)),
+        "f1": float(f1_score(labels, predictions, average=average)),
+        "temperature": temperature,
+        "ece_before": float(scaler._compute_ece(softmax(held_logits), held_labels)),
+        "ece_after": float(scaler._compute_ece(softmax(held_logits, temperature), held_labels)),
+        "calibration_samples": int(len(fit_idx)),
+        "routing": routing_distribution(softmax(logits), labels, thresholds),
+        "routing_calibrated": routing_distribution(softmax(logits, temperature), labels, thresholds)
+    }
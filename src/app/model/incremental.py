@@ -0,0 +1,206 @@
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from datasets import Dataset, DatasetDict
+from peft import AutoPeftModelForSequenceClassification, LoraConfig, TaskType, get_peft_model
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+from src.app.config import Config
+from src.app.model.evaluation import compute_logits, load_split, softmax
+from src.app.model.snapshot import label_map_from_config
+from src.app.model.trainer import ModelTrainer
+
+
+def versions_manifest() -> Path:
+    return Path(Config.INCREMENTAL_CONFIG["versions_dir"]) / "versions.json"
+
+
+def load_versions() -> List[Dict[str, Any]]:
+    manifest = versions_manifest()
+    if not manifest.exists():
+        return []
+    with open(manifest, "r") as f:
+        return json.load(f)
+
+
+def record_version(entry: Dict[str, Any]):
+    versions = load_versions() + [entry]
+    manifest = versions_manifest()
+    manifest.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = manifest.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(versions, f, indent=2)
+    tmp_path.replace(manifest)
+
+
+def latest_checkpoint() -> str:
+    versions = load_versions()
+    return versions[-1]["path"] if versions else str(Config.CHECKPOINTS_DIR / "model")
+
+
+def collect_corrections(
+    entries: Iterable[Dict[str, Any]],
+    label2id: Dict[str, int],
+    since: Optional[str] = None,
+    sources: List[str] = None
+) -> Tuple[List[str], List[int], Optional[str]]:
+    sources = sources or Config.INCREMENTAL_CONFIG["sources"]
+    corrections = {}
+    latest = since
+    for entry in entries:
+        timestamp = entry.get("timestamp", "")
+        decision = entry.get("final_decision", {})
+        if since and timestamp <= since:
+            continue
+        if decision.get("via") not in sources or decision.get("label") not in label2id:
+            continue
+        corrections[entry["input_text"]] = label2id[decision["label"]]
+        latest = max(latest or timestamp, timestamp)
+    return list(corrections), list(corrections.values()), latest
+
+
+def recent_texts(entries: Iterable[Dict[str, Any]], limit: int, exclude: Iterable[str] = ()) -> List[str]:
+    exclude = set(exclude)
+    texts = [entry["input_text"] for entry in entries if entry.get("input_text") and entry["input_text"] not in exclude]
+    return texts[-limit:]
+
+
+def fallback_rate(probs: np.ndarray, thresholds: Dict[str, float] = None) -> Dict[str, float]:
+    thresholds = thresholds or Config.CONFIDENCE_THRESHOLDS
+    confidence = probs.max(axis=1) if len(probs) else np.zeros(0)
+    share = lambda mask: float(mask.mean()) if len(mask) else 0.0
+    return {
+        "fallback_rate": share(confidence < thresholds["accept"]),
+        "ask_clarify": share((confidence >= thresholds["clarify"]) & (confidence < thresholds["accept"])),
+        "escalate": share(confidence < thresholds["clarify"])
+    }
+
+
+def load_trainable(model_path: str):
+    if (Path(model_path) / "adapter_config.json").exists():
+        return AutoPeftModelForSequenceClassification.from_pretrained(model_path, is_trainable=True)
+
+    lora_config = LoraConfig(
+        r=Config.LORA_CONFIG["r"],
+        lora_alpha=Config.LORA_CONFIG["lora_alpha"],
+        target_modules=Config.LORA_CONFIG["target_modules"],
+        lora_dropout=Config.LORA_CONFIG["lora_dropout"],
+        bias=Config.LORA_CONFIG["bias"],
+        task_type=TaskType.SEQ_CLS
+    )
+    return get_peft_model(AutoModelForSequenceClassification.from_pretrained(model_path), lora_config)
+
+
+class IncrementalTrainer(ModelTrainer):
+    def __init__(self, base_path: str = None, dataset_name: str = None):
+        super().__init__(dataset_name=dataset_name)
+        self.base_path = str(base_path or latest_checkpoint())
+        self.label2id = {}
+
+    def load_base(self):
+        self.tokenizer = AutoTokenizer.from_pretrained(self.base_path)
+        self.model = load_trainable(self.base_path)
+        self.label2id = {label: idx for idx, label in label_map_from_config(self.model.config).items()}
+        return self.model
+
+    def prepare_data(self, texts: List[str], labels: List[int], replay_samples: int, eval_samples: int):
+        replay_texts, replay_labels = load_split(self.dataset_name, "train", max_samples=replay_samples) if replay_samples else ([], [])
+        eval_texts, eval_labels = load_split(self.dataset_name, "test", max_samples=eval_samples)
+        max_length = Config.TRAINING_CONFIG["max_seq_length"]
+
+        def encode(split_texts, split_labels):
+            encoded = self.tokenizer(list(split_texts), truncation=True, max_length=max_length)
+            return Dataset.from_dict({**encoded, "labels": [int(label) for label in split_labels]})
+
+        self.dataset = DatasetDict({
+            "train": encode(list(texts) + list(replay_texts), list(labels) + list(replay_labels)).shuffle(
+                seed=Config.EVALUATION_CONFIG["seed"]
+            ),
+            "test": encode(eval_texts, eval_labels)
+        })
+        return len(replay_texts), eval_texts, np.asarray(eval_labels)
+
+
+def incremental_update(
+    base_path: str = None,
+    dataset_name: str = None,
+    replay_ratio: float = None,
+    since: Optional[str] = None,
+    profile: str = None,
+    progress_callback=None
+) -> Dict[str, Any]:
+    from src.app.utils.log_store import iter_log_entries
+
+    config = Config.INCREMENTAL_CONFIG
+    replay_ratio = config["replay_ratio"] if replay_ratio is None else replay_ratio
+    report_progress = progress_callback or (lambda message: None)
+    versions = load_versions()
+    trainer = IncrementalTrainer(base_path, dataset_name=dataset_name)
+    if since is None:
+        since = next(
+            (version["corrections_until"] for version in reversed(versions)
+             if Path(version["path"]).resolve() == Path(trainer.base_path).resolve()),
+            None
+        )
+    report_progress(f"Loading {trainer.base_path}...")
+    trainer.load_base()
+
+    texts, labels, corrections_until = collect_corrections(iter_log_entries(), trainer.label2id, since=since)
+    if len(texts) < config["min_corrections"]:
+        raise ValueError(
+            f"Found {len(texts)} new corrections"
+            f"{f' since {since}' if since else ''}, need at least {config['min_corrections']}"
+        )
+    recent = recent_texts(iter_log_entries(), config["recent_samples"], exclude=texts)
+
+    report_progress(f"Preparing {len(texts)} corrections plus replay sample...")
+    replay_samples = min(int(len(texts) * replay_ratio), config["max_replay"])
+    replay_count, eval_texts, eval_labels = trainer.prepare_data(texts, labels, replay_samples, config["eval_samples"])
+
+    def score(model) -> Dict[str, Any]:
+        model.eval()
+        return {
+            "recent": fallback_rate(softmax(compute_logits(model, trainer.tokenizer, recent))),
+            "corrections_matched": float(
+                (compute_logits(model, trainer.tokenizer, texts).argmax(axis=1) == np.asarray(labels)).mean()
+            ),
+            "heldout_accuracy": float((compute_logits(model, trainer.tokenizer, eval_texts).argmax(axis=1) == eval_labels).mean())
+        }
+
+    report_progress("Scoring base model on recent traffic...")
+    before = score(trainer.model)
+
+    version = f"v{len(versions) + 1:03d}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    output_dir = Path(config["versions_dir"]) / version
+    trainer.training_overrides.update({
+        "num_train_epochs": config["num_train_epochs"],
+        "learning_rate": config["learning_rate"]
+    })
+    report_progress(f"Training {version}...")
+    hf_trainer, _ = trainer.train(output_dir=output_dir, profile=profile)
+
+    report_progress("Scoring updated model on recent traffic...")
+    after = score(hf_trainer.model)
+
+    report = {
+        "version": version,
+        "path": str(output_dir),
+        "parent": trainer.base_path,
+        "created_at": datetime.now().isoformat(),
+        "corrections": len(texts),
+        "corrections_until": corrections_until,
+        "replay_samples": replay_count,
+        "recent_samples": len(recent),
+        "before": before,
+        "after": after,
+        "fallback_rate_change": after["recent"]["fallback_rate"] - before["recent"]["fallback_rate"]
+    }
+    record_version(report)
+
+    report_file = Path(config["report_file"])
+    report_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_file, "w") as f:
+        json.dump(report, f, indent=2)
+    report["report_file"] = str(report_file)
+    return report
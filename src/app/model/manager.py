@@ -0,0 +1,218 @@
+import gc
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+from src.app.config import Config
+
+
+def estimate_size(model: Any) -> int:
+    import torch
+
+    module = getattr(model, "model", model)
+    if not isinstance(module, torch.nn.Module):
+        return 0
+
+    seen = set()
+    total = 0
+    for tensor in list(module.parameters()) + list(module.buffers()):
+        if tensor.device.type == "meta" or tensor.data_ptr() in seen:
+            continue
+        seen.add(tensor.data_ptr())
+        total += tensor.numel() * tensor.element_size()
+    return total
+
+
+class _ManagedModel:
+    def __init__(self, name: str, loader: Optional[Callable[[], Any]], pinned: bool):
+        self.name = name
+        self.loader = loader
+        self.pinned = pinned
+        self.model = None
+        self.loaded_pid = None
+        self.resident_bytes = 0
+        self.last_size = 0
+        self.last_used = 0.0
+        self.in_use = 0
+        self.loads = 0
+        self.evictions = 0
+        self.load_seconds = 0.0
+        self.lock = threading.Lock()
+
+
+class ModelManager:
+    def __init__(
+        self,
+        budget_bytes: Optional[int] = None,
+        idle_ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        config = Config.MODEL_MANAGER_CONFIG
+        budget_mb = config["budget_mb"]
+        self.budget_bytes = budget_bytes if budget_bytes is not None else (
+            int(budget_mb * 1024 * 1024) if budget_mb else None
+        )
+        self.idle_ttl = idle_ttl if idle_ttl is not None else config["idle_ttl_seconds"]
+        self.clock = clock
+        self._models: Dict[str, _ManagedModel] = {}
+        self._lock = threading.Lock()
+        self._reaper = None
+        self._reaper_pid = None
+        self._stop = threading.Event()
+
+    def register(self, name: str, loader: Callable[[], Any], pinned: bool = False):
+        with self._lock:
+            entry = self._models.get(name)
+            if entry is None:
+                self._models[name] = _ManagedModel(name, loader, pinned)
+            else:
+                entry.loader = loader
+                entry.pinned = pinned
+
+    def put(self, name: str, model: Any, loader: Optional[Callable[[], Any]] = None, pinned: bool = False):
+        with self._lock:
+            entry = self._models.get(name) or _ManagedModel(name, loader, pinned)
+            self._models[name] = entry
+            entry.loader = loader or entry.loader
+            entry.pinned = pinned
+        with entry.lock:
+            entry.model = model
+            entry.loaded_pid = os.getpid()
+            entry.resident_bytes = entry.last_size = estimate_size(model)
+            entry.last_used = self.clock()
+        self._enforce_budget(keep=name)
+        return model
+
+    def is_loaded(self, name: str) -> bool:
+        entry = self._models.get(name)
+        return entry is not None and entry.model is not None
+
+    def get(self, name: str) -> Any:
+        with self.use(name) as model:
+            return model
+
+    @contextmanager
+    def use(self, name: str) -> Iterator[Any]:
+        entry = self._models.get(name)
+        if entry is None:
+            raise KeyError(f"Unknown model: {name}")
+
+        if self.idle_ttl and not entry.pinned:
+            self._ensure_reaper()
+        with entry.lock:
+            if entry.model is None:
+                self._load(entry)
+            entry.in_use += 1
+            entry.last_used = self.clock()
+            model = entry.model
+
+        try:
+            yield model
+        finally:
+            with entry.lock:
+                entry.in_use -= 1
+                entry.last_used = self.clock()
+
+    def _load(self, entry: _ManagedModel):
+        if entry.loader is None:
+            raise RuntimeError(f"Model {entry.name} was evicted and has no loader")
+        self._enforce_budget(keep=entry.name, incoming=entry.last_size)
+
+        start = time.perf_counter()
+        entry.model = entry.loader()
+        entry.loaded_pid = os.getpid()
+        entry.load_seconds = time.perf_counter() - start
+        entry.resident_bytes = entry.last_size = estimate_size(entry.model)
+        entry.loads += 1
+        print(f"Loaded model {entry.name} ({entry.resident_bytes / 1e6:.0f} MB in {entry.load_seconds:.1f}s)")
+        self._enforce_budget(keep=entry.name)
+
+    def _evictable(self, keep: Optional[str] = None):
+        pid = os.getpid()
+        return sorted(
+            (e for e in self._models.values()
+             if e.name != keep and e.model is not None and not e.pinned and not e.in_use and e.loader
+             and e.loaded_pid == pid),
+            key=lambda e: e.last_used
+        )
+
+    def _enforce_budget(self, keep: Optional[str] = None, incoming: int = 0):
+        if self.budget_bytes is None:
+            return
+        for entry in self._evictable(keep):
+            if self.resident_bytes() + incoming <= self.budget_bytes:
+                return
+            self._evict(entry, reason="budget")
+
+    def _evict(self, entry: _ManagedModel, reason: str) -> bool:
+        if not entry.lock.acquire(blocking=False):
+            return False
+        try:
+            if entry.model is None or entry.in_use or entry.pinned or entry.loader is None:
+                return False
+            entry.model = None
+            entry.resident_bytes = 0
+            entry.evictions += 1
+        finally:
+            entry.lock.release()
+        gc.collect()
+        print(f"Evicted model {entry.name} ({reason})")
+        return True
+
+    def evict(self, name: str) -> bool:
+        entry = self._models.get(name)
+        return entry is not None and self._evict(entry, reason="manual")
+
+    def evict_idle(self) -> int:
+        if not self.idle_ttl:
+            return 0
+        now = self.clock()
+        return sum(
+            self._evict(entry, reason="idle")
+            for entry in self._evictable()
+            if now - entry.last_used >= self.idle_ttl
+        )
+
+    def _ensure_reaper(self):
+        pid = os.getpid()
+        if self._reaper_pid == pid:
+            return
+        with self._lock:
+            if self._reaper_pid == pid:
+                return
+            self._reaper = threading.Thread(target=self._reap, name="model-reaper", daemon=True)
+            self._reaper.start()
+            self._reaper_pid = pid
+
+    def _reap(self):
+        interval = max(1.0, min(self.idle_ttl / 2, Config.MODEL_MANAGER_CONFIG["reap_interval_seconds"]))
+        while not self._stop.wait(interval):
+            self.evict_idle()
+
+    def resident_bytes(self) -> int:
+        return sum(entry.resident_bytes for entry in self._models.values())
+
+    def stats(self) -> Dict[str, Any]:
+        now = self.clock()
+        return {
+            "budget_bytes": self.budget_bytes,
+            "idle_ttl_seconds": self.idle_ttl,
+            "resident_bytes": self.resident_bytes(),
+            "models": {
+                name: {
+                    "loaded": entry.model is not None,
+                    "pinned": entry.pinned,
+                    "resident_bytes": entry.resident_bytes,
+                    "in_use": entry.in_use,
+                    "idle_seconds": now - entry.last_used if entry.model is not None else None,
+                    "loads": entry.loads,
+                    "evictions": entry.evictions,
+                    "last_load_seconds": entry.load_seconds
+                }
+                for name, entry in self._models.items()
+            }
+        }
+
+
+model_manager = ModelManager()
@@ -0,0 +1,86 @@
+from typing import Dict, List, Tuple
+import torch
+from torch import nn
+from transformers import AutoTokenizer
+from src.app.model.snapshot import label_map_from_config, load_merged_model
+
+
+class ClassificationHead(nn.Module):
+    def __init__(self, model):
+        super().__init__()
+        self.model_type = model.config.model_type
+        if self.model_type == "distilbert":
+            self.pre_classifier = model.pre_classifier
+            self.classifier = model.classifier
+        elif hasattr(model, "classifier") and getattr(model.base_model, "pooler", None) is not None:
+            self.classifier = model.classifier
+        else:
+            raise ValueError(f"Shared-encoder heads are not supported for {self.model_type} checkpoints")
+
+    def forward(self, encoder_outputs) -> torch.Tensor:
+        if self.model_type == "distilbert":
+            pooled = encoder_outputs.last_hidden_state[:, 0]
+            return self.classifier(torch.relu(self.pre_classifier(pooled)))
+        return self.classifier(encoder_outputs.pooler_output)
+
+
+def same_weights(a: nn.Module, b: nn.Module) -> bool:
+    a_state, b_state = a.state_dict(), b.state_dict()
+    if a_state.keys() != b_state.keys():
+        return False
+    return all(
+        a_state[k].shape == b_state[k].shape and torch.equal(a_state[k], b_state[k])
+        for k in a_state
+    )
+
+
+class MultiTaskModel(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.encoders = nn.ModuleList()
+        self.heads = nn.ModuleDict()
+        self.task_groups: List[List[str]] = []
+        self.temperatures: Dict[str, float] = {}
+
+    def add_task(self, name: str, model) -> bool:
+        encoder = model.base_model
+        head = ClassificationHead(model)
+        self.temperatures[name] = float(getattr(model.config, "calibrated_temperature", 1.0))
+
+        for idx, shared in enumerate(self.encoders):
+            if same_weights(shared, encoder):
+                self.task_groups[idx].append(name)
+                self.heads[name] = head
+                return True
+
+        self.encoders.append(encoder)
+        self.task_groups.append([name])
+        self.heads[name] = head
+        return False
+
+    def forward(self, **inputs) -> Dict[str, torch.Tensor]:
+        logits = {}
+        for encoder, tasks in zip(self.encoders, self.task_groups):
+            outputs = encoder(**inputs)
+            for task in tasks:
+                logits[task] = self.heads[task](outputs)
+        return logits
+
+
+def load_multitask(tasks: Dict[str, str]) -> Tuple[object, MultiTaskModel, Dict[str, Dict[int, str]]]:
+    if not tasks:
+        raise ValueError("At least one task checkpoint is required")
+
+    tokenizer = AutoTokenizer.from_pretrained(next(iter(tasks.values())))
+    model = MultiTaskModel()
+    label_maps = {}
+
+    for name, path in tasks.items():
+        task_model = load_merged_model(path)
+        label_maps[name] = label_map_from_config(task_model.config)
+        if not model.add_task(name, task_model):
+            if len(model.encoders) > 1:
+                print(f"Task {name} has its own fine-tuned encoder and needs a separate forward pass")
+
+    model.eval()
+    return tokenizer, model, label_maps
@@ -0,0 +1,302 @@
+import copy
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+import torch
+from src.app.config import Config
+
+
+def transformer_blocks(model) -> torch.nn.ModuleList:
+    base = getattr(model, "distilbert", None)
+    if base is None:
+        raise ValueError(f"Structured pruning supports DistilBERT classifiers, got {type(model).__name__}")
+    return base.transformer.layer
+
+
+def _batches(tokenizer, texts: List[str], labels: np.ndarray, batch_size: int, max_length: int):
+    for start in range(0, len(texts), batch_size):
+        batch = tokenizer(
+            texts[start:start + batch_size],
+            return_tensors="pt",
+            truncation=True,
+            max_length=max_length,
+            padding=True
+        )
+        yield batch, torch.as_tensor(labels[start:start + batch_size], dtype=torch.long)
+
+
+def importance_scores(
+    model,
+    tokenizer,
+    texts: List[str],
+    labels: np.ndarray,
+    batch_size: int = None,
+    max_length: int = None
+) -> Dict[str, np.ndarray]:
+    batch_size = batch_size or Config.PRUNING_CONFIG["batch_size"]
+    max_length = max_length or Config.TRAINING_CONFIG["max_seq_length"]
+    blocks = transformer_blocks(model)
+    n_heads = model.config.n_heads
+    head_mask = torch.ones(len(blocks), n_heads, requires_grad=True)
+    ffn_mask = torch.ones(len(blocks), model.config.hidden_dim, requires_grad=True)
+
+    def mask_heads(layer):
+        def hook(module, args):
+            context = args[0]
+            shape = context.shape
+            heads = context.view(*shape[:-1], n_heads, shape[-1] // n_heads) * head_mask[layer][:, None]
+            return (heads.view(shape),)
+        return hook
+
+    def mask_neurons(layer):
+        return lambda module, args: (args[0] * ffn_mask[layer],)
+
+    handles = []
+    for layer, block in enumerate(blocks):
+        handles.append(block.attention.out_lin.register_forward_pre_hook(mask_heads(layer)))
+        handles.append(block.ffn.lin2.register_forward_pre_hook(mask_neurons(layer)))
+
+    was_training = model.training
+    model.eval()
+    head_scores = torch.zeros_like(head_mask)
+    ffn_scores = torch.zeros_like(ffn_mask)
+    try:
+        for batch, batch_labels in _batches(tokenizer, texts, labels, batch_size, max_length):
+            loss = model(**batch, labels=batch_labels).loss
+            head_grad, ffn_grad = torch.autograd.grad(loss, [head_mask, ffn_mask])
+            head_scores += head_grad.abs()
+            ffn_scores += ffn_grad.abs()
+    finally:
+        for handle in handles:
+            handle.remove()
+        model.train(was_training)
+
+    head_scores = head_scores / head_scores.norm(dim=1, keepdim=True).clamp(min=1e-12)
+    return {"heads": head_scores.numpy(), "ffn": ffn_scores.numpy()}
+
+
+def prune_layers(model, keep: Sequence[int]):
+    blocks = transformer_blocks(model)
+    model.distilbert.transformer.layer = torch.nn.ModuleList([blocks[i] for i in sorted(keep)])
+    model.distilbert.transformer.n_layers = len(keep)
+    model.config.n_layers = len(keep)
+    return model
+
+
+def prune_ffn(model, neurons: Sequence[Sequence[int]]):
+    width = {len(keep) for keep in neurons}
+    if len(width) != 1:
+        raise ValueError("Every layer must keep the same number of FFN neurons to stay loadable")
+    for block, keep in zip(transformer_blocks(model), neurons):
+        index = torch.as_tensor(sorted(keep), dtype=torch.long)
+        lin1, lin2 = block.ffn.lin1, block.ffn.lin2
+        pruned1 = torch.nn.Linear(lin1.in_features, len(index))
+        pruned1.weight.data = lin1.weight.data[index].clone()
+        pruned1.bias.data = lin1.bias.data[index].clone()
+        pruned2 = torch.nn.Linear(len(index), lin2.out_features)
+        pruned2.weight.data = lin2.weight.data[:, index].clone()
+        pruned2.bias.data = lin2.bias.data.clone()
+        block.ffn.lin1, block.ffn.lin2 = pruned1, pruned2
+    model.config.hidden_dim = width.pop()
+    return model
+
+
+def layer_importance(model, tokenizer, texts: List[str], labels: np.ndarray, **kwargs) -> np.ndarray:
+    baseline = accuracy(model, tokenizer, texts, labels, **kwargs)
+    n_layers = len(transformer_blocks(model))
+    scores = []
+    for layer in range(n_layers):
+        candidate = prune_layers(copy.deepcopy(model), [i for i in range(n_layers) if i != layer])
+        scores.append(baseline - accuracy(candidate, tokenizer, texts, labels, **kwargs))
+    return np.asarray(scores)
+
+
+def build_pruned(model, scores: Dict[str, np.ndarray], n_layers: int, ffn_fraction: float):
+    keep_layers = sorted(np.argsort(-scores["layers"], kind="stable")[:n_layers].tolist())
+    width = max(1, int(round(model.config.hidden_dim * ffn_fraction)))
+    neurons = [np.argsort(-scores["ffn"][layer], kind="stable")[:width].tolist() for layer in keep_layers]
+    pruned = prune_layers(copy.deepcopy(model), keep_layers)
+    if width < model.config.hidden_dim:
+        prune_ffn(pruned, neurons)
+    return pruned.eval()
+
+
+def relative_cost(config, seq_length: float) -> float:
+    per_layer = 4 * config.dim ** 2 + 2 * config.dim * config.hidden_dim + 2 * seq_length * config.dim
+    return config.n_layers * per_layer
+
+
+def accuracy(model, tokenizer, texts: List[str], labels: np.ndarray, batch_size: int = None, max_length: int = None) -> float:
+    batch_size = batch_size or Config.PRUNING_CONFIG["batch_size"]
+    max_length = max_length or Config.TRAINING_CONFIG["max_seq_length"]
+    correct = 0
+    with torch.inference_mode():
+        for batch, batch_labels in _batches(tokenizer, texts, labels, batch_size, max_length):
+            correct += int((model(**batch).logits.argmax(dim=-1) == batch_labels).sum())
+    return correct / max(len(texts), 1)
+
+
+def measure_latency(model, tokenizer, texts: List[str], batch_size: int = None, max_length: int = None, repeats: int = None) -> float:
+    batch_size = batch_size or Config.PRUNING_CONFIG["batch_size"]
+    max_length = max_length or Config.TRAINING_CONFIG["max_seq_length"]
+    repeats = repeats or Config.PRUNING_CONFIG["latency_repeats"]
+    batch = tokenizer(texts[:batch_size], return_tensors="pt", truncation=True, max_length=max_length, padding=True)
+    with torch.inference_mode():
+        model(**batch)
+        start = time.perf_counter()
+        for _ in range(repeats):
+            model(**batch)
+    return (time.perf_counter() - start) * 1000 / (repeats * len(texts[:batch_size]))
+
+
+def select_config(
+    model,
+    tokenizer,
+    scores: Dict[str, np.ndarray],
+    texts: List[str],
+    labels: np.ndarray,
+    target_speedup: float,
+    seq_length: float,
+    ffn_fractions: Sequence[float] = None
+) -> Dict[str, Any]:
+    ffn_fractions = ffn_fractions or Config.PRUNING_CONFIG["ffn_fractions"]
+    full_cost = relative_cost(model.config, seq_length)
+    best = None
+    for n_layers in range(len(transformer_blocks(model)), 0, -1):
+        for fraction in ffn_fractions:
+            candidate_config = copy.copy(model.config)
+            candidate_config.n_layers = n_layers
+            candidate_config.hidden_dim = max(1, int(round(model.config.hidden_dim * fraction)))
+            speedup = full_cost / relative_cost(candidate_config, seq_length)
+            if speedup < target_speedup:
+                continue
+            candidate = build_pruned(model, scores, n_layers, fraction)
+            score = accuracy(candidate, tokenizer, texts, labels)
+            if best is None or score > best["validation_accuracy"]:
+                best = {
+                    "n_layers": n_layers,
+                    "ffn_fraction": fraction,
+                    "estimated_speedup": speedup,
+                    "validation_accuracy": score,
+                    "model": candidate
+                }
+    if best is None:
+        raise ValueError(f"No layer/FFN configuration reaches a {target_speedup}x speedup")
+    return best
+
+
+def finetune_with_lora(model, tokenizer, trainer, profile: Optional[str] = None):
+    from peft import LoraConfig, TaskType, get_peft_model
+
+    lora_config = LoraConfig(
+        r=Config.LORA_CONFIG["r"],
+        lora_alpha=Config.LORA_CONFIG["lora_alpha"],
+        target_modules=Config.LORA_CONFIG["target_modules"],
+        lora_dropout=Config.LORA_CONFIG["lora_dropout"],
+        bias=Config.LORA_CONFIG["bias"],
+        task_type=TaskType.SEQ_CLS
+    )
+    trainer.model = get_peft_model(model, lora_config)
+    trainer.tokenizer = tokenizer
+    trainer.training_overrides["num_train_epochs"] = Config.PRUNING_CONFIG["finetune_epochs"]
+    with tempfile.TemporaryDirectory() as output_dir:
+        trainer.train(output_dir=output_dir, profile=profile)
+    return trainer.model.merge_and_unload().eval()
+
+
+def prune_model(
+    model_path: str,
+    output_dir: str,
+    target_speedup: float = None,
+    levels: Sequence[float] = None,
+    finetune: bool = False,
+    dataset_name: str = None,
+    max_samples: int = None,
+    profile: Optional[str] = None,
+    trainer=None,
+    progress_callback=None
+) -> Dict[str, Any]:
+    from src.app.model.evaluation import load_eval_model, load_split
+
+    config = Config.PRUNING_CONFIG
+    target_speedup = target_speedup or config["target_speedup"]
+    if target_speedup <= 1.0:
+        raise ValueError(f"Target speedup must be greater than 1.0, got {target_speedup}")
+    levels = sorted(level for level in set(levels or config["levels"]) | {target_speedup} if level > 1.0)
+
+    tokenizer, model = load_eval_model(model_path)
+    model = model.float()
+    transformer_blocks(model)
+
+    texts, labels = load_split(dataset_name or Config.DATASET_NAME, config["split"], max_samples=max_samples or config["max_samples"])
+    split = max(1, len(texts) // 2)
+    score_texts, score_labels = texts[:split], labels[:split]
+    report_texts, report_labels = texts[split:], labels[split:]
+    seq_length = float(np.mean([
+        len(ids) for ids in tokenizer(score_texts, truncation=True, max_length=Config.TRAINING_CONFIG["max_seq_length"])["input_ids"]
+    ]))
+
+    def step(message):
+        if progress_callback:
+            progress_callback(message)
+
+    step("Scoring heads and FFN neurons")
+    scores = importance_scores(model, tokenizer, score_texts, score_labels)
+    step("Scoring layers")
+    scores["layers"] = layer_importance(model, tokenizer, score_texts, score_labels)
+
+    report = [{
+        "target_speedup": 1.0,
+        "n_layers": model.config.n_layers,
+        "ffn_fraction": 1.0,
+        "estimated_speedup": 1.0,
+        "validation_accuracy": accuracy(model, tokenizer, score_texts, score_labels),
+        "parameters": sum(p.numel() for p in model.parameters()),
+        "accuracy": accuracy(model, tokenizer, report_texts, report_labels),
+        "latency_ms_per_sample": measure_latency(model, tokenizer, report_texts)
+    }]
+    chosen = None
+    for level in levels:
+        step(f"Pruning to {level}x")
+        selected = select_config(model, tokenizer, scores, score_texts, score_labels, level, seq_length)
+        pruned = selected.pop("model")
+        report.append({
+            "target_speedup": level,
+            **selected,
+            "parameters": sum(p.numel() for p in pruned.parameters()),
+            "accuracy": accuracy(pruned, tokenizer, report_texts, report_labels),
+            "latency_ms_per_sample": measure_latency(pruned, tokenizer, report_texts)
+        })
+        if level == target_speedup:
+            chosen = pruned
+
+    baseline_latency = report[0]["latency_ms_per_sample"]
+    for row in report:
+        row["measured_speedup"] = baseline_latency / row["latency_ms_per_sample"]
+
+    result = {"target_speedup": target_speedup, "levels": report}
+    if finetune:
+        step("Fine-tuning pruned model with LoRA")
+        if trainer is None:
+            from src.app.model.trainer import ModelTrainer
+            trainer = ModelTrainer(dataset_name=dataset_name)
+            trainer.load_and_prepare_data(max_samples=config["finetune_samples"])
+        chosen = finetune_with_lora(chosen, tokenizer, trainer, profile=profile)
+        result["finetuned_accuracy"] = accuracy(chosen, tokenizer, report_texts, report_labels)
+
+    output_dir = Path(output_dir)
+    chosen.save_pretrained(output_dir)
+    tokenizer.save_pretrained(output_dir)
+    result["output_dir"] = str(output_dir)
+    result["head_importance"] = scores["heads"].round(4).tolist()
+    result["layer_importance"] = scores["layers"].round(4).tolist()
+
+    report_file = Path(config["report_file"])
+    report_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_file, "w") as f:
+        json.dump(result, f, indent=2)
+    result["report_file"] = str(report_file)
+    return result
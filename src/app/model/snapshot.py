@@ -0,0 +1,111 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, Tuple
+import torch
+from transformers import (
+    AutoConfig,
+    AutoModelForSequenceClassification,
+    AutoTokenizer,
+    PreTrainedTokenizerFast
+)
+
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_DTYPES = {
+    "float32": torch.float32,
+    "bfloat16": torch.bfloat16,
+    "float16": torch.float16
+}
+DEFAULT_LABEL_MAP = {0: "negative", 1: "positive"}
+TOKENIZER_SPECIAL_TOKENS = ["unk_token", "sep_token", "pad_token", "cls_token", "mask_token", "bos_token", "eos_token"]
+
+
+def is_snapshot(path) -> bool:
+    return Path(path).is_file()
+
+
+def label_map_from_config(config) -> Dict[int, str]:
+    id2label = {int(k): v for k, v in (getattr(config, "id2label", None) or {}).items()}
+    generic = all(v == f"LABEL_{k}" for k, v in id2label.items())
+    if not id2label or (generic and len(id2label) == len(DEFAULT_LABEL_MAP)):
+        return dict(DEFAULT_LABEL_MAP)
+    return id2label
+
+
+def load_merged_model(model_path: str):
+    if (Path(model_path) / "adapter_config.json").exists():
+        from peft import AutoPeftModelForSequenceClassification
+        return AutoPeftModelForSequenceClassification.from_pretrained(model_path).merge_and_unload()
+    return AutoModelForSequenceClassification.from_pretrained(model_path)
+
+
+def export_snapshot(
+    model_path: str,
+    output_path: str,
+    temperature: float = 1.0,
+    dtype: str = "float32"
+) -> Path:
+    if dtype not in SNAPSHOT_DTYPES:
+        raise ValueError(f"Unsupported snapshot dtype {dtype!r}, expected one of {list(SNAPSHOT_DTYPES)}")
+
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    if not tokenizer.is_fast:
+        raise ValueError("Snapshots require a fast (Rust) tokenizer")
+
+    model = load_merged_model(model_path).to(SNAPSHOT_DTYPES[dtype]).eval()
+    persistent = model.state_dict()
+    buffers = {
+        name: buffer for name, buffer in model.named_buffers()
+        if name not in persistent
+    }
+
+    tokenizer_kwargs = {
+        name: getattr(tokenizer, name) for name in TOKENIZER_SPECIAL_TOKENS
+        if getattr(tokenizer, name, None) is not None
+    }
+    tokenizer_kwargs["model_max_length"] = tokenizer.model_max_length
+
+    snapshot = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "config": model.config.to_json_string(),
+        "tokenizer": tokenizer.backend_tokenizer.to_str(),
+        "tokenizer_kwargs": json.dumps(tokenizer_kwargs),
+        "label_map": label_map_from_config(model.config),
+        "temperature": float(temperature),
+        "dtype": dtype,
+        "state_dict": {name: tensor.contiguous() for name, tensor in persistent.items()},
+        "buffers": buffers
+    }
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+    torch.save(snapshot, tmp_path)
+    tmp_path.replace(output_path)
+    return output_path
+
+
+def load_snapshot(path: str) -> Tuple[Any, Any, Dict[int, str], float]:
+    from tokenizers import Tokenizer
+
+    snapshot = torch.load(path, mmap=True, weights_only=True, map_location="cpu")
+    if snapshot.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format version: {snapshot.get('format_version')}")
+
+    config = AutoConfig.for_model(**json.loads(snapshot["config"]))
+    with torch.device("meta"):
+        model = AutoModelForSequenceClassification.from_config(config)
+    model.load_state_dict(snapshot["state_dict"], assign=True, strict=True)
+
+    for name, buffer in snapshot["buffers"].items():
+        module_name, _, buffer_name = name.rpartition(".")
+        module = model.get_submodule(module_name)
+        module.register_buffer(buffer_name, buffer, persistent=False)
+
+    model.eval()
+
+    tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=Tokenizer.from_str(snapshot["tokenizer"]),
+        **json.loads(snapshot["tokenizer_kwargs"])
+    )
+
+    return tokenizer, model, snapshot["label_map"], snapshot["temperature"]
@@ -33,7 +33,6 @@ class TemperatureScaling:
     
     def calibrate(self, val_loader: DataLoader, max_iter: int = 50, lr: float = 0.01) -> float:
         self.model.eval()
-        nll_criterion = nn.CrossEntropyLoss()
         
         all_logits = []
         all_labels = []
@@ -50,29 +49,41 @@ class TemperatureScaling:
         all_logits = torch.cat(all_logits)
         all_labels = torch.cat(all_labels)
         
+        optimal_temp, ece_before, ece_after = self.fit_logits(all_logits, all_labels, max_iter=max_iter, lr=lr)
+        print(f"Optimal temperature: {optimal_temp:.4f}")
+        print(f"ECE before calibration: {ece_before:.4f}")
+        print(f"ECE after calibration: {ece_after:.4f}")
+        
+        return optimal_temp
+    
+    def fit_logits(
+        self,
+        logits: torch.Tensor,
+        labels: torch.Tensor,
+        max_iter: int = 50,
+        lr: float = 0.01
+    ) -> Tuple[float, float, float]:
+        logits = logits.float().to(self.device)
+        labels = labels.long().to(self.device)
+        nll_criterion = nn.CrossEntropyLoss()
         optimizer = torch.optim.LBFGS([self.temperature], lr=lr, max_iter=max_iter)
         
         def eval_loss():
-            loss = nll_criterion(all_logits / self.temperature, all_labels)
+            optimizer.zero_grad()
+            loss = nll_criterion(logits / self.temperature, labels)
             loss.backward()
             return loss
         
         optimizer.step(eval_loss)
         
-        optimal_temp = self.temperature.item()
-        print(f"Optimal temperature: {optimal_temp:.4f}")
-        
-        calibrated_probs = torch.softmax(all_logits / self.temperature, dim=1).cpu().numpy()
-        ece_before = self._compute_ece(
-            torch.softmax(all_logits, dim=1).cpu().numpy(),
-            all_labels.cpu().numpy()
-        )
-        ece_after = self._compute_ece(calibrated_probs, all_labels.cpu().numpy())
-        
-        print(f"ECE before calibration: {ece_before:.4f}")
-        print(f"ECE after calibration: {ece_after:.4f}")
+        with torch.no_grad():
+            ece_before = self._compute_ece(torch.softmax(logits, dim=1).cpu().numpy(), labels.cpu().numpy())
+            ece_after = self._compute_ece(
+                torch.softmax(logits / self.temperature, dim=1).cpu().numpy(),
+                labels.cpu().numpy()
+            )
         
-        return optimal_temp
+        return self.temperature.item(), ece_before, ece_after
 
 def calibrate_model(model, val_loader, device='cpu') -> float:
     scaler = TemperatureScaling(model, device)
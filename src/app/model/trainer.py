@@ -1,3 +1,8 @@
+import inspect
+import json
+import os
+import time
+from datetime import datetime
 import torch
 from datasets import load_dataset
 from transformers import (
@@ -5,21 +10,90 @@ from transformers import (
     AutoModelForSequenceClassification,
     TrainingArguments,
     Trainer,
+    TrainerCallback,
     DataCollatorWithPadding
 )
 from peft import LoraConfig, get_peft_model, TaskType
 from sklearn.metrics import accuracy_score, f1_score, precision_recall_fscore_support
 import numpy as np
 from src.app.config import Config
-import os
+
+def cpu_supports_bf16() -> bool:
+    try:
+        return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except (AttributeError, RuntimeError):
+        return False
+
+def resolve_training_profile(profile: str = None) -> dict:
+    profile = profile or Config.TRAINING_PROFILE
+    if profile == "auto":
+        profile = "default" if torch.cuda.is_available() else "cpu"
+    if profile == "default":
+        return {"name": "default"}
+    if profile != "cpu":
+        raise ValueError(f"Unknown training profile {profile!r}, expected auto, cpu or default")
+    
+    settings = dict(Config.CPU_TRAINING_PROFILE)
+    if settings["bf16"] == "auto":
+        settings["bf16"] = cpu_supports_bf16()
+    if settings["dataloader_num_workers"] is None:
+        settings["dataloader_num_workers"] = min(4, max(0, (os.cpu_count() or 1) - 1))
+    return {"name": "cpu", **settings}
+
+def _training_arguments(**kwargs) -> TrainingArguments:
+    supported = inspect.signature(TrainingArguments).parameters
+    if kwargs.pop("group_by_length", False):
+        if "group_by_length" in supported:
+            kwargs["group_by_length"] = True
+        else:
+            kwargs["train_sampling_strategy"] = "group_by_length"
+    return TrainingArguments(**{k: v for k, v in kwargs.items() if k in supported})
+
+class ThroughputCallback(TrainerCallback):
+    def __init__(self, profile_name: str, log_file=None):
+        self.profile_name = profile_name
+        self.log_file = log_file or Config.TRAINING_THROUGHPUT_FILE
+        self.epoch_start = None
+        self.epoch_step = 0
+        self.history = []
+    
+    def on_epoch_begin(self, args, state, control, **kwargs):
+        self.epoch_start = time.perf_counter()
+        self.epoch_step = state.global_step
+    
+    def on_epoch_end(self, args, state, control, **kwargs):
+        seconds = time.perf_counter() - self.epoch_start
+        samples = (state.global_step - self.epoch_step) * args.train_batch_size * args.gradient_accumulation_steps
+        record = {
+            "timestamp": datetime.now().isoformat(),
+            "profile": self.profile_name,
+            "epoch": state.epoch,
+            "epoch_seconds": round(seconds, 2),
+            "samples": samples,
+            "samples_per_second": round(samples / seconds, 2) if seconds else None,
+            "bf16": args.bf16,
+            "dataloader_num_workers": args.dataloader_num_workers,
+            "gradient_accumulation_steps": args.gradient_accumulation_steps
+        }
+        self.history.append(record)
+        print(f"Epoch {state.epoch:.2f}: {seconds:.1f}s, {record['samples_per_second']} samples/s ({self.profile_name} profile)")
+        
+        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_file, "a") as f:
+            f.write(json.dumps(record) + "\n")
 
 class ModelTrainer:
+    trainer_class = Trainer
+    
     def __init__(self, model_name: str = None, dataset_name: str = None):
         self.model_name = model_name or Config.MODEL_NAME
         self.dataset_name = dataset_name or Config.DATASET_NAME
         self.tokenizer = None
         self.model = None
         self.dataset = None
+        self.training_overrides = {}
+        self.trainer_kwargs = {}
+        Config.ensure_dirs()
     
     def load_and_prepare_data(self, max_samples: int = None):
         print(f"Loading dataset: {self.dataset_name}")
@@ -87,11 +161,17 @@ class ModelTrainer:
             'recall': recall
         }
     
-    def train(self, output_dir: str = None):
+    def train(self, output_dir: str = None, profile: str = None):
         if output_dir is None:
             output_dir = Config.CHECKPOINTS_DIR / "model"
         
-        training_args = TrainingArguments(
+        training_profile = resolve_training_profile(profile)
+        cpu_profile = training_profile["name"] == "cpu"
+        if cpu_profile and training_profile.get("torch_threads"):
+            torch.set_num_threads(training_profile["torch_threads"])
+        print(f"Training profile: {training_profile}")
+        
+        settings = dict(
             output_dir=str(output_dir),
             num_train_epochs=Config.TRAINING_CONFIG["num_train_epochs"],
             per_device_train_batch_size=Config.TRAINING_CONFIG["per_device_train_batch_size"],
@@ -105,21 +185,34 @@ class ModelTrainer:
             save_strategy=Config.TRAINING_CONFIG["save_strategy"],
             load_best_model_at_end=Config.TRAINING_CONFIG["load_best_model_at_end"],
             metric_for_best_model=Config.TRAINING_CONFIG["metric_for_best_model"],
-            fp16=Config.TRAINING_CONFIG["fp16"],
+            fp16=Config.TRAINING_CONFIG["fp16"] and not cpu_profile,
+            bf16=training_profile.get("bf16", False),
+            use_cpu=cpu_profile,
+            dataloader_num_workers=training_profile.get("dataloader_num_workers", 0),
+            dataloader_persistent_workers=training_profile.get("dataloader_num_workers", 0) > 0,
+            dataloader_pin_memory=not cpu_profile,
+            group_by_length=training_profile.get("group_by_length", False),
+            gradient_accumulation_steps=training_profile.get("gradient_accumulation_steps", 1),
             report_to="none",
             save_total_limit=2,
         )
+        settings.update(self.training_overrides)
+        training_args = _training_arguments(**settings)
         
         data_collator = DataCollatorWithPadding(tokenizer=self.tokenizer)
         
-        trainer = Trainer(
+        tokenizer_arg = "processing_class" if "processing_class" in inspect.signature(Trainer).parameters else "tokenizer"
+        throughput = ThroughputCallback(training_profile["name"])
+        trainer = self.trainer_class(
             model=self.model,
             args=training_args,
             train_dataset=self.dataset["train"],
             eval_dataset=self.dataset["test"],
-            tokenizer=self.tokenizer,
             data_collator=data_collator,
             compute_metrics=self.compute_metrics,
+            callbacks=[throughput],
+            **self.trainer_kwargs,
+            **{tokenizer_arg: self.tokenizer}
         )
         
         print("Starting training...")
@@ -127,6 +220,7 @@ class ModelTrainer:
         
         print("Evaluating on test set...")
         eval_results = trainer.evaluate()
+        eval_results["throughput"] = throughput.history
         print(f"Evaluation results: {eval_results}")
         
         print(f"Saving model to {output_dir}")
@@ -135,8 +229,8 @@ class ModelTrainer:
         
         return trainer, eval_results
 
-def train_model(max_samples: int = None):
+def train_model(max_samples: int = None, profile: str = None):
     trainer = ModelTrainer()
     trainer.load_and_prepare_data(max_samples=max_samples)
     trainer.create_model_with_lora()
-    return trainer.train()
+    return trainer.train(profile=profile)
@@ -1,27 +1,162 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from typing import Dict, Any, Optional, Callable
-from transformers import pipeline
 from src.app.config import Config
+from src.app.model.manager import ModelManager, model_manager as default_model_manager
+from src.app.utils.vector_index import VectorIndex
+
+def apply_clarification(fallback_result: Dict[str, Any], user_response: Optional[str]) -> Dict[str, Any]:
+    pred_label = fallback_result["label"]
+    opposite_label = "negative" if pred_label == "positive" else "positive"
+    
+    fallback_result["user_response"] = user_response
+    fallback_result["clarification_pending"] = False
+    
+    if user_response and user_response.lower() in ['yes', 'y']:
+        fallback_result["final_label"] = opposite_label
+        fallback_result["final_decision_via"] = "user_clarification"
+    else:
+        fallback_result["final_label"] = pred_label
+        fallback_result["final_decision_via"] = "user_confirmed"
+    
+    return fallback_result
 
 class FallbackNode:
     def __init__(
         self,
         zero_shot_model: str = None,
         zero_shot_labels: list = None,
-        user_input_callback: Optional[Callable] = None
+        user_input_callback: Optional[Callable] = None,
+        defer_clarification: bool = False,
+        model_manager: Optional[ModelManager] = None,
+        neighbour_index: Optional[VectorIndex] = None
     ):
         self.zero_shot_model_name = zero_shot_model or Config.ZERO_SHOT_MODEL
         self.zero_shot_labels = zero_shot_labels or Config.ZERO_SHOT_LABELS
         self.user_input_callback = user_input_callback
+        self.defer_clarification = defer_clarification
+        self.neighbour_index = neighbour_index
+        
+        self.model_manager = model_manager or default_model_manager
+        self.zero_shot_key = f"zero_shot:{self.zero_shot_model_name}"
+        self.model_manager.register(self.zero_shot_key, self._load_zero_shot)
         
-        self.zero_shot_pipeline = None
+        self.zero_shot_cache = OrderedDict()
+        self.zero_shot_cache_size = Config.DEADLINE_CONFIG["zero_shot_cache_size"]
+        self.zero_shot_latency = None
+        self._in_flight: Dict[str, Future] = {}
+        self._cache_lock = threading.Lock()
+        self._background_executor = None
+        self.stats = {
+            "deadline_fallbacks": 0,
+            "zero_shot_cache_hits": 0,
+            "background_completions": 0,
+            "background_dropped": 0,
+            "degraded": 0,
+            "nearest_neighbour_resolutions": 0
+        }
+    
+    def _load_zero_shot(self):
+        from transformers import pipeline
+        return pipeline(
+            "zero-shot-classification",
+            model=self.zero_shot_model_name,
+            device=-1
+        )
+    
+    @property
+    def zero_shot_pipeline(self):
+        return self.model_manager.get(self.zero_shot_key)
+    
+    @zero_shot_pipeline.setter
+    def zero_shot_pipeline(self, pipeline):
+        self.model_manager.put(self.zero_shot_key, pipeline, loader=self._load_zero_shot)
     
     def _init_zero_shot(self):
-        if self.zero_shot_pipeline is None:
-            self.zero_shot_pipeline = pipeline(
-                "zero-shot-classification",
-                model=self.zero_shot_model_name,
-                device=-1
+        self.model_manager.get(self.zero_shot_key)
+    
+    def _classify_zero_shot(self, text: str) -> Dict[str, Any]:
+        with self.model_manager.use(self.zero_shot_key) as zero_shot_pipeline:
+            start = time.perf_counter()
+            result = zero_shot_pipeline(
+                text,
+                candidate_labels=self.zero_shot_labels,
+                multi_label=False
             )
+            self._record_latency(time.perf_counter() - start)
+        
+        with self._cache_lock:
+            self.zero_shot_cache[text] = result
+            self.zero_shot_cache.move_to_end(text)
+            while len(self.zero_shot_cache) > self.zero_shot_cache_size:
+                self.zero_shot_cache.popitem(last=False)
+        return result
+    
+    def _record_latency(self, seconds: float):
+        alpha = Config.DEADLINE_CONFIG["latency_ewma_alpha"]
+        if self.zero_shot_latency is None:
+            self.zero_shot_latency = seconds
+        else:
+            self.zero_shot_latency = alpha * seconds + (1 - alpha) * self.zero_shot_latency
+    
+    def _cached_zero_shot(self, text: str) -> Optional[Dict[str, Any]]:
+        with self._cache_lock:
+            result = self.zero_shot_cache.get(text)
+            if result is not None:
+                self.zero_shot_cache.move_to_end(text)
+                self.stats["zero_shot_cache_hits"] += 1
+            return result
+    
+    def _submit_zero_shot(self, text: str) -> Optional[Future]:
+        with self._cache_lock:
+            future = self._in_flight.get(text)
+            if future is not None:
+                return future
+            if len(self._in_flight) >= Config.DEADLINE_CONFIG["max_background_jobs"]:
+                self.stats["background_dropped"] += 1
+                return None
+            
+            if self._background_executor is None:
+                self._background_executor = ThreadPoolExecutor(
+                    max_workers=Config.DEADLINE_CONFIG["background_workers"],
+                    thread_name_prefix="zero-shot"
+                )
+            future = self._background_executor.submit(self._classify_zero_shot, text)
+            self._in_flight[text] = future
+        
+        future.add_done_callback(lambda f: self._finish_background(text, f))
+        return future
+    
+    def _finish_background(self, text: str, future: Future):
+        with self._cache_lock:
+            self._in_flight.pop(text, None)
+            if not future.cancelled() and future.exception() is None:
+                self.stats["background_completions"] += 1
+    
+    def _zero_shot_within(self, text: str, deadline: Optional[float]) -> Optional[Dict[str, Any]]:
+        cached = self._cached_zero_shot(text)
+        if cached is not None:
+            return cached
+        if deadline is None:
+            return self._classify_zero_shot(text)
+        
+        future = self._submit_zero_shot(text)
+        remaining = deadline - time.monotonic()
+        if future is None or remaining <= 0 or (self.zero_shot_latency is not None and self.zero_shot_latency > remaining):
+            return None
+        
+        try:
+            return future.result(timeout=remaining)
+        except FutureTimeoutError:
+            return None
+    
+    def _resolve_by_neighbours(self, confidence_output: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        embedding = confidence_output.get("embedding")
+        if self.neighbour_index is None or embedding is None:
+            return None
+        return self.neighbour_index.resolve(embedding)
     
     def run(
         self,
@@ -42,32 +177,44 @@ class FallbackNode:
             **confidence_output
         }
         
-        if action == "ask_clarify" and interactive and self.user_input_callback:
+        neighbours = self._resolve_by_neighbours(confidence_output) if action in ("ask_clarify", "escalate") else None
+        can_clarify = self.defer_clarification or self.user_input_callback
+        if neighbours is not None:
+            self.stats["nearest_neighbour_resolutions"] += 1
+            fallback_result["fallback_strategy"] = "nearest_neighbours"
+            fallback_result["nearest_neighbours"] = neighbours
+            fallback_result["final_label"] = neighbours["label"]
+            fallback_result["final_decision_via"] = "nearest_neighbours"
+        
+        elif action == "ask_clarify" and interactive and can_clarify:
             fallback_result["fallback_strategy"] = "clarification"
             
             opposite_label = "negative" if pred_label == "positive" else "positive"
             question = f"The model predicted '{pred_label}' with {confidence_output['confidence']:.1%} confidence. Was this a {opposite_label} review? (yes/no)"
             fallback_result["fallback_question"] = question
             
-            user_response = self.user_input_callback(question)
-            fallback_result["user_response"] = user_response
-            
-            if user_response and user_response.lower() in ['yes', 'y']:
-                fallback_result["final_label"] = opposite_label
-                fallback_result["final_decision_via"] = "user_clarification"
+            if self.defer_clarification:
+                fallback_result["clarification_pending"] = True
+                fallback_result["final_decision_via"] = "pending_clarification"
             else:
-                fallback_result["final_label"] = pred_label
-                fallback_result["final_decision_via"] = "user_confirmed"
+                apply_clarification(fallback_result, self.user_input_callback(question))
         
         elif action == "escalate" or (action == "ask_clarify" and not interactive):
-            self._init_zero_shot()
             fallback_result["fallback_strategy"] = "zero_shot_backup"
             
-            zero_shot_result = self.zero_shot_pipeline(
-                text,
-                candidate_labels=self.zero_shot_labels,
-                multi_label=False
-            )
+            if confidence_output.get("degraded"):
+                self.stats["degraded"] += 1
+                fallback_result["final_label"] = pred_label
+                fallback_result["final_decision_via"] = "degraded"
+                return fallback_result
+            
+            zero_shot_result = self._zero_shot_within(text, confidence_output.get("deadline"))
+            if zero_shot_result is None:
+                self.stats["deadline_fallbacks"] += 1
+                fallback_result["deadline_fallback"] = True
+                fallback_result["final_label"] = pred_label
+                fallback_result["final_decision_via"] = "deadline_fallback"
+                return fallback_result
             
             backup_label = zero_shot_result['labels'][0]
             backup_confidence = zero_shot_result['scores'][0]
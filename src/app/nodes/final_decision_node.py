@@ -1,15 +1,28 @@
 from typing import Dict, Any
 import uuid
 from src.app.logger import logger_instance
+from src.app.utils.metrics import metrics_instance
 
 class FinalDecisionNode:
-    def __init__(self):
+    def __init__(self, log_requests: bool = True):
         self.logger = logger_instance
+        self.metrics = metrics_instance
+        self.log_requests = log_requests
     
     def run(self, fallback_output: Dict[str, Any]) -> Dict[str, Any]:
         request_id = str(uuid.uuid4())
+        decision_via = fallback_output.get("final_decision_via", "direct_prediction")
+        result = {
+            "request_id": request_id,
+            "final_label": fallback_output.get("final_label", fallback_output["label"]),
+            "confidence": fallback_output["confidence"],
+            "decision_via": decision_via,
+            "log_entry": None
+        }
+        if not self.log_requests:
+            return result
         
-        log_entry = self.logger.log_inference(
+        result["log_entry"] = self.logger.log_inference(
             request_id=request_id,
             input_text=fallback_output["text"],
             pred_label=fallback_output["label"],
@@ -21,13 +34,8 @@ class FinalDecisionNode:
             fallback_question=fallback_output.get("fallback_question"),
             user_response=fallback_output.get("user_response"),
             final_label=fallback_output.get("final_label"),
-            final_decision_via=fallback_output.get("final_decision_via")
+            final_decision_via=fallback_output.get("final_decision_via"),
+            tasks=fallback_output.get("tasks")
         )
-        
-        return {
-            "request_id": request_id,
-            "final_label": fallback_output.get("final_label", fallback_output["label"]),
-            "confidence": fallback_output["confidence"],
-            "decision_via": fallback_output.get("final_decision_via", "direct_prediction"),
-            "log_entry": log_entry
-        }
+        self.metrics.observe(fallback_output["confidence"], fallback_output["status"], decision_via)
+        return result
@@ -1,49 +1,111 @@
 import torch
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
 import numpy as np
+from src.app.config import Config
+from src.app.model.manager import ModelManager
+from src.app.model.snapshot import is_snapshot, load_snapshot, label_map_from_config
+
+def build_prediction(text: str, probs: np.ndarray, label_map: Dict[int, str]) -> Dict[str, Any]:
+    label_idx = int(probs.argmax())
+    confidence = float(probs[label_idx])
+    pred_label = label_map.get(label_idx, f"label_{label_idx}")
+    
+    probs_dict = {label_map.get(i, f"label_{i}"): float(probs[i]) 
+                  for i in range(len(probs))}
+    
+    return {
+        "label": pred_label,
+        "label_idx": label_idx,
+        "probs": probs_dict,
+        "confidence": confidence,
+        "text": text
+    }
+
+def encode_batch(tokenizer, texts: List[str], max_length: int = 512, head_tail: bool = False):
+    if not head_tail:
+        return tokenizer(
+            texts,
+            return_tensors="pt",
+            truncation=True,
+            max_length=max_length,
+            padding=True
+        )
+    
+    special_ids = set(tokenizer.all_special_ids)
+    budget = max_length - tokenizer.num_special_tokens_to_add()
+    encoded = []
+    for ids in tokenizer(texts, truncation=False)["input_ids"]:
+        if len(ids) > max_length:
+            prefix = next((i for i, token in enumerate(ids) if token not in special_ids), 0)
+            head = prefix + int(budget * Config.PROGRESSIVE_CONFIG["head_fraction"])
+            ids = ids[:head] + ids[len(ids) - (max_length - head):]
+        encoded.append({"input_ids": ids, "attention_mask": [1] * len(ids)})
+    return tokenizer.pad(encoded, return_tensors="pt")
+
+def mean_pool(hidden_state: torch.Tensor, attention_mask: torch.Tensor) -> np.ndarray:
+    mask = attention_mask.unsqueeze(-1).to(hidden_state.dtype)
+    pooled = (hidden_state * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+    return torch.nn.functional.normalize(pooled.float(), dim=-1).cpu().numpy()
 
 class InferenceNode:
-    def __init__(self, model_path: str, device: str = "cpu"):
+    def __init__(
+        self,
+        model_path: str,
+        device: str = "cpu",
+        return_embeddings: bool = False,
+        model_manager: Optional[ModelManager] = None
+    ):
         self.device = device
-        self.tokenizer = AutoTokenizer.from_pretrained(model_path)
-        self.model = AutoModelForSequenceClassification.from_pretrained(model_path)
-        self.model.to(self.device)
-        self.model.eval()
-        
+        self.return_embeddings = return_embeddings
         self.label_map = {0: "negative", 1: "positive"}
         self.temperature = 1.0
+        
+        if is_snapshot(model_path):
+            self.tokenizer, self.model, self.label_map, self.temperature = load_snapshot(model_path)
+        else:
+            self.tokenizer = AutoTokenizer.from_pretrained(model_path)
+            self.model = AutoModelForSequenceClassification.from_pretrained(model_path)
+            self.label_map = label_map_from_config(self.model.config)
+            self.temperature = float(getattr(self.model.config, "calibrated_temperature", 1.0))
+        self.model.to(self.device)
+        self.model.eval()
+        if model_manager is not None:
+            model_manager.put(f"primary:{model_path}", self.model, pinned=True)
     
     def set_temperature(self, temperature: float):
         self.temperature = temperature
     
     def run(self, text: str) -> Dict[str, Any]:
-        inputs = self.tokenizer(
-            text,
-            return_tensors="pt",
-            truncation=True,
-            max_length=512,
-            padding=True
-        ).to(self.device)
+        return self.run_batch([text])[0]
+    
+    def run_batch(self, texts: List[str], max_length: int = 512, head_tail: bool = False) -> List[Dict[str, Any]]:
+        inputs = self.encode(texts, max_length=max_length, head_tail=head_tail)
+        probs, embeddings = self.forward(inputs)
+        return self.postprocess(texts, probs, embeddings)
+    
+    def encode(self, texts: List[str], max_length: int = 512, head_tail: bool = False):
+        return encode_batch(self.tokenizer, texts, max_length=max_length, head_tail=head_tail)
+    
+    def forward(self, inputs) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        inputs = {k: v.to(self.device) for k, v in inputs.items()}
         
         with torch.no_grad():
-            outputs = self.model(**inputs)
+            outputs = self.model(**inputs, output_hidden_states=self.return_embeddings)
             logits = outputs.logits
             
-            scaled_logits = logits / self.temperature
-            probs = torch.softmax(scaled_logits, dim=-1).cpu().numpy()[0]
-        
-        label_idx = int(probs.argmax())
-        confidence = float(probs[label_idx])
-        pred_label = self.label_map.get(label_idx, f"label_{label_idx}")
+            scaled_logits = logits.float() / self.temperature
+            probs = torch.softmax(scaled_logits, dim=-1).cpu().numpy()
+            embeddings = mean_pool(outputs.hidden_states[-1], inputs["attention_mask"]) if self.return_embeddings else None
         
-        probs_dict = {self.label_map.get(i, f"label_{i}"): float(probs[i]) 
-                      for i in range(len(probs))}
-        
-        return {
-            "label": pred_label,
-            "label_idx": label_idx,
-            "probs": probs_dict,
-            "confidence": confidence,
-            "text": text
-        }
+        return probs, embeddings
+    
+    def postprocess(self, texts: List[str], probs: np.ndarray, embeddings: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        results = [self._build_result(text, row) for text, row in zip(texts, probs)]
+        if embeddings is not None:
+            for result, embedding in zip(results, embeddings):
+                result["embedding"] = embedding.tolist()
+        return results
+    
+    def _build_result(self, text: str, probs: np.ndarray) -> Dict[str, Any]:
+        return build_prediction(text, probs, self.label_map)
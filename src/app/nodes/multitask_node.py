@@ -0,0 +1,75 @@
+import torch
+from typing import Dict, Any, List, Optional
+from src.app.config import Config
+from src.app.model.manager import ModelManager
+from src.app.model.multitask import load_multitask
+from src.app.nodes.inference_node import build_prediction, encode_batch
+
+class MultiTaskInferenceNode:
+    def __init__(
+        self,
+        tasks: Dict[str, str],
+        primary_task: str = None,
+        device: str = "cpu",
+        model_manager: Optional[ModelManager] = None
+    ):
+        self.device = device
+        self.primary_task = primary_task or next(iter(tasks))
+        if self.primary_task not in tasks:
+            raise ValueError(f"Primary task {self.primary_task!r} has no checkpoint")
+
+        self.tokenizer, self.model, self.label_maps = load_multitask(tasks)
+        self.temperatures = {task: self.model.temperatures.get(task, 1.0) for task in tasks}
+        self.model.to(self.device)
+        self.model.eval()
+        self.model_manager = model_manager
+        if model_manager is not None:
+            model_manager.put(f"multitask:{','.join(tasks)}", self.model, pinned=True)
+
+    @property
+    def label_map(self) -> Dict[int, str]:
+        return self.label_maps[self.primary_task]
+
+    @property
+    def temperature(self) -> float:
+        return self.temperatures[self.primary_task]
+
+    def set_temperature(self, temperature: float, task: str = None):
+        self.temperatures[task or self.primary_task] = temperature
+
+    def run(self, text: str) -> Dict[str, Any]:
+        return self.run_batch([text])[0]
+
+    def run_batch(self, texts: List[str], max_length: int = 512, head_tail: bool = False) -> List[Dict[str, Any]]:
+        inputs = encode_batch(self.tokenizer, texts, max_length=max_length, head_tail=head_tail)
+        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+
+        with torch.no_grad():
+            logits = self.model(**inputs)
+            probs = {
+                task: torch.softmax(task_logits.float() / self.temperatures[task], dim=-1).cpu().numpy()
+                for task, task_logits in logits.items()
+            }
+
+        results = []
+        for i, text in enumerate(texts):
+            tasks = {
+                task: build_prediction(text, task_probs[i], self.label_maps[task])
+                for task, task_probs in probs.items()
+            }
+            results.append({**tasks[self.primary_task], "tasks": tasks})
+        return results
+
+def parse_task_spec(spec: str) -> Dict[str, str]:
+    tasks = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        name, sep, path = item.partition("=")
+        if not sep or not name.strip() or not path.strip():
+            raise ValueError(f"Invalid task spec {item!r}, expected name=path")
+        tasks[name.strip()] = path.strip()
+    return tasks
+
+def configured_tasks() -> Dict[str, str]:
+    return parse_task_spec(Config.MULTITASK_CONFIG["extra_tasks"] or "")
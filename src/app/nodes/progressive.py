@@ -0,0 +1,81 @@
+import random
+import threading
+from typing import Any, Callable, Dict, List, Optional
+from src.app.config import Config
+
+class ProgressiveInference:
+    def __init__(
+        self,
+        inference_node,
+        short_length: int = None,
+        full_length: int = None,
+        audit_rate: float = None,
+        seed: Optional[int] = None
+    ):
+        config = Config.PROGRESSIVE_CONFIG
+        self.inference_node = inference_node
+        self.short_length = short_length or config["short_length"]
+        self.full_length = full_length or config["full_length"]
+        self.audit_rate = config["audit_rate"] if audit_rate is None else audit_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counters = {
+            "requests": 0,
+            "truncated": 0,
+            "long_passes": 0,
+            "audits": 0,
+            "audit_agreements": 0
+        }
+
+    def _token_lengths(self, texts: List[str]) -> List[int]:
+        tokenizer = self.inference_node.tokenizer
+        special = tokenizer.num_special_tokens_to_add()
+        return [len(ids) + special for ids in tokenizer(texts, add_special_tokens=False)["input_ids"]]
+
+    def run_batch(self, texts: List[str], accept: Callable[[Dict[str, Any]], bool]) -> List[Dict[str, Any]]:
+        truncated = [length > self.short_length for length in self._token_lengths(texts)]
+        results = self.inference_node.run_batch(texts, max_length=self.short_length, head_tail=True)
+
+        rerun = []
+        audit = []
+        for idx, result in enumerate(results):
+            result["inference_pass"] = "short"
+            if not truncated[idx]:
+                continue
+            if not accept(result):
+                rerun.append(idx)
+            elif self._random.random() < self.audit_rate:
+                audit.append(idx)
+
+        if rerun or audit:
+            indices = rerun + audit
+            full = self.inference_node.run_batch([texts[idx] for idx in indices], max_length=self.full_length)
+            for idx, full_result in zip(indices, full):
+                if idx in audit:
+                    with self._lock:
+                        self.counters["audits"] += 1
+                        self.counters["audit_agreements"] += int(full_result["label"] == results[idx]["label"])
+                else:
+                    results[idx] = {**full_result, "inference_pass": "full"}
+
+        with self._lock:
+            self.counters["requests"] += len(texts)
+            self.counters["truncated"] += sum(truncated)
+            self.counters["long_passes"] += len(rerun)
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self.counters)
+        requests, audits = counters["requests"], counters["audits"]
+        agreement = counters["audit_agreements"] / audits if audits else None
+        accepted_short = counters["truncated"] - counters["long_passes"]
+        return {
+            **counters,
+            "short_length": self.short_length,
+            "long_pass_rate": counters["long_passes"] / requests if requests else 0.0,
+            "audit_agreement_rate": agreement,
+            "estimated_label_change_rate": (
+                (1 - agreement) * accepted_short / requests if agreement is not None and requests else None
+            )
+        }
@@ -0,0 +1,166 @@
+import gc
+import os
+import signal
+import socket
+import time
+import traceback
+from collections import deque
+from typing import Callable, Dict, Optional
+from src.app.config import Config
+
+
+def partition_threads(workers: int, total_cores: Optional[int] = None) -> int:
+    total_cores = total_cores or os.cpu_count() or 1
+    return max(1, total_cores // max(1, workers))
+
+
+def configure_worker_threads(num_threads: int):
+    os.environ["OMP_NUM_THREADS"] = str(num_threads)
+    os.environ["MKL_NUM_THREADS"] = str(num_threads)
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass
+
+
+class PreforkServer:
+    def __init__(
+        self,
+        app,
+        preload: Optional[Callable] = None,
+        workers: int = None,
+        threads_per_worker: int = None,
+        host: str = None,
+        port: int = None,
+        serve: Optional[Callable] = None
+    ):
+        self.app = app
+        self.preload = preload
+        self.workers = workers or Config.SERVING_CONFIG["workers"]
+        self.threads_per_worker = (
+            threads_per_worker
+            or Config.SERVING_CONFIG["threads_per_worker"]
+            or self._profile_threads()
+            or partition_threads(self.workers)
+        )
+        self.host = host or Config.SERVING_CONFIG["host"]
+        self.port = Config.SERVING_CONFIG["port"] if port is None else port
+        self.serve = serve or self._serve_wsgi
+        self.restart_backoff = Config.SERVING_CONFIG["restart_backoff_seconds"]
+        self.max_restarts_per_minute = Config.SERVING_CONFIG["max_restarts_per_minute"]
+
+        self.socket = None
+        self.children: Dict[int, int] = {}
+        self.restarts = deque()
+        self._stopping = False
+
+    def _profile_threads(self) -> Optional[int]:
+        from src.app.utils.tuning import load_profile
+        profile = load_profile()
+        if not profile or profile.get("workers") != self.workers:
+            return None
+        return profile["threads"]
+
+    def _bind(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(Config.SERVING_CONFIG["backlog"])
+        sock.set_inheritable(True)
+        self.port = sock.getsockname()[1]
+        return sock
+
+    def _serve_wsgi(self, worker_id: int):
+        from werkzeug.serving import make_server
+        server = make_server(
+            self.host,
+            self.port,
+            self.app,
+            threaded=True,
+            fd=self.socket.fileno()
+        )
+        server.serve_forever()
+
+    def _spawn(self, worker_id: int):
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.SIG_IGN)
+                configure_worker_threads(self.threads_per_worker)
+                self.serve(worker_id)
+            except BaseException:
+                traceback.print_exc()
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+
+        self.children[pid] = worker_id
+        print(f"Worker {worker_id} started (pid {pid}, {self.threads_per_worker} threads)")
+
+    def _handle_stop(self, signum, frame):
+        self._stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def _restart_allowed(self) -> bool:
+        now = time.monotonic()
+        while self.restarts and now - self.restarts[0] > 60:
+            self.restarts.popleft()
+        if len(self.restarts) >= self.max_restarts_per_minute:
+            return False
+        self.restarts.append(now)
+        return True
+
+    def run(self):
+        if self.preload:
+            self.preload()
+
+        gc.collect()
+        if hasattr(gc, "freeze"):
+            gc.freeze()
+
+        self.socket = self._bind()
+        print(f"Pre-fork server listening on http://{self.host}:{self.port} with {self.workers} workers")
+
+        previous_handlers = {
+            sig: signal.signal(sig, self._handle_stop) for sig in (signal.SIGTERM, signal.SIGINT)
+        }
+
+        try:
+            for worker_id in range(self.workers):
+                self._spawn(worker_id)
+
+            while self.children:
+                try:
+                    pid, status = os.waitpid(-1, 0)
+                except ChildProcessError:
+                    break
+
+                worker_id = self.children.pop(pid, None)
+                if worker_id is None or self._stopping:
+                    continue
+
+                print(f"Worker {worker_id} (pid {pid}) exited with status {os.waitstatus_to_exitcode(status)}")
+                if not self._restart_allowed():
+                    print("Workers are crashing too often, shutting down")
+                    self._handle_stop(None, None)
+                    continue
+
+                time.sleep(self.restart_backoff)
+                if not self._stopping:
+                    self._spawn(worker_id)
+        finally:
+            for sig, handler in previous_handlers.items():
+                signal.signal(sig, handler)
+            self.socket.close()
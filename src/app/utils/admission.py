@@ -0,0 +1,105 @@
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+from src.app.config import Config
+
+
+class InFlightLimiter:
+    def __init__(self, max_in_flight: int):
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self, count: int = 1) -> bool:
+        with self._lock:
+            if self.in_flight + count > self.max_in_flight:
+                return False
+            self.in_flight += count
+            return True
+
+    def release(self, count: int = 1):
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - count)
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, status: int, reason: str):
+        super().__init__(reason)
+        self.status = status
+        self.reason = reason
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        max_in_flight: int = None,
+        max_queue: int = None,
+        queue_timeout_ms: float = None,
+        degrade: bool = None,
+        degrade_queue_depth: int = None
+    ):
+        config = Config.ADMISSION_CONFIG
+        self.max_in_flight = max_in_flight or config["max_in_flight"]
+        self.max_queue = config["max_queue"] if max_queue is None else max_queue
+        self.queue_timeout = (queue_timeout_ms or config["queue_timeout_ms"]) / 1000
+        self.degrade = config["degrade"] if degrade is None else degrade
+        self.degrade_queue_depth = degrade_queue_depth or config["degrade_queue_depth"]
+        self.in_flight = 0
+        self.queued = 0
+        self.stats = {"admitted": 0, "degraded": 0, "shed_queue_full": 0, "shed_timeout": 0}
+        self._condition = threading.Condition()
+
+    def acquire(self) -> bool:
+        with self._condition:
+            if self.in_flight < self.max_in_flight and self.queued == 0:
+                return self._admit(degraded=False)
+            if self.queued >= self.max_queue:
+                self.stats["shed_queue_full"] += 1
+                raise AdmissionRejected(429, "Too many requests queued, retry later")
+
+            degraded = self.degrade and self.queued + 1 >= self.degrade_queue_depth
+            self.queued += 1
+            try:
+                admitted = self._condition.wait_for(
+                    lambda: self.in_flight < self.max_in_flight,
+                    timeout=self.queue_timeout
+                )
+            finally:
+                self.queued -= 1
+            if not admitted:
+                self.stats["shed_timeout"] += 1
+                raise AdmissionRejected(503, "Server overloaded, request timed out in queue")
+            return self._admit(degraded)
+
+    def _admit(self, degraded: bool) -> bool:
+        self.in_flight += 1
+        self.stats["admitted"] += 1
+        return degraded
+
+    def record_degraded(self):
+        with self._condition:
+            self.stats["degraded"] += 1
+
+    def release(self):
+        with self._condition:
+            self.in_flight = max(0, self.in_flight - 1)
+            self._condition.notify()
+
+    @contextmanager
+    def admit(self) -> Iterator[bool]:
+        degraded = self.acquire()
+        try:
+            yield degraded
+        finally:
+            self.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                **self.stats,
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                "max_in_flight": self.max_in_flight,
+                "max_queue": self.max_queue,
+                "degrade_enabled": self.degrade
+            }
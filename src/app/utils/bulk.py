@@ -0,0 +1,134 @@
+import csv
+import json
+import os
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from src.app.config import Config
+
+
+def iter_records(path: Path, text_field: str = "text") -> Iterator[Dict[str, Any]]:
+    path = Path(path)
+    with open(path, "r", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            for row in csv.DictReader(f):
+                yield row
+        else:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                yield record if isinstance(record, dict) else {text_field: record}
+
+
+class BulkClassifier:
+    def __init__(
+        self,
+        dag,
+        input_path: str,
+        output_path: str,
+        text_field: str = "text",
+        id_field: Optional[str] = None,
+        batch_size: int = None,
+        fallback_workers: int = None,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_every: int = None
+    ):
+        self.dag = dag
+        self.input_path = Path(input_path)
+        self.output_path = Path(output_path)
+        self.text_field = text_field
+        self.id_field = id_field
+        self.batch_size = batch_size or dag.batch_size
+        self.fallback_workers = fallback_workers or Config.BULK_CONFIG["fallback_workers"]
+        self.checkpoint_path = Path(checkpoint_path or f"{self.output_path}.checkpoint")
+        self.checkpoint_every = checkpoint_every or Config.BULK_CONFIG["checkpoint_every"]
+
+    def load_checkpoint(self) -> Dict[str, Any]:
+        if not self.checkpoint_path.exists():
+            return {"processed": 0, "output_offset": 0}
+
+        with open(self.checkpoint_path, "r") as f:
+            checkpoint = json.load(f)
+
+        if checkpoint.get("input") != str(self.input_path.resolve()):
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_path} belongs to {checkpoint.get('input')}, "
+                f"not {self.input_path}"
+            )
+        return checkpoint
+
+    def _save_checkpoint(self, processed: int, output_offset: int):
+        tmp_path = self.checkpoint_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "input": str(self.input_path.resolve()),
+                "processed": processed,
+                "output_offset": output_offset
+            }, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _format_result(self, index: int, record: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        output = {"index": index}
+        if self.id_field:
+            output["id"] = record.get(self.id_field)
+        output.update({
+            "final_label": result["final_label"],
+            "confidence": result["confidence"],
+            "status": result["status"],
+            "probs": result["probs"],
+            "decision_via": result["decision_via"],
+            "fallback_strategy": result.get("fallback_strategy"),
+            "request_id": result["request_id"]
+        })
+        return output
+
+    def _classify_chunk(self, start: int, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        texts = [str(record.get(self.text_field) or "") for record in records]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(records)
+
+        for pos, result in self.dag.run_batch(texts, fallback_workers=self.fallback_workers, batch_size=self.batch_size):
+            results[pos] = self._format_result(start + pos, records[pos], result)
+
+        return results
+
+    def run(self, progress_callback: Optional[Callable[[int], None]] = None) -> Dict[str, Any]:
+        checkpoint = self.load_checkpoint()
+        if not self.output_path.exists():
+            checkpoint = {"processed": 0, "output_offset": 0}
+        processed = checkpoint["processed"]
+        resumed_from = processed
+
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        mode = "r+b" if processed else "wb"
+        records = iter_records(self.input_path, self.text_field)
+        if processed:
+            next(islice(records, processed, processed), None)
+
+        with open(self.output_path, mode) as out:
+            out.seek(checkpoint["output_offset"])
+            out.truncate()
+
+            if progress_callback and processed:
+                progress_callback(processed)
+
+            while True:
+                chunk = list(islice(records, self.checkpoint_every))
+                if not chunk:
+                    break
+
+                for line in self._classify_chunk(processed, chunk):
+                    out.write((json.dumps(line) + "\n").encode("utf-8"))
+                out.flush()
+                os.fsync(out.fileno())
+
+                processed += len(chunk)
+                self._save_checkpoint(processed, out.tell())
+                if progress_callback:
+                    progress_callback(len(chunk))
+
+        self.checkpoint_path.unlink(missing_ok=True)
+        return {"processed": processed, "resumed_from": resumed_from, "output": str(self.output_path)}
@@ -0,0 +1,121 @@
+import json
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from src.app.config import Config
+
+
+class ClarificationStore:
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or Config.CLARIFICATION_CONFIG["store_path"])
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS clarifications (
+                    ticket_id TEXT PRIMARY KEY,
+                    created_at TEXT NOT NULL,
+                    question TEXT,
+                    state TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    answer TEXT,
+                    request_id TEXT,
+                    resolved_at TEXT
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_status ON clarifications (status, created_at)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def create(self, state: Dict[str, Any]) -> str:
+        ticket_id = str(uuid.uuid4())
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO clarifications (ticket_id, created_at, question, state, status) "
+                "VALUES (?, ?, ?, ?, 'pending')",
+                (ticket_id, datetime.now().isoformat(), state.get("fallback_question"), json.dumps(state))
+            )
+        return ticket_id
+
+    def get(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM clarifications WHERE ticket_id = ?", (ticket_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def list_pending(self, limit: int = 50) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM clarifications WHERE status = 'pending' ORDER BY created_at LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def claim(self, ticket_id: str) -> Dict[str, Any]:
+        with self._connect() as conn:
+            claimed = conn.execute(
+                "UPDATE clarifications SET status = 'resolving' WHERE ticket_id = ? AND status = 'pending'",
+                (ticket_id,)
+            ).rowcount
+        ticket = self.get(ticket_id)
+        if ticket is None:
+            raise KeyError(f"Unknown clarification ticket: {ticket_id}")
+        if not claimed:
+            raise ValueError(f"Clarification ticket {ticket_id} is already {ticket['status']}")
+        return ticket
+
+    def release(self, ticket_id: str):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE clarifications SET status = 'pending' WHERE ticket_id = ? AND status = 'resolving'",
+                (ticket_id,)
+            )
+
+    def resolve(self, ticket_id: str, answer: str, request_id: str):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE clarifications SET status = 'resolved', answer = ?, request_id = ?, resolved_at = ? "
+                "WHERE ticket_id = ?",
+                (answer, request_id, datetime.now().isoformat(), ticket_id)
+            )
+
+    def _to_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
+        ticket = dict(row)
+        ticket["state"] = json.loads(ticket["state"])
+        return ticket
+
+
+def resume_clarification(
+    ticket_id: str,
+    answer: str,
+    store: Optional[ClarificationStore] = None,
+    final_decision_node=None
+) -> Dict[str, Any]:
+    from src.app.nodes.fallback_node import apply_clarification
+    from src.app.nodes.final_decision_node import FinalDecisionNode
+
+    store = store or ClarificationStore()
+    final_decision_node = final_decision_node or FinalDecisionNode()
+
+    ticket = store.claim(ticket_id)
+    try:
+        state = apply_clarification(dict(ticket["state"]), answer)
+        result = {**state, **final_decision_node.run(state)}
+    except Exception:
+        store.release(ticket_id)
+        raise
+
+    store.resolve(ticket_id, answer, result["request_id"])
+    return {**result, "ticket_id": ticket_id}
@@ -0,0 +1,185 @@
+import json
+import random
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle, islice
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import numpy as np
+from src.app.utils.bulk import iter_records
+from src.app.utils.log_store import iter_log_entries
+
+LOAD_MODES = ("closed", "fixed", "poisson")
+
+
+def load_replay_records(
+    path: Optional[str] = None,
+    text_field: str = "text",
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    if path:
+        source = iter_records(Path(path), text_field)
+    else:
+        source = iter_log_entries()
+    records = []
+    for record in islice(source, limit):
+        text = record.get(text_field) or record.get("input_text")
+        if not text:
+            continue
+        expected = (record.get("final_decision") or {}).get("label") or record.get("final_label")
+        records.append({"text": text, "expected": expected})
+    return records
+
+
+class InProcessTarget:
+    def __init__(self, dag):
+        self.dag = dag
+
+    def __call__(self, text: str) -> Dict[str, Any]:
+        result = self.dag.run(text)
+        return {"label": result.get("final_label"), "decision_via": result.get("decision_via")}
+
+
+class HttpTarget:
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        self.url = base_url.rstrip("/") + "/classify"
+        self.timeout = timeout
+
+    def __call__(self, text: str) -> Dict[str, Any]:
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({"text": text}).encode("utf-8"),
+            headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            body = json.loads(response.read())
+        return {"label": body.get("predicted_label"), "decision_via": body.get("decision_via")}
+
+
+class LoadGenerator:
+    def __init__(
+        self,
+        target,
+        records: List[Dict[str, Any]],
+        mode: str = "closed",
+        concurrency: int = 4,
+        rate: Optional[float] = None,
+        num_requests: Optional[int] = None,
+        seed: Optional[int] = None,
+        max_diff_samples: int = 20
+    ):
+        if mode not in LOAD_MODES:
+            raise ValueError(f"Unknown load mode {mode!r}, expected one of {LOAD_MODES}")
+        if mode != "closed" and not rate:
+            raise ValueError(f"{mode!r} mode needs a target arrival rate")
+        if not records:
+            raise ValueError("No records to replay")
+
+        self.target = target
+        self.records = records
+        self.mode = mode
+        self.concurrency = concurrency
+        self.rate = rate
+        self.num_requests = num_requests or len(records)
+        self.max_diff_samples = max_diff_samples
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._results: List[Dict[str, Any]] = []
+
+    def _send(self, record: Dict[str, Any], scheduled: float):
+        error = None
+        response = {}
+        try:
+            response = self.target(record["text"])
+        except Exception as e:
+            error = str(e)
+        latency = time.perf_counter() - scheduled
+
+        with self._lock:
+            self._results.append({
+                "latency": latency,
+                "error": error,
+                "text": record["text"],
+                "expected": record.get("expected"),
+                "label": response.get("label")
+            })
+
+    def _arrival_offsets(self) -> List[float]:
+        if self.mode == "fixed":
+            return [i / self.rate for i in range(self.num_requests)]
+        gaps = [self._random.expovariate(self.rate) for _ in range(self.num_requests)]
+        return list(np.cumsum([0.0] + gaps[:-1]))
+
+    def _run_closed(self):
+        work = iter(islice(cycle(self.records), self.num_requests))
+        work_lock = threading.Lock()
+
+        def worker():
+            while True:
+                with work_lock:
+                    record = next(work, None)
+                if record is None:
+                    return
+                self._send(record, time.perf_counter())
+
+        threads = [threading.Thread(target=worker) for _ in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _run_open(self):
+        records = islice(cycle(self.records), self.num_requests)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            start = time.perf_counter()
+            for offset, record in zip(self._arrival_offsets(), records):
+                scheduled = start + offset
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(self._send, record, scheduled)
+
+    def run(self) -> Dict[str, Any]:
+        self._results = []
+        start = time.perf_counter()
+        if self.mode == "closed":
+            self._run_closed()
+        else:
+            self._run_open()
+        return self.report(time.perf_counter() - start)
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        results = self._results
+        errors = [r for r in results if r["error"]]
+        succeeded = [r for r in results if not r["error"]]
+        latencies = np.array([r["latency"] for r in succeeded]) * 1000
+        compared = [r for r in succeeded if r["expected"] is not None]
+        diffs = [r for r in compared if r["label"] != r["expected"]]
+
+        return {
+            "mode": self.mode,
+            "target_rate": self.rate,
+            "concurrency": self.concurrency,
+            "requests": len(results),
+            "errors": len(errors),
+            "error_rate": len(errors) / len(results) if results else 0.0,
+            "elapsed_s": elapsed,
+            "throughput": len(succeeded) / elapsed if elapsed > 0 else 0.0,
+            "latency_ms": {
+                f"p{p}": float(np.percentile(latencies, p)) if latencies.size else None
+                for p in (50, 90, 95, 99)
+            },
+            "max_latency_ms": float(latencies.max()) if latencies.size else None,
+            "decision_diffs": {
+                "compared": len(compared),
+                "changed": len(diffs),
+                "diff_rate": len(diffs) / len(compared) if compared else None,
+                "samples": [
+                    {"text": r["text"][:200], "logged": r["expected"], "replayed": r["label"]}
+                    for r in diffs[:self.max_diff_samples]
+                ]
+            },
+            "error_samples": [r["error"] for r in errors[:self.max_diff_samples]]
+        }
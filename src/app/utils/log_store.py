@@ -0,0 +1,377 @@
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+from src.app.config import Config
+
+FORMAT_VERSION = 1
+SEGMENT_GLOB = "segment-*.jsonl.gz"
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+class TextStore:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS texts (hash TEXT PRIMARY KEY, body BLOB NOT NULL, touched REAL NOT NULL DEFAULT 0)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(texts)")}
+            if "touched" not in columns:
+                conn.execute("ALTER TABLE texts ADD COLUMN touched REAL NOT NULL DEFAULT 0")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def put(self, digest: str, text: str, touched: float = None):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO texts (hash, body, touched) VALUES (?, ?, ?) "
+                "ON CONFLICT(hash) DO UPDATE SET touched = excluded.touched",
+                (digest, zlib.compress(text.encode("utf-8")), time.time() if touched is None else touched)
+            )
+
+    def get_many(self, digests: List[str]) -> Dict[str, str]:
+        found = {}
+        unique = list(set(digests))
+        with self._connect() as conn:
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT hash, body FROM texts WHERE hash IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                found.update({digest: zlib.decompress(body).decode("utf-8") for digest, body in rows})
+        return found
+
+    def prune(self, keep: Set[str], touched_before: float = None) -> int:
+        touched_before = time.time() if touched_before is None else touched_before
+        with self._connect() as conn:
+            stored = [row[0] for row in conn.execute("SELECT hash FROM texts WHERE touched < ?", (touched_before,))]
+            stale = [digest for digest in stored if digest not in keep]
+            conn.executemany("DELETE FROM texts WHERE hash = ?", [(digest,) for digest in stale])
+        return len(stale)
+
+
+def encode_entry(entry: Dict[str, Any], header: Dict[str, Any], digest: str) -> Dict[str, Any]:
+    inference = entry["inference"]
+    probs = inference["probs"]
+    record = {
+        "ts": entry["timestamp"],
+        "id": entry["request_id"],
+        "h": digest,
+        "l": inference["pred_label"],
+        "c": inference["confidence"],
+        "s": entry["confidence_check"]["status"],
+        "p": [probs[label] for label in header["labels"]] if list(probs) == header["labels"] else probs
+    }
+
+    fallback = entry["fallback"]
+    if fallback.get("activated"):
+        record["f"] = [fallback.get("strategy"), fallback.get("question"), fallback.get("user_response")]
+
+    final = entry["final_decision"]
+    if final["label"] != inference["pred_label"]:
+        record["fl"] = final["label"]
+    if final["via"] != "direct_prediction":
+        record["v"] = final["via"]
+
+    for key in entry:
+        if key not in ("timestamp", "request_id", "input_text", "inference", "confidence_check", "fallback", "final_decision"):
+            record.setdefault("x", {})[key] = entry[key]
+    return record
+
+
+def decode_entry(record: Dict[str, Any], header: Dict[str, Any], text: Optional[str]) -> Dict[str, Any]:
+    probs = record["p"]
+    if isinstance(probs, list):
+        probs = dict(zip(header["labels"], probs))
+
+    strategy = record.get("f")
+    entry = {
+        "timestamp": record["ts"],
+        "request_id": record["id"],
+        "input_text": text,
+        "inference": {
+            "pred_label": record["l"],
+            "probs": probs,
+            "confidence": record["c"]
+        },
+        "confidence_check": {
+            "threshold_accept": header["thresholds"]["accept"],
+            "threshold_clarify": header["thresholds"]["clarify"],
+            "status": record["s"]
+        },
+        "fallback": {
+            "activated": True,
+            "strategy": strategy[0],
+            "question": strategy[1],
+            "user_response": strategy[2]
+        } if strategy else {"activated": False},
+        "final_decision": {
+            "label": record.get("fl", record["l"]),
+            "via": record.get("v", "direct_prediction")
+        }
+    }
+    entry.update(record.get("x", {}))
+    return entry
+
+
+class CompactLogWriter:
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        max_segment_entries: int = None,
+        max_segment_bytes: int = None,
+        max_segments: Optional[int] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        config = Config.COMPACT_LOG_CONFIG
+        self.directory = Path(directory or config["directory"])
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_segment_entries = max_segment_entries or config["max_segment_entries"]
+        self.max_segment_bytes = max_segment_bytes or config["max_segment_bytes"]
+        self.max_segments = max_segments if max_segments is not None else config["max_segments"]
+        self.flush_entries = config["flush_entries"]
+        self.flush_seconds = config["flush_seconds"]
+        self.known_text_ttl = config["known_text_ttl_seconds"]
+        self.clock = clock
+        self.texts = TextStore(self.directory / "texts.db")
+
+        self._lock = threading.Lock()
+        self._segment = None
+        self._segment_path = None
+        self._unflushed = 0
+        self._last_flush = clock()
+        atexit.register(self.close)
+        self._header = None
+        self._entries = 0
+        self._bytes = 0
+        self._sequence = 0
+        self._known_texts = OrderedDict()
+        self._prune_lock = threading.Lock()
+        self._prune_pending = False
+        self._pruner = None
+
+    def _open_segment(self, entry: Dict[str, Any]):
+        self._close_segment()
+        self._sequence += 1
+        name = f"segment-{datetime.now():%Y%m%d%H%M%S}-{os.getpid()}-{self._sequence:04d}.jsonl.gz"
+        self._segment_path = self.directory / name
+        self._segment = gzip.open(self._segment_path, "at", encoding="utf-8")
+        self._header = {
+            "format_version": FORMAT_VERSION,
+            "thresholds": {
+                "accept": entry["confidence_check"]["threshold_accept"],
+                "clarify": entry["confidence_check"]["threshold_clarify"]
+            },
+            "labels": list(entry["inference"]["probs"])
+        }
+        self._segment.write(json.dumps({"header": self._header}) + "\n")
+        self._entries = 0
+        self._bytes = 0
+        if self._apply_retention():
+            self._prune_in_background()
+
+    def _close_segment(self):
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+    def _needs_rotation(self, entry: Dict[str, Any]) -> bool:
+        if self._segment is None:
+            return True
+        if self._entries >= self.max_segment_entries or self._bytes >= self.max_segment_bytes:
+            return True
+        check = entry["confidence_check"]
+        return (
+            check["threshold_accept"] != self._header["thresholds"]["accept"]
+            or check["threshold_clarify"] != self._header["thresholds"]["clarify"]
+        )
+
+    def _remember_text(self, text: str) -> str:
+        digest = text_hash(text)
+        now = self.clock()
+        stored_at = self._known_texts.get(digest)
+        if stored_at is not None and now - stored_at < self.known_text_ttl:
+            self._known_texts.move_to_end(digest)
+            return digest
+        self.texts.put(digest, text, touched=now)
+        self._known_texts[digest] = now
+        self._known_texts.move_to_end(digest)
+        while len(self._known_texts) > Config.COMPACT_LOG_CONFIG["known_text_cache"]:
+            self._known_texts.popitem(last=False)
+        return digest
+
+    def write(self, entry: Dict[str, Any]):
+        with self._lock:
+            digest = self._remember_text(entry["input_text"])
+            if self._needs_rotation(entry):
+                self._open_segment(entry)
+            line = json.dumps(encode_entry(entry, self._header, digest), separators=(",", ":")) + "\n"
+            self._segment.write(line)
+            self._entries += 1
+            self._bytes += len(line)
+            self._unflushed += 1
+            now = self.clock()
+            if self._unflushed >= self.flush_entries or now - self._last_flush >= self.flush_seconds:
+                self._flush(now)
+
+    def _flush(self, now: float):
+        self._segment.flush()
+        self._unflushed = 0
+        self._last_flush = now
+
+    def _possibly_open(self, segments: List[Path]) -> Set[Path]:
+        newest = {}
+        for path in segments:
+            newest[_segment_pid(path)] = path
+        open_segments = {self._segment_path}
+        for pid, path in newest.items():
+            if pid is not None and pid != os.getpid() and _pid_alive(pid):
+                open_segments.add(path)
+        return open_segments
+
+    def _apply_retention(self) -> int:
+        if not self.max_segments:
+            return 0
+        segments = sorted(self.directory.glob(SEGMENT_GLOB))
+        open_segments = self._possibly_open(segments)
+        removed = 0
+        for path in segments[:-self.max_segments]:
+            if path in open_segments:
+                continue
+            path.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+    def _prune_in_background(self):
+        with self._prune_lock:
+            self._prune_pending = True
+            if self._pruner is not None and self._pruner.is_alive():
+                return
+            self._pruner = threading.Thread(target=self._prune_until_idle, name="log-text-prune", daemon=True)
+            self._pruner.start()
+
+    def _prune_until_idle(self):
+        while True:
+            with self._prune_lock:
+                if not self._prune_pending:
+                    self._pruner = None
+                    return
+                self._prune_pending = False
+            self.prune_texts()
+
+    def prune_texts(self, grace_seconds: float = None) -> int:
+        if grace_seconds is None:
+            grace_seconds = 2 * self.known_text_ttl + self.flush_seconds
+        keep = set()
+        for path in sorted(self.directory.glob(SEGMENT_GLOB)):
+            for line in _read_lines(path):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                if "h" in record:
+                    keep.add(record["h"])
+        return self.texts.prune(keep, touched_before=self.clock() - grace_seconds)
+
+    def close(self):
+        with self._lock:
+            self._close_segment()
+        pruner = self._pruner
+        if pruner is not None and pruner is not threading.current_thread():
+            pruner.join()
+
+
+def _segment_pid(path: Path) -> Optional[int]:
+    parts = path.name.split("-")
+    return int(parts[2]) if len(parts) == 4 and parts[2].isdigit() else None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _read_lines(path: Path) -> Iterator[str]:
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield line
+    except EOFError:
+        return
+
+
+def _decode_segment(path: Path, texts: TextStore) -> List[Dict[str, Any]]:
+    header = None
+    records = []
+    for line in _read_lines(path):
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            break
+        if "header" in record:
+            header = record["header"]
+        elif header is not None:
+            records.append(record)
+
+    resolved = texts.get_many([record["h"] for record in records])
+    return [decode_entry(record, header, resolved.get(record["h"])) for record in records]
+
+
+def iter_compact_entries(directory: Optional[Path] = None, reverse: bool = False) -> Iterator[Dict[str, Any]]:
+    directory = Path(directory or Config.COMPACT_LOG_CONFIG["directory"])
+    segments = sorted(directory.glob(SEGMENT_GLOB), reverse=reverse)
+    if not segments:
+        return
+    texts = TextStore(directory / "texts.db")
+    for path in segments:
+        entries = _decode_segment(path, texts)
+        yield from (reversed(entries) if reverse else entries)
+
+
+def tail_entries(limit: int, directory: Optional[Path] = None) -> List[Dict[str, Any]]:
+    entries = deque(maxlen=limit)
+    for entry in iter_compact_entries(directory, reverse=True):
+        entries.appendleft(entry)
+        if len(entries) >= limit:
+            break
+    return list(entries)
+
+
+def iter_log_entries() -> Iterator[Dict[str, Any]]:
+    if Config.LOG_STORAGE == "compact":
+        yield from iter_compact_entries()
+        return
+    if Config.LOG_JSONL_FILE.exists():
+        with open(Config.LOG_JSONL_FILE, "r") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
@@ -0,0 +1,209 @@
+import logging
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Callable, Dict, List, Optional
+import numpy as np
+from src.app.config import Config
+
+FALLBACK_STATUSES = ("MEDIUM", "LOW")
+
+
+class ConfidenceSketch:
+    def __init__(self, bins: int = 100):
+        self.bins = bins
+        self.counts = np.zeros(bins, dtype=np.int64)
+
+    def add(self, value: float):
+        self.counts[min(int(value * self.bins), self.bins - 1)] += 1
+
+    def merge(self, other: "ConfidenceSketch"):
+        self.counts += other.counts
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def quantile(self, q: float) -> Optional[float]:
+        total = self.total
+        if total == 0:
+            return None
+        cumulative = np.cumsum(self.counts)
+        idx = int(np.searchsorted(cumulative, q * total, side="left"))
+        idx = min(idx, self.bins - 1)
+        below = cumulative[idx - 1] if idx > 0 else 0
+        fraction = (q * total - below) / self.counts[idx] if self.counts[idx] else 0.0
+        return (idx + fraction) / self.bins
+
+
+class _Bucket:
+    def __init__(self, start: int, bins: int):
+        self.start = start
+        self.sketch = ConfidenceSketch(bins)
+        self.statuses = Counter()
+        self.paths = Counter()
+        self.count = 0
+        self.fallbacks = 0
+        self.drift_count = 0
+        self.drift_fallbacks = 0
+
+
+class StreamingMetrics:
+    def __init__(
+        self,
+        windows: Dict[str, int] = None,
+        bucket_seconds: int = None,
+        bins: int = None,
+        drift: Dict[str, Any] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        config = Config.MONITORING_CONFIG
+        self.windows = windows or config["windows"]
+        self.bucket_seconds = bucket_seconds or config["bucket_seconds"]
+        self.bins = bins or config["confidence_bins"]
+        self.drift = {**config["drift"], **(drift or {})}
+        self.clock = clock
+
+        self._buckets: "deque[_Bucket]" = deque(
+            maxlen=max(self.windows.values()) // self.bucket_seconds + 1
+        )
+        self._lock = threading.Lock()
+        self._window_totals = (0, 0)
+        self._baseline_totals = (0, 0)
+        self._last_alert = None
+        self.alerts: "deque[Dict[str, Any]]" = deque(maxlen=config["max_alerts"])
+        self.logger = logging.getLogger(__name__)
+
+    def _current_bucket(self, now: float) -> _Bucket:
+        start = int(now // self.bucket_seconds) * self.bucket_seconds
+        if not self._buckets or self._buckets[-1].start != start:
+            self._buckets.append(_Bucket(start, self.bins))
+            self._roll_totals(start)
+        return self._buckets[-1]
+
+    def _closed_totals(self, start: int, window_seconds: int, skip_seconds: int = 0):
+        count = fallbacks = 0
+        for bucket in self._buckets:
+            end = bucket.start + self.bucket_seconds
+            if bucket.start >= start or end <= start - window_seconds:
+                continue
+            if skip_seconds and end > start - skip_seconds:
+                continue
+            count += bucket.drift_count
+            fallbacks += bucket.drift_fallbacks
+        return count, fallbacks
+
+    def _roll_totals(self, start: int):
+        window = self.windows[self.drift["window"]]
+        self._window_totals = self._closed_totals(start, window)
+        self._baseline_totals = self._closed_totals(
+            start, self.windows[self.drift["baseline_window"]], skip_seconds=window
+        )
+
+    def observe(self, confidence: float, status: str, decision_via: str):
+        now = self.clock()
+        with self._lock:
+            bucket = self._current_bucket(now)
+            bucket.sketch.add(confidence)
+            bucket.statuses[status] += 1
+            bucket.paths[decision_via] += 1
+            bucket.count += 1
+            bucket.fallbacks += status in FALLBACK_STATUSES
+            if decision_via in self.drift["exclude_paths"]:
+                return
+            bucket.drift_count += 1
+            bucket.drift_fallbacks += status in FALLBACK_STATUSES
+            alert = self._check_drift(now, bucket)
+
+        if alert:
+            self.logger.warning(
+                f"Fallback rate drift: {alert['rate']:.1%} over {alert['window']} "
+                f"outside {alert['lower']:.1%}-{alert['upper']:.1%} (n={alert['count']})"
+            )
+
+    def _aggregate(self, window_seconds: int, now: float) -> Dict[str, Any]:
+        sketch = ConfidenceSketch(self.bins)
+        statuses = Counter()
+        paths = Counter()
+        cutoff = now - window_seconds
+        for bucket in self._buckets:
+            if bucket.start + self.bucket_seconds <= cutoff:
+                continue
+            sketch.merge(bucket.sketch)
+            statuses.update(bucket.statuses)
+            paths.update(bucket.paths)
+        return {"sketch": sketch, "statuses": statuses, "paths": paths}
+
+    def _fallback_rate(self, aggregate: Dict[str, Any]) -> Optional[float]:
+        total = aggregate["sketch"].total
+        if total == 0:
+            return None
+        return sum(aggregate["statuses"][s] for s in FALLBACK_STATUSES) / total
+
+    def _band(self, baseline_totals):
+        drift = self.drift
+        if drift["lower"] is not None or drift["upper"] is not None:
+            return drift["lower"] or 0.0, drift["upper"] if drift["upper"] is not None else 1.0
+
+        count, fallbacks = baseline_totals
+        if count == 0:
+            return None
+        baseline = fallbacks / count
+        return max(0.0, baseline - drift["tolerance"]), min(1.0, baseline + drift["tolerance"])
+
+    def _check_drift(self, now: float, bucket: _Bucket) -> Optional[Dict[str, Any]]:
+        drift = self.drift
+        if self._last_alert is not None and now - self._last_alert < drift["cooldown_seconds"]:
+            return None
+
+        count = self._window_totals[0] + bucket.drift_count
+        if count < drift["min_samples"]:
+            return None
+
+        band = self._band(self._baseline_totals)
+        rate = (self._window_totals[1] + bucket.drift_fallbacks) / count
+        if band is None or band[0] <= rate <= band[1]:
+            return None
+
+        self._last_alert = now
+        alert = {
+            "timestamp": now,
+            "window": drift["window"],
+            "rate": rate,
+            "lower": band[0],
+            "upper": band[1],
+            "count": count
+        }
+        self.alerts.append(alert)
+        return alert
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = self.clock()
+        with self._lock:
+            windows = {}
+            for name, seconds in self.windows.items():
+                aggregate = self._aggregate(seconds, now)
+                sketch = aggregate["sketch"]
+                windows[name] = {
+                    "count": sketch.total,
+                    "confidence": {
+                        f"p{int(q * 100)}": sketch.quantile(q) for q in (0.05, 0.25, 0.5, 0.75, 0.95)
+                    },
+                    "status": dict(aggregate["statuses"]),
+                    "decision_via": dict(aggregate["paths"]),
+                    "fallback_rate": self._fallback_rate(aggregate)
+                }
+            start = int(now // self.bucket_seconds) * self.bucket_seconds
+            band = self._band(self._closed_totals(
+                start + self.bucket_seconds,
+                self.windows[self.drift["baseline_window"]],
+                skip_seconds=self.windows[self.drift["window"]]
+            ))
+            return {
+                "windows": windows,
+                "drift_band": list(band) if band else None,
+                "alerts": list(self.alerts)
+            }
+
+
+metrics_instance = StreamingMetrics()
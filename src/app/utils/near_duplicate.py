@@ -0,0 +1,132 @@
+import re
+import threading
+import unicodedata
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+import numpy as np
+from src.app.config import Config
+
+MERSENNE_PRIME = (1 << 31) - 1
+_PUNCTUATION = re.compile(r"[^\w\s]", re.UNICODE)
+_WHITESPACE = re.compile(r"\s+")
+
+DECISION_FIELDS = [
+    "label", "label_idx", "probs", "confidence", "status",
+    "fallback_activated", "fallback_strategy", "backup_model",
+    "final_label", "final_decision_via", "tasks"
+]
+
+
+def normalize_text(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = _PUNCTUATION.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def shingles(text: str, size: int) -> Set[str]:
+    normalized = normalize_text(text)
+    if len(normalized) <= size:
+        return {normalized}
+    return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+
+class NearDuplicateIndex:
+    def __init__(
+        self,
+        threshold: float = None,
+        num_perm: int = None,
+        bands: int = None,
+        shingle_size: int = None,
+        max_entries: int = None,
+        seed: int = 1
+    ):
+        config = Config.NEAR_DUPLICATE_CONFIG
+        self.threshold = threshold or config["threshold"]
+        self.num_perm = num_perm or config["num_perm"]
+        self.bands = bands or config["bands"]
+        self.shingle_size = shingle_size or config["shingle_size"]
+        self.max_entries = max_entries or config["max_entries"]
+        if self.num_perm % self.bands != 0:
+            raise ValueError(f"num_perm ({self.num_perm}) must be divisible by bands ({self.bands})")
+        self.rows = self.num_perm // self.bands
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, MERSENNE_PRIME, size=self.num_perm).astype(np.uint64)
+        self._b = rng.randint(0, MERSENNE_PRIME, size=self.num_perm).astype(np.uint64)
+
+        self._entries: "OrderedDict[int, Tuple[np.ndarray, Dict[str, Any]]]" = OrderedDict()
+        self._buckets: Dict[Tuple[int, bytes], Set[int]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.counters = {"lookups": 0, "hits": 0, "inserts": 0, "evictions": 0}
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) & MERSENNE_PRIME for s in shingles(text, self.shingle_size)),
+            dtype=np.uint64
+        )
+        permuted = (np.outer(hashes, self._a) + self._b) % MERSENNE_PRIME
+        return permuted.min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def lookup(self, text: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        signature = self.signature(text)
+        with self._lock:
+            self.counters["lookups"] += 1
+            candidates = set()
+            for key in self._band_keys(signature):
+                candidates.update(self._buckets.get(key, ()))
+
+            best_id, best_similarity = None, 0.0
+            for entry_id in candidates:
+                similarity = float(np.mean(self._entries[entry_id][0] == signature))
+                if similarity > best_similarity:
+                    best_id, best_similarity = entry_id, similarity
+
+            if best_id is None or best_similarity < self.threshold:
+                return None
+
+            self._entries.move_to_end(best_id)
+            self.counters["hits"] += 1
+            return dict(self._entries[best_id][1]), best_similarity
+
+    def add(self, text: str, decision: Dict[str, Any]):
+        signature = self.signature(text)
+        decision = {field: decision.get(field) for field in DECISION_FIELDS if field in decision}
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (signature, decision)
+            for key in self._band_keys(signature):
+                self._buckets.setdefault(key, set()).add(entry_id)
+            self.counters["inserts"] += 1
+
+            while len(self._entries) > self.max_entries:
+                self._evict_oldest()
+
+    def _evict_oldest(self):
+        entry_id, (signature, _) = self._entries.popitem(last=False)
+        for key in self._band_keys(signature):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[key]
+        self.counters["evictions"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.counters["lookups"]
+            return {
+                **self.counters,
+                "entries": len(self._entries),
+                "inference_avoided": self.counters["hits"],
+                "hit_rate": self.counters["hits"] / lookups if lookups else 0.0,
+                "threshold": self.threshold
+            }
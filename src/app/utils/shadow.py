@@ -0,0 +1,206 @@
+import json
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import numpy as np
+from src.app.config import Config
+
+_STOP = object()
+
+
+class ShadowEvaluator:
+    def __init__(
+        self,
+        candidate_path: Optional[str] = None,
+        candidate=None,
+        sample_rate: float = None,
+        queue_size: int = None,
+        batch_size: int = None,
+        log_file: Optional[Path] = None,
+        device: str = "cpu",
+        seed: Optional[int] = None
+    ):
+        config = Config.SHADOW_CONFIG
+        if candidate is None and candidate_path is None:
+            raise ValueError("ShadowEvaluator needs a candidate model path or node")
+        self.candidate_path = candidate_path
+        self.candidate = candidate
+        self.device = device
+        self.sample_rate = config["sample_rate"] if sample_rate is None else sample_rate
+        self.batch_size = batch_size or config["batch_size"]
+        self.log_file = Path(log_file) if log_file else None
+
+        self._queue = queue.Queue(maxsize=queue_size or config["queue_size"])
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._latencies = {
+            "primary": deque(maxlen=config["latency_window"]),
+            "shadow": deque(maxlen=config["latency_window"])
+        }
+        self.counters = {
+            "sampled": 0,
+            "dropped": 0,
+            "compared": 0,
+            "agreements": 0,
+            "errors": 0
+        }
+        self._confidence_delta_sum = 0.0
+        self._abs_confidence_delta_sum = 0.0
+
+        self._worker = None
+        self._worker_pid = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_worker(self):
+        pid = os.getpid()
+        if self._worker_pid == pid:
+            return
+        with self._start_lock:
+            if self._worker_pid == pid:
+                return
+            if self._worker_pid is not None:
+                self._queue = queue.Queue(maxsize=self._queue.maxsize)
+                self._lock = threading.Lock()
+            self._worker = threading.Thread(target=self._run, name="shadow-eval", daemon=True)
+            self._worker.start()
+            self._worker_pid = pid
+
+    def submit(self, state: Dict[str, Any]) -> bool:
+        if self._random.random() >= self.sample_rate:
+            return False
+        self._ensure_worker()
+
+        item = {
+            "text": state["text"],
+            "label": state.get("label"),
+            "confidence": state.get("confidence"),
+            "latency_ms": state.get("inference_latency_ms")
+        }
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            with self._lock:
+                self.counters["dropped"] += 1
+            return False
+
+        with self._lock:
+            self.counters["sampled"] += 1
+        return True
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+
+            batch = [item]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    self._queue.task_done()
+                    break
+                batch.append(item)
+
+            self._evaluate(batch)
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _evaluate(self, batch: List[Dict[str, Any]]):
+        try:
+            if self.candidate is None:
+                from src.app.nodes.inference_node import InferenceNode
+                self.candidate = InferenceNode(self.candidate_path, device=self.device)
+
+            start = time.perf_counter()
+            results = self.candidate.run_batch([item["text"] for item in batch])
+            shadow_latency_ms = (time.perf_counter() - start) * 1000 / len(batch)
+        except Exception as e:
+            with self._lock:
+                self.counters["errors"] += len(batch)
+            print(f"Shadow evaluation failed: {e}")
+            return
+
+        records = []
+        with self._lock:
+            for item, result in zip(batch, results):
+                agree = result["label"] == item["label"]
+                delta = result["confidence"] - (item["confidence"] or 0.0)
+                self.counters["compared"] += 1
+                self.counters["agreements"] += int(agree)
+                self._confidence_delta_sum += delta
+                self._abs_confidence_delta_sum += abs(delta)
+                self._latencies["shadow"].append(shadow_latency_ms)
+                if item["latency_ms"] is not None:
+                    self._latencies["primary"].append(item["latency_ms"])
+
+                records.append({
+                    "timestamp": datetime.now().isoformat(),
+                    "primary_label": item["label"],
+                    "shadow_label": result["label"],
+                    "agree": agree,
+                    "primary_confidence": item["confidence"],
+                    "shadow_confidence": result["confidence"],
+                    "confidence_delta": delta,
+                    "primary_latency_ms": item["latency_ms"],
+                    "shadow_latency_ms": shadow_latency_ms
+                })
+
+        if self.log_file is not None:
+            self.log_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.log_file, "a") as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+
+    def _latency_summary(self, name: str) -> Dict[str, Optional[float]]:
+        values = np.array(self._latencies[name], dtype=float)
+        if values.size == 0:
+            return {"mean_ms": None, "p50_ms": None, "p95_ms": None}
+        return {
+            "mean_ms": float(values.mean()),
+            "p50_ms": float(np.percentile(values, 50)),
+            "p95_ms": float(np.percentile(values, 95))
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            compared = self.counters["compared"]
+            return {
+                **self.counters,
+                "queue_depth": self._queue.qsize(),
+                "sample_rate": self.sample_rate,
+                "agreement_rate": self.counters["agreements"] / compared if compared else None,
+                "mean_confidence_delta": self._confidence_delta_sum / compared if compared else None,
+                "mean_abs_confidence_delta": self._abs_confidence_delta_sum / compared if compared else None,
+                "latency": {
+                    "primary": self._latency_summary("primary"),
+                    "shadow": self._latency_summary("shadow")
+                }
+            }
+
+    def drain(self, timeout: float = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: float = 5.0):
+        if self._worker is None or self._worker_pid != os.getpid():
+            return
+        self._queue.put(_STOP)
+        self._worker.join(timeout)
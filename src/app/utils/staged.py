@@ -0,0 +1,153 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from src.app.config import Config
+
+_STOP = object()
+
+
+class Stage:
+    def __init__(self, name: str, fn: Callable[[Any], Any], workers: int = 1, queue_size: int = 4):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.queue_size = queue_size
+        self.reset()
+
+    def reset(self):
+        self.input = queue.Queue(maxsize=self.queue_size)
+        self.processed = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+        self._lock = threading.Lock()
+
+    def put(self, item: Tuple[Future, Any]):
+        self.input.put(item)
+        with self._lock:
+            self.max_queue_depth = max(self.max_queue_depth, self.input.qsize())
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.processed += 1
+            self.busy_seconds += seconds
+
+
+class StagedPipeline:
+    def __init__(self, stages: List[Stage]):
+        self.stages = stages
+        self.started_at = time.monotonic()
+        self._threads = []
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._start_lock:
+            if self._pid == pid:
+                return
+            if self._pid is not None:
+                for stage in self.stages:
+                    stage.reset()
+                self.started_at = time.monotonic()
+            self._threads = []
+            for position, stage in enumerate(self.stages):
+                downstream = self.stages[position + 1] if position + 1 < len(self.stages) else None
+                for worker in range(stage.workers):
+                    thread = threading.Thread(
+                        target=self._work,
+                        args=(stage, downstream),
+                        name=f"stage-{stage.name}-{worker}",
+                        daemon=True
+                    )
+                    thread.start()
+                    self._threads.append(thread)
+            self._pid = pid
+
+    def submit(self, payload: Any) -> Future:
+        self._ensure_started()
+        future = Future()
+        self.stages[0].put((future, payload))
+        return future
+
+    def _work(self, stage: Stage, downstream: Optional[Stage]):
+        while True:
+            item = stage.input.get()
+            if item is _STOP:
+                return
+            future, payload = item
+            start = time.perf_counter()
+            try:
+                output = stage.fn(payload)
+            except BaseException as e:
+                future.set_exception(e)
+                continue
+            finally:
+                stage.record(time.perf_counter() - start)
+
+            if downstream is None:
+                future.set_result(output)
+            else:
+                downstream.put((future, output))
+
+    def stats(self) -> Dict[str, Any]:
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return {
+            stage.name: {
+                "workers": stage.workers,
+                "processed": stage.processed,
+                "queue_depth": stage.input.qsize(),
+                "max_queue_depth": stage.max_queue_depth,
+                "busy_seconds": stage.busy_seconds,
+                "utilization": min(stage.busy_seconds / (elapsed * stage.workers), 1.0)
+            }
+            for stage in self.stages
+        }
+
+    def close(self):
+        if self._pid != os.getpid():
+            return
+        self._pid = None
+        for stage in self.stages:
+            for _ in range(stage.workers):
+                stage.input.put(_STOP)
+
+
+class StagedInference:
+    def __init__(self, node, tokenizer_workers: int = None, queue_size: int = None):
+        config = Config.STAGED_PIPELINE_CONFIG
+        tokenizer_workers = tokenizer_workers or config["tokenizer_workers"]
+        queue_size = queue_size or config["queue_size"]
+        self.node = node
+        self.pipeline = StagedPipeline([
+            Stage("tokenize", self._tokenize, workers=tokenizer_workers, queue_size=queue_size),
+            Stage("forward", self._forward, workers=1, queue_size=queue_size),
+            Stage("postprocess", self._postprocess, workers=config["postprocess_workers"], queue_size=queue_size)
+        ])
+
+    def _tokenize(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        inputs = self.node.encode(payload["texts"], max_length=payload["max_length"], head_tail=payload["head_tail"])
+        return {**payload, "inputs": inputs}
+
+    def _forward(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        probs, embeddings = self.node.forward(payload["inputs"])
+        return {"texts": payload["texts"], "probs": probs, "embeddings": embeddings}
+
+    def _postprocess(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return self.node.postprocess(payload["texts"], payload["probs"], payload["embeddings"])
+
+    def submit(self, texts: List[str], max_length: int = 512, head_tail: bool = False) -> Future:
+        return self.pipeline.submit({"texts": texts, "max_length": max_length, "head_tail": head_tail})
+
+    def run_batch(self, texts: List[str], max_length: int = 512, head_tail: bool = False) -> List[Dict[str, Any]]:
+        return self.submit(texts, max_length=max_length, head_tail=head_tail).result()
+
+    def stats(self) -> Dict[str, Any]:
+        return self.pipeline.stats()
+
+    def close(self):
+        self.pipeline.close()
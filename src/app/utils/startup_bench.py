@@ -0,0 +1,104 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from src.app.config import Config
+
+ENTRY_POINTS = {
+    "cli logs": {"args": ["-m", "src.app.cli", "logs", "--lines", "1"]},
+    "cli run": {"args": ["-m", "src.app.cli", "run", "--non-interactive"], "stdin": "quit\n"},
+    "web_app": {"args": ["-c", "import web_app"]},
+}
+
+
+def parse_importtime(stderr: str, top: int = 5) -> List[Dict[str, Any]]:
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].rstrip()[1:]
+        if name.startswith(" "):
+            continue
+        imports.append({"module": name.strip(), "cumulative_ms": int(parts[1]) / 1000})
+    return sorted(imports, key=lambda i: -i["cumulative_ms"])[:top]
+
+
+def measure_entry_point(name: str, repeats: int = 3) -> Dict[str, Any]:
+    entry = ENTRY_POINTS[name]
+    env = {**os.environ, "PYTHONPATH": str(Config.PROJECT_ROOT)}
+    durations = []
+    returncode = 0
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, *entry["args"]],
+            input=entry.get("stdin", ""),
+            capture_output=True,
+            text=True,
+            cwd=Config.PROJECT_ROOT,
+            env=env
+        )
+        durations.append(time.perf_counter() - start)
+        returncode = returncode or proc.returncode
+
+    profile = subprocess.run(
+        [sys.executable, "-X", "importtime", *entry["args"]],
+        input=entry.get("stdin", ""),
+        capture_output=True,
+        text=True,
+        cwd=Config.PROJECT_ROOT,
+        env=env
+    )
+
+    return {
+        "entry_point": name,
+        "median_s": statistics.median(durations),
+        "min_s": min(durations),
+        "returncode": returncode,
+        "top_imports": parse_importtime(profile.stderr),
+    }
+
+
+def run_startup_benchmark(names: Optional[List[str]] = None, repeats: int = 3) -> List[Dict[str, Any]]:
+    return [measure_entry_point(name, repeats) for name in (names or list(ENTRY_POINTS))]
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        proc = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=Config.PROJECT_ROOT
+        )
+    except OSError:
+        return None
+    return proc.stdout.strip() or None
+
+
+def load_history(path: Optional[Path] = None) -> List[Dict[str, Any]]:
+    path = Path(path or Config.STARTUP_BENCH_FILE)
+    if not path.exists():
+        return []
+    with open(path, "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def record_results(results: List[Dict[str, Any]], path: Optional[Path] = None) -> Dict[str, Any]:
+    path = Path(path or Config.STARTUP_BENCH_FILE)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    record = {
+        "timestamp": datetime.now().isoformat(),
+        "revision": _git_revision(),
+        "results": {r["entry_point"]: round(r["median_s"], 4) for r in results},
+    }
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+    return record
@@ -0,0 +1,202 @@
+import json
+import multiprocessing as mp
+import os
+import queue
+import time
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import numpy as np
+from src.app.config import Config
+
+DEFAULT_SAMPLE_TEXTS = [
+    "This movie was absolutely fantastic, I loved every minute of it!",
+    "Terrible plot, wooden acting and a soundtrack that never stops.",
+    "It was okay. Some scenes worked, others dragged on far too long.",
+    "I wouldn't watch it again, but the cinematography was beautiful.",
+    "A masterpiece of modern cinema with a career-best lead performance.",
+    "The first half is gripping, the ending completely falls apart.",
+    "Not sure how I feel about this one, it left me confused.",
+    "Worst film I've seen this year. Save your money.",
+]
+
+
+def load_sample_texts(path: Optional[str] = None, limit: int = 256) -> List[str]:
+    texts = []
+
+    if not path:
+        from src.app.utils.log_store import iter_log_entries
+        texts = [entry["input_text"] for entry in islice(iter_log_entries(), limit) if entry.get("input_text")]
+        return texts or list(DEFAULT_SAMPLE_TEXTS)
+
+    source = Path(path)
+    if source.exists():
+        with open(source, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                if source.suffix in (".jsonl", ".json"):
+                    record = json.loads(line)
+                    text = record.get("text") or record.get("input_text")
+                else:
+                    text = line
+                if text:
+                    texts.append(text)
+                if len(texts) >= limit:
+                    break
+    else:
+        raise FileNotFoundError(f"Sample file not found: {path}")
+
+    return texts or list(DEFAULT_SAMPLE_TEXTS)
+
+
+def benchmark_profile(
+    inference_node,
+    texts: List[str],
+    threads: int,
+    batch_size: int,
+    warmup_batches: int = 2
+) -> Dict[str, Any]:
+    import torch
+    torch.set_num_threads(threads)
+
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    for batch in batches[:warmup_batches]:
+        inference_node.run_batch(batch)
+
+    latencies = []
+    start = time.perf_counter()
+    for batch in batches:
+        batch_start = time.perf_counter()
+        inference_node.run_batch(batch)
+        latencies.append((time.perf_counter() - batch_start) * 1000)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "threads": threads,
+        "batch_size": batch_size,
+        "workers": 1,
+        "throughput": len(texts) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+    }
+
+
+def _worker_benchmark(model_path, texts, threads, batch_size, barrier, results):
+    from src.app.nodes.inference_node import InferenceNode
+    from src.app.prefork import configure_worker_threads
+    configure_worker_threads(threads)
+    node = InferenceNode(model_path)
+    barrier.wait()
+    results.put(benchmark_profile(node, texts, threads, batch_size))
+
+
+def benchmark_workers(
+    model_path: str,
+    texts: List[str],
+    threads: int,
+    batch_size: int,
+    workers: int
+) -> Dict[str, Any]:
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(
+            target=_worker_benchmark,
+            args=(model_path, texts, threads, batch_size, barrier, results)
+        )
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    worker_results = []
+    deadline = time.monotonic() + Config.TUNING_CONFIG["worker_timeout_seconds"]
+    try:
+        while len(worker_results) < workers:
+            try:
+                worker_results.append(results.get(timeout=1.0))
+                continue
+            except queue.Empty:
+                pass
+            failed = [p.exitcode for p in processes if p.exitcode not in (None, 0)]
+            if failed:
+                raise RuntimeError(f"Benchmark worker exited with code {failed[0]}")
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Benchmark workers did not finish within {Config.TUNING_CONFIG['worker_timeout_seconds']}s")
+    finally:
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+
+    return {
+        "threads": threads,
+        "batch_size": batch_size,
+        "workers": workers,
+        "throughput": sum(r["throughput"] for r in worker_results),
+        "p50_ms": max(r["p50_ms"] for r in worker_results),
+        "p95_ms": max(r["p95_ms"] for r in worker_results),
+    }
+
+
+def pareto_frontier(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    frontier = []
+    for candidate in results:
+        dominated = any(
+            other["throughput"] >= candidate["throughput"]
+            and other["p95_ms"] <= candidate["p95_ms"]
+            and (other["throughput"] > candidate["throughput"] or other["p95_ms"] < candidate["p95_ms"])
+            for other in results
+        )
+        if not dominated:
+            frontier.append(candidate)
+    return sorted(frontier, key=lambda r: r["p95_ms"])
+
+
+def choose_profile(
+    frontier: List[Dict[str, Any]],
+    max_latency_ms: Optional[float] = None
+) -> Dict[str, Any]:
+    if not frontier:
+        raise ValueError("Cannot choose a profile from an empty frontier")
+
+    eligible = [r for r in frontier if max_latency_ms is None or r["p95_ms"] <= max_latency_ms]
+    if not eligible:
+        return min(frontier, key=lambda r: r["p95_ms"])
+    return max(eligible, key=lambda r: r["throughput"])
+
+
+def save_profile(profile: Dict[str, Any], path: Optional[Path] = None) -> Path:
+    path = Path(path or Config.TUNING_PROFILE_FILE)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    record = {
+        "threads": profile["threads"],
+        "batch_size": profile["batch_size"],
+        "workers": profile["workers"],
+        "throughput": profile["throughput"],
+        "p50_ms": profile["p50_ms"],
+        "p95_ms": profile["p95_ms"],
+        "cpu_count": os.cpu_count(),
+        "created_at": datetime.now().isoformat(),
+    }
+    with open(path, "w") as f:
+        json.dump(record, f, indent=2)
+    return path
+
+
+def load_profile(path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    path = Path(path or Config.TUNING_PROFILE_FILE)
+    if not path.exists():
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def apply_profile(profile: Dict[str, Any]):
+    import torch
+    torch.set_num_threads(profile["threads"])
@@ -0,0 +1,180 @@
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from src.app.config import Config
+
+
+def normalize(vector: Sequence[float]) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+class VectorIndex:
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_entries: int = None,
+        save_every: int = None
+    ):
+        config = Config.EMBEDDING_FALLBACK_CONFIG
+        self.path = Path(path) if path else None
+        self.max_entries = max_entries or config["max_entries"]
+        self.save_every = save_every or config["save_every"]
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        self._labels: List[str] = []
+        self._sources: List[str] = []
+        self._size = 0
+        self._cursor = 0
+        self._unsaved = 0
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self.counters = {"lookups": 0, "resolved": 0, "inserts": 0}
+
+        if self.path is not None and self.path.exists():
+            self.load()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def load(self):
+        data = np.load(self.path, allow_pickle=False)
+        vectors = data["vectors"].astype(np.float32)
+        labels = [str(label) for label in data["labels"]]
+        sources = [str(source) for source in data["sources"]]
+        if "cursor" in data and len(labels) == self.max_entries:
+            cursor = int(data["cursor"])
+            order = list(range(cursor, len(labels))) + list(range(cursor))
+            vectors = vectors[order]
+            labels = [labels[i] for i in order]
+            sources = [sources[i] for i in order]
+        keep = slice(max(0, len(labels) - self.max_entries), len(labels))
+        with self._lock:
+            self._vectors = vectors[keep].copy()
+            self._labels = labels[keep]
+            self._sources = sources[keep]
+            self._size = len(self._labels)
+            self._cursor = self._size % self.max_entries
+
+    def save(self, chunk_rows: int = 4096):
+        if self.path is None:
+            return
+        with self._save_lock:
+            with self._lock:
+                size, cursor = self._size, self._cursor
+                dims = self._vectors.shape[1] if size else 0
+                self._unsaved = 0
+            vectors = np.zeros((size, dims), dtype=np.float32)
+            labels, sources = [], []
+            for start in range(0, size, chunk_rows):
+                stop = min(start + chunk_rows, size)
+                with self._lock:
+                    vectors[start:stop] = self._vectors[start:stop]
+                    labels += self._labels[start:stop]
+                    sources += self._sources[start:stop]
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f".{self.path.stem}.{os.getpid()}.tmp.npz")
+            np.savez(
+                tmp_path,
+                vectors=vectors,
+                labels=np.asarray(labels, dtype=str),
+                sources=np.asarray(sources, dtype=str),
+                cursor=np.asarray(cursor)
+            )
+            os.replace(tmp_path, self.path)
+
+    def _save_in_background(self):
+        if self._save_lock.locked():
+            return
+        threading.Thread(target=self.save, name="vector-index-save", daemon=True).start()
+
+    def add(self, embedding: Sequence[float], label: str, source: str):
+        vector = normalize(embedding)
+        with self._lock:
+            if self._size and vector.shape[0] != self._vectors.shape[1]:
+                raise ValueError(f"Embedding has {vector.shape[0]} dims, index holds {self._vectors.shape[1]}")
+
+            if self._size < self.max_entries and self._size >= len(self._vectors):
+                capacity = min(max(64, 2 * len(self._vectors)), self.max_entries)
+                grown = np.zeros((capacity, vector.shape[0]), dtype=np.float32)
+                if self._size:
+                    grown[:self._size] = self._vectors[:self._size]
+                self._vectors = grown
+
+            slot = self._cursor
+            self._vectors[slot] = vector
+            if slot < self._size:
+                self._labels[slot] = label
+                self._sources[slot] = source
+            else:
+                self._labels.append(label)
+                self._sources.append(source)
+                self._size += 1
+            self._cursor = (slot + 1) % self.max_entries
+            self.counters["inserts"] += 1
+            self._unsaved += 1
+            should_save = self.path is not None and self._unsaved >= self.save_every
+
+        if should_save:
+            self._save_in_background()
+
+    def search(self, embedding: Sequence[float], k: int = 5) -> List[Dict[str, Any]]:
+        vector = normalize(embedding)
+        with self._lock:
+            self.counters["lookups"] += 1
+            if not self._size or vector.shape[0] != self._vectors.shape[1]:
+                return []
+            similarities = self._vectors[:self._size] @ vector
+            top = np.argsort(-similarities)[:k]
+            return [
+                {"label": self._labels[i], "similarity": float(similarities[i]), "source": self._sources[i]}
+                for i in top
+            ]
+
+    def resolve(
+        self,
+        embedding: Sequence[float],
+        k: int = None,
+        min_similarity: float = None,
+        min_neighbours: int = None,
+        min_agreement: float = None
+    ) -> Optional[Dict[str, Any]]:
+        config = Config.EMBEDDING_FALLBACK_CONFIG
+        k = k or config["k"]
+        min_similarity = config["min_similarity"] if min_similarity is None else min_similarity
+        min_neighbours = min_neighbours or config["min_neighbours"]
+        min_agreement = config["min_agreement"] if min_agreement is None else min_agreement
+
+        neighbours = [n for n in self.search(embedding, k) if n["similarity"] >= min_similarity]
+        if len(neighbours) < min_neighbours:
+            return None
+
+        votes = Counter()
+        for neighbour in neighbours:
+            votes[neighbour["label"]] += neighbour["similarity"]
+        label, weight = votes.most_common(1)[0]
+        agreement = weight / sum(votes.values())
+        if agreement < min_agreement:
+            return None
+
+        with self._lock:
+            self.counters["resolved"] += 1
+        return {
+            "label": label,
+            "agreement": agreement,
+            "neighbours": len(neighbours),
+            "similarity": neighbours[0]["similarity"]
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.counters["lookups"]
+            return {
+                **self.counters,
+                "entries": self._size,
+                "resolve_rate": self.counters["resolved"] / lookups if lookups else 0.0
+            }
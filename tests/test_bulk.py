@@ -0,0 +1,73 @@
+import json
+import pytest
+from src.app.utils.bulk import BulkClassifier, iter_records
+
+class FakeDAG:
+    batch_size = 2
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.seen = []
+
+    def run_batch(self, texts, fallback_workers=None, batch_size=None):
+        for idx in reversed(range(len(texts))):
+            if texts[idx] == self.fail_on:
+                raise RuntimeError("interrupted")
+            self.seen.append(texts[idx])
+            yield idx, {
+                "final_label": "positive",
+                "confidence": 0.9,
+                "status": "HIGH",
+                "probs": {"positive": 0.9, "negative": 0.1},
+                "decision_via": "direct_prediction",
+                "request_id": f"req-{texts[idx]}"
+            }
+
+def _write_jsonl(path, texts):
+    with open(path, "w") as f:
+        for i, text in enumerate(texts):
+            f.write(json.dumps({"id": i, "text": text}) + "\n")
+
+def _read_jsonl(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+class TestIterRecords:
+    def test_reads_csv_and_jsonl(self, tmp_path):
+        csv_path = tmp_path / "reviews.csv"
+        csv_path.write_text('id,text\n1,"good, really"\n2,bad\n')
+        jsonl_path = tmp_path / "reviews.jsonl"
+        jsonl_path.write_text('{"text": "good"}\n\n"bare string"\n')
+
+        assert [r["text"] for r in iter_records(csv_path)] == ["good, really", "bad"]
+        assert [r["text"] for r in iter_records(jsonl_path)] == ["good", "bare string"]
+
+class TestBulkClassifier:
+    def test_writes_results_in_input_order(self, tmp_path):
+        input_path = tmp_path / "in.jsonl"
+        output_path = tmp_path / "out.jsonl"
+        _write_jsonl(input_path, ["a", "b", "c", "d", "e"])
+
+        stats = BulkClassifier(FakeDAG(), input_path, output_path, id_field="id", checkpoint_every=2).run()
+
+        rows = _read_jsonl(output_path)
+        assert stats["processed"] == 5
+        assert [row["id"] for row in rows] == [0, 1, 2, 3, 4]
+        assert [row["request_id"] for row in rows] == ["req-a", "req-b", "req-c", "req-d", "req-e"]
+        assert not (tmp_path / "out.jsonl.checkpoint").exists()
+
+    def test_resumes_from_checkpoint_after_interruption(self, tmp_path):
+        input_path = tmp_path / "in.jsonl"
+        output_path = tmp_path / "out.jsonl"
+        _write_jsonl(input_path, ["a", "b", "c", "d", "e"])
+
+        with pytest.raises(RuntimeError):
+            BulkClassifier(FakeDAG(fail_on="d"), input_path, output_path, checkpoint_every=2).run()
+        assert len(_read_jsonl(output_path)) == 2
+
+        dag = FakeDAG()
+        stats = BulkClassifier(dag, input_path, output_path, checkpoint_every=2).run()
+
+        assert stats["resumed_from"] == 2
+        assert sorted(dag.seen) == ["c", "d", "e"]
+        assert [row["index"] for row in _read_jsonl(output_path)] == [0, 1, 2, 3, 4]
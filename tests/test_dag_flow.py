@@ -92,3 +92,76 @@ class TestDAGIntegration:
         
         mock_fallback_instance.run.assert_called_once()
         assert result["decision_via"] == "user_clarification"
+    
+    @patch('src.app.dag.InferenceNode')
+    @patch('src.app.dag.ConfidenceCheckNode')
+    @patch('src.app.dag.FallbackNode')
+    @patch('src.app.dag.FinalDecisionNode')
+    def test_batch_routes_each_item_like_single_run(self, mock_final, mock_fallback, mock_confidence, mock_inference):
+        mock_inference.return_value.run_batch.return_value = [
+            {"label": "positive", "probs": {"positive": 0.95, "negative": 0.05}, "confidence": 0.95},
+            {"label": "positive", "probs": {"positive": 0.40, "negative": 0.60}, "confidence": 0.40}
+        ]
+        mock_confidence.return_value.run.side_effect = lambda state: {
+            **state,
+            "action": "accept" if state["confidence"] >= 0.75 else "escalate",
+            "status": "HIGH" if state["confidence"] >= 0.75 else "LOW"
+        }
+        mock_fallback.return_value.run.side_effect = lambda state, interactive: {
+            **state,
+            "fallback_activated": True,
+            "final_label": "negative",
+            "final_decision_via": "backup_model_escalation"
+        }
+        mock_final.return_value.run.side_effect = lambda state: {
+            "final_label": state.get("final_label", state["label"]),
+            "decision_via": state.get("final_decision_via", "direct_prediction")
+        }
+        
+        dag = SelfHealingDAG(model_path="fake-path", interactive=False)
+        results = dict(dag.run_batch(["Amazing movie!", "Hmm"]))
+        
+        assert results[0]["decision_via"] == "direct_prediction"
+        assert results[1]["final_label"] == "negative"
+        assert results[1]["decision_via"] == "backup_model_escalation"
+        mock_fallback.return_value.run.assert_called_once()
+
+class TestDeferredClarification:
+    @patch('src.app.dag.InferenceNode')
+    @patch('src.app.dag.FinalDecisionNode')
+    def test_suspends_and_resumes_from_store(self, mock_final, mock_inference, tmp_path):
+        from src.app.dag import resume_clarification
+        from src.app.utils.clarification_store import ClarificationStore
+        
+        mock_inference.return_value.run.return_value = {
+            "label": "positive",
+            "label_idx": 1,
+            "probs": {"positive": 0.6, "negative": 0.4},
+            "confidence": 0.6,
+            "text": "Unclear review"
+        }
+        mock_final.return_value.run.side_effect = lambda state: {
+            "request_id": "req-1",
+            "final_label": state["final_label"],
+            "confidence": state["confidence"],
+            "decision_via": state["final_decision_via"]
+        }
+        store = ClarificationStore(tmp_path / "clarifications.db")
+        
+        dag = SelfHealingDAG(model_path="fake-path", interactive=True, clarification_mode="deferred")
+        dag._clarification_store = store
+        pending = dag.run("Unclear review")
+        
+        assert pending["clarification_pending"] is True
+        assert pending["final_decision_via"] == "pending_clarification"
+        mock_final.return_value.run.assert_not_called()
+        assert [t["ticket_id"] for t in store.list_pending()] == [pending["ticket_id"]]
+        
+        reopened = ClarificationStore(tmp_path / "clarifications.db")
+        result = resume_clarification(pending["ticket_id"], "yes", store=reopened, final_decision_node=mock_final.return_value)
+        
+        assert result["final_label"] == "negative"
+        assert result["decision_via"] == "user_clarification"
+        assert reopened.list_pending() == []
+        with pytest.raises(ValueError):
+            resume_clarification(pending["ticket_id"], "no", store=reopened, final_decision_node=mock_final.return_value)
@@ -0,0 +1,95 @@
+import json
+import numpy as np
+import pytest
+import torch
+from transformers import (
+    AutoModelForSequenceClassification,
+    DistilBertConfig,
+    DistilBertForSequenceClassification,
+    DistilBertTokenizerFast
+)
+from src.app.config import Config
+from src.app.model.distillation import DistillationTrainer, benchmark_student, build_student, distill
+from src.app.nodes.inference_node import InferenceNode
+
+VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "great", "movie", "terrible", "plot"]
+TEXTS = ["great movie", "terrible plot", "great great movie", "terrible movie plot"] * 4
+LABELS = np.array([int("great" in text) for text in TEXTS])
+
+@pytest.fixture
+def teacher():
+    torch.manual_seed(0)
+    tokenizer = DistilBertTokenizerFast(vocab={token: idx for idx, token in enumerate(VOCAB)})
+    model = DistilBertForSequenceClassification(
+        DistilBertConfig(vocab_size=len(VOCAB), dim=16, hidden_dim=32, n_layers=4, n_heads=2)
+    )
+    return tokenizer, model.eval()
+
+class TestDistillation:
+    def test_student_keeps_evenly_spaced_teacher_layers(self, teacher):
+        _, model = teacher
+
+        student = build_student(model, 2)
+
+        assert student.config.n_layers == 2
+        assert len(model.distilbert.transformer.layer) == 4
+        assert torch.equal(
+            student.distilbert.transformer.layer[1].ffn.lin1.weight,
+            model.distilbert.transformer.layer[3].ffn.lin1.weight
+        )
+        with pytest.raises(ValueError):
+            build_student(model, 4)
+
+    def test_loss_ignores_hard_labels_on_unlabelled_rows(self, teacher):
+        _, model = teacher
+        trainer = DistillationTrainer.__new__(DistillationTrainer)
+        trainer.temperature, trainer.alpha = 2.0, 0.5
+        inputs = {
+            "input_ids": torch.tensor([[2, 5, 6, 3], [2, 7, 8, 3]]),
+            "attention_mask": torch.ones(2, 4, dtype=torch.long),
+            "labels": torch.tensor([-100, -100])
+        }
+        with torch.no_grad():
+            logits = model(input_ids=inputs["input_ids"], attention_mask=inputs["attention_mask"]).logits
+
+        matched = trainer.compute_loss(model, {**inputs, "teacher_logits": logits})
+        labelled = trainer.compute_loss(model, {**inputs, "labels": torch.tensor([1, 0]), "teacher_logits": logits})
+
+        assert matched.item() == pytest.approx(0.0, abs=1e-6)
+        assert labelled.item() > 0
+
+    def test_benchmark_reports_agreement_with_itself(self, teacher):
+        tokenizer, model = teacher
+
+        result = benchmark_student(model, model, tokenizer, TEXTS, LABELS)
+
+        assert result["agreement"] == 1.0
+        assert result["teacher"]["accuracy"] == result["student"]["accuracy"]
+        assert result["student"]["samples_per_second"] > 0
+
+    def test_distill_saves_calibrated_student_and_report(self, teacher, tmp_path, monkeypatch):
+        tokenizer, model = teacher
+        source = tmp_path / "teacher"
+        model.save_pretrained(source)
+        tokenizer.save_pretrained(source)
+        dataset = tmp_path / "reviews.jsonl"
+        dataset.write_text("".join(json.dumps({"text": t, "label": int(l)}) + "\n" for t, l in zip(TEXTS, LABELS)))
+        monkeypatch.setitem(Config.DISTILLATION_CONFIG, "report_file", tmp_path / "report.json")
+        monkeypatch.setitem(Config.DISTILLATION_CONFIG, "num_train_epochs", 1)
+        monkeypatch.setitem(Config.DISTILLATION_CONFIG, "eval_samples", 16)
+        monkeypatch.setattr("src.app.model.distillation.logged_texts", lambda limit: ["plot plot", "movie"])
+        monkeypatch.setattr(Config, "TRAINING_THROUGHPUT_FILE", tmp_path / "throughput.jsonl")
+
+        result = distill(str(source), str(tmp_path / "student"), n_layers=2, dataset_name=str(dataset), max_samples=16)
+
+        assert result["logged_texts"] == 2
+        assert result["train_samples"] == 18
+        assert 0.0 <= result["benchmark"]["agreement"] <= 1.0
+        assert result["calibration"]["calibration_samples"] == 8
+        assert result["calibration"]["held_out_samples"] == 8
+        saved = AutoModelForSequenceClassification.from_pretrained(tmp_path / "student")
+        assert saved.config.n_layers == 2
+        temperature = result["calibration"]["temperature"]
+        assert saved.config.calibrated_temperature == pytest.approx(temperature)
+        assert InferenceNode(str(tmp_path / "student")).temperature == pytest.approx(temperature)
+        assert json.loads((tmp_path / "report.json").read_text())["student_layers"] == 2
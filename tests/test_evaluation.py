@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+import torch
+from unittest.mock import patch
+from transformers import DistilBertConfig, DistilBertForSequenceClassification, DistilBertTokenizerFast
+from src.app.model.evaluation import cached_logits, compute_logits, evaluate_logits, routing_distribution
+
+VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "great", "movie", "terrible", "plot"]
+
+@pytest.fixture
+def tiny_model():
+    torch.manual_seed(0)
+    config = DistilBertConfig(vocab_size=len(VOCAB), dim=16, hidden_dim=32, n_layers=1, n_heads=2)
+    tokenizer = DistilBertTokenizerFast(vocab={token: idx for idx, token in enumerate(VOCAB)})
+    return tokenizer, DistilBertForSequenceClassification(config).eval()
+
+class TestComputeLogits:
+    def test_length_sorted_batches_keep_input_order(self, tiny_model):
+        tokenizer, model = tiny_model
+        texts = ["great movie " * 5, "terrible", "plot " * 9, "great"]
+
+        logits = compute_logits(model, tokenizer, texts, batch_size=2)
+
+        with torch.no_grad():
+            for text, row in zip(texts, logits):
+                expected = model(**tokenizer([text], return_tensors="pt")).logits[0].numpy()
+                assert np.allclose(row, expected, atol=1e-5)
+
+    def test_reuses_cached_logits(self, tiny_model, tmp_path):
+        tokenizer, model = tiny_model
+        model_path = tmp_path / "model"
+        model_path.mkdir()
+        texts, labels = ["great", "terrible"], np.array([1, 0])
+
+        with patch('src.app.model.evaluation.load_eval_model', return_value=(tokenizer, model)) as loader:
+            first = cached_logits(str(model_path), texts, labels, "imdb", "test", cache_dir=tmp_path / "cache")
+            second = cached_logits(str(model_path), texts, labels, "imdb", "test", cache_dir=tmp_path / "cache")
+
+        assert loader.call_count == 1
+        assert not first["cached"] and second["cached"]
+        assert np.allclose(first["logits"], second["logits"])
+
+class TestEvaluateLogits:
+    def test_reports_accuracy_calibration_and_routing(self):
+        rng = np.random.RandomState(0)
+        labels = rng.randint(0, 2, size=400)
+        margin = np.where(rng.rand(400) < 0.8, 1, -1) * 6.0
+        logits = np.stack([-margin, margin], axis=1) * np.where(labels == 1, 1, -1)[:, None]
+
+        metrics = evaluate_logits(logits.astype(np.float32), labels)
+
+        assert metrics["accuracy"] == pytest.approx(0.8, abs=0.05)
+        assert metrics["temperature"] > 1.0
+        assert metrics["ece_after"] < metrics["ece_before"]
+        assert metrics["routing"]["accept"]["share"] == 1.0
+        assert metrics["calibration_samples"] == 200
+
+    def test_routing_distribution_uses_thresholds(self):
+        probs = np.array([[0.9, 0.1], [0.4, 0.6], [0.55, 0.45], [0.2, 0.8]])
+        labels = np.array([0, 0, 0, 1])
+
+        routing = routing_distribution(probs, labels, {"accept": 0.75, "clarify": 0.58})
+
+        assert routing["accept"] == {"share": 0.5, "accuracy": 1.0}
+        assert routing["ask_clarify"] == {"share": 0.25, "accuracy": 0.0}
+        assert routing["escalate"] == {"share": 0.25, "accuracy": 1.0}
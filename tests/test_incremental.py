@@ -0,0 +1,91 @@
+import json
+import numpy as np
+import pytest
+import torch
+from transformers import DistilBertConfig, DistilBertForSequenceClassification, DistilBertTokenizerFast
+from src.app.config import Config
+from src.app.model.incremental import collect_corrections, fallback_rate, incremental_update, load_versions
+from src.app.nodes.inference_node import InferenceNode
+
+VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "great", "movie", "terrible", "plot"]
+TEXTS = ["great movie", "terrible plot", "great great movie", "terrible movie plot"] * 4
+LABEL2ID = {"negative": 0, "positive": 1}
+
+def log_entry(text, label, via, timestamp):
+    return {"timestamp": timestamp, "input_text": text, "final_decision": {"label": label, "via": via}}
+
+@pytest.fixture
+def base_model(tmp_path):
+    torch.manual_seed(0)
+    path = tmp_path / "model"
+    DistilBertTokenizerFast(vocab={token: idx for idx, token in enumerate(VOCAB)}).save_pretrained(path)
+    DistilBertForSequenceClassification(
+        DistilBertConfig(
+            vocab_size=len(VOCAB), dim=16, hidden_dim=32, n_layers=1, n_heads=2,
+            id2label={0: "negative", 1: "positive"}, label2id=LABEL2ID
+        )
+    ).save_pretrained(path)
+    return path
+
+class TestIncrementalUpdate:
+    def test_collects_only_new_fallback_decisions(self):
+        entries = [
+            log_entry("great movie", "positive", "direct_prediction", "2026-01-01T00:00:01"),
+            log_entry("terrible plot", "negative", "backup_model_escalation", "2026-01-01T00:00:02"),
+            log_entry("old plot", "negative", "user_clarification", "2025-12-31T00:00:00"),
+            log_entry("movie", "positive", "user_clarification", "2026-01-01T00:00:03"),
+            log_entry("movie", "negative", "user_confirmed", "2026-01-01T00:00:04")
+        ]
+
+        texts, labels, latest = collect_corrections(entries, LABEL2ID, since="2026-01-01T00:00:00")
+
+        assert texts == ["terrible plot", "movie"]
+        assert labels == [0, 0]
+        assert latest == "2026-01-01T00:00:04"
+
+    def test_fallback_rate_splits_clarify_and_escalate(self):
+        probs = np.array([[0.9, 0.1], [0.4, 0.6], [0.55, 0.45], [0.2, 0.8]])
+
+        rates = fallback_rate(probs, {"accept": 0.75, "clarify": 0.5})
+
+        assert rates == {"fallback_rate": 0.5, "ask_clarify": 0.5, "escalate": 0.0}
+
+    def test_update_writes_versions_and_uses_only_new_corrections(self, base_model, tmp_path, monkeypatch):
+        dataset = tmp_path / "reviews.jsonl"
+        dataset.write_text("".join(json.dumps({"text": t, "label": int("great" in t)}) + "\n" for t in TEXTS))
+        entries = [
+            log_entry(text, "positive" if "great" in text else "negative", "backup_model_escalation", f"2026-01-01T00:00:{i:02d}")
+            for i, text in enumerate(TEXTS[:4])
+        ] + [log_entry(text, "positive", "direct_prediction", f"2026-01-01T00:01:{i:02d}") for i, text in enumerate(["movie", "great plot"])]
+        monkeypatch.setattr("src.app.utils.log_store.iter_log_entries", lambda: iter(entries))
+        monkeypatch.setitem(Config.INCREMENTAL_CONFIG, "versions_dir", tmp_path / "versions")
+        monkeypatch.setitem(Config.INCREMENTAL_CONFIG, "report_file", tmp_path / "report.json")
+        monkeypatch.setitem(Config.INCREMENTAL_CONFIG, "min_corrections", 2)
+        monkeypatch.setitem(Config.INCREMENTAL_CONFIG, "num_train_epochs", 1)
+        monkeypatch.setitem(Config.INCREMENTAL_CONFIG, "eval_samples", 8)
+        monkeypatch.setattr(Config, "CHECKPOINTS_DIR", base_model.parent)
+        monkeypatch.setattr(Config, "TRAINING_THROUGHPUT_FILE", tmp_path / "throughput.jsonl")
+
+        first = incremental_update(dataset_name=str(dataset), replay_ratio=2.0)
+
+        assert first["parent"] == str(base_model)
+        assert first["corrections"] == 4
+        assert first["replay_samples"] == 8
+        assert first["recent_samples"] == 2
+        assert 0.0 <= first["after"]["recent"]["fallback_rate"] <= 1.0
+        assert 0.0 <= first["after"]["heldout_accuracy"] <= 1.0
+        assert InferenceNode(first["path"]).run("great movie")["label"] in ("negative", "positive")
+        assert json.loads((tmp_path / "report.json").read_text())["version"] == first["version"]
+
+        with pytest.raises(ValueError):
+            incremental_update(dataset_name=str(dataset))
+
+        entries += [log_entry(text, "negative", "user_clarification", f"2026-01-02T00:00:{i:02d}") for i, text in enumerate(["plot", "movie plot"])]
+        second = incremental_update(dataset_name=str(dataset), replay_ratio=0)
+
+        assert second["parent"] == first["path"]
+        assert second["corrections"] == 2
+        assert [version["version"] for version in load_versions()] == [first["version"], second["version"]]
+
+        with pytest.raises(ValueError, match="since 2026-01-02T00:00:01"):
+            incremental_update(base_path=second["path"], dataset_name=str(dataset))
@@ -0,0 +1,79 @@
+import json
+import time
+import pytest
+from unittest.mock import MagicMock
+from src.app.utils.loadgen import LoadGenerator, InProcessTarget, load_replay_records
+
+RECORDS = [
+    {"text": "great film", "expected": "positive"},
+    {"text": "terrible film", "expected": "negative"}
+]
+
+def echo_target(text):
+    return {"label": "positive", "decision_via": "direct_prediction"}
+
+class TestReplayRecords:
+    def test_reads_logged_inputs_and_final_decisions(self, tmp_path):
+        path = tmp_path / "app.jsonl"
+        path.write_text("\n".join([
+            json.dumps({"input_text": "great film", "final_decision": {"label": "positive", "via": "direct_prediction"}}),
+            json.dumps({"text": "plain request"}),
+            json.dumps({"input_text": ""})
+        ]))
+        
+        records = load_replay_records(str(path))
+        
+        assert records == [
+            {"text": "great film", "expected": "positive"},
+            {"text": "plain request", "expected": None}
+        ]
+
+class TestLoadGenerator:
+    def test_closed_loop_reports_latency_throughput_and_diffs(self):
+        report = LoadGenerator(echo_target, RECORDS, mode="closed", concurrency=2, num_requests=10).run()
+        
+        assert report["requests"] == 10
+        assert report["errors"] == 0
+        assert report["throughput"] > 0
+        assert report["latency_ms"]["p50"] is not None
+        assert report["decision_diffs"]["compared"] == 10
+        assert report["decision_diffs"]["changed"] == 5
+        assert report["decision_diffs"]["samples"][0]["replayed"] == "positive"
+    
+    def test_open_loop_holds_arrival_rate(self):
+        start = time.perf_counter()
+        report = LoadGenerator(echo_target, RECORDS, mode="fixed", rate=100, num_requests=20).run()
+        
+        assert report["requests"] == 20
+        assert time.perf_counter() - start >= 0.19
+    
+    def test_poisson_arrivals_are_seeded(self):
+        first = LoadGenerator(echo_target, RECORDS, mode="poisson", rate=50, num_requests=5, seed=3)
+        second = LoadGenerator(echo_target, RECORDS, mode="poisson", rate=50, num_requests=5, seed=3)
+        
+        offsets = first._arrival_offsets()
+        assert offsets == second._arrival_offsets()
+        assert offsets[0] == 0.0
+        assert offsets == sorted(offsets)
+    
+    def test_counts_errors(self):
+        def flaky(text):
+            if text.startswith("terrible"):
+                raise RuntimeError("503")
+            return echo_target(text)
+        
+        report = LoadGenerator(flaky, RECORDS, num_requests=4).run()
+        
+        assert report["errors"] == 2
+        assert report["error_rate"] == 0.5
+        assert report["error_samples"] == ["503", "503"]
+    
+    def test_open_loop_needs_rate(self):
+        with pytest.raises(ValueError):
+            LoadGenerator(echo_target, RECORDS, mode="poisson")
+    
+    def test_in_process_target_uses_dag(self):
+        dag = MagicMock()
+        dag.run.return_value = {"final_label": "negative", "decision_via": "backup_model"}
+        
+        assert InProcessTarget(dag)("meh") == {"label": "negative", "decision_via": "backup_model"}
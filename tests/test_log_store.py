@@ -0,0 +1,164 @@
+import gzip
+import json
+import os
+import sqlite3
+import threading
+import pytest
+from src.app.config import Config
+from src.app.logger import StructuredLogger
+from src.app.utils.log_store import CompactLogWriter, iter_compact_entries, iter_log_entries, tail_entries
+
+@pytest.fixture
+def compact_logs(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "LOGS_DIR", tmp_path)
+    monkeypatch.setattr(Config, "LOG_FILE", tmp_path / "app.log")
+    monkeypatch.setattr(Config, "LOG_JSONL_FILE", tmp_path / "app.jsonl")
+    monkeypatch.setattr(Config, "LOG_STORAGE", "compact")
+    monkeypatch.setitem(Config.COMPACT_LOG_CONFIG, "directory", tmp_path / "compact")
+    return tmp_path / "compact"
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def log_sample(logger, text, **kwargs):
+    return logger.log_inference(
+        request_id="req",
+        input_text=text,
+        pred_label="positive",
+        probs={"negative": 0.3, "positive": 0.7},
+        confidence=0.7,
+        confidence_status="MEDIUM",
+        **kwargs
+    )
+
+class TestCompactLogStore:
+    def test_reader_reconstructs_logged_entries(self, compact_logs):
+        logger = StructuredLogger()
+        written = [
+            log_sample(logger, "great movie"),
+            log_sample(
+                logger, "not sure",
+                fallback_activated=True, fallback_strategy="ask_clarify",
+                fallback_question="Did you like it?", user_response="no",
+                final_label="negative", final_decision_via="user_clarification"
+            ),
+            log_sample(logger, "great movie", tasks={"emotion": {"label": "joy", "confidence": 0.9}})
+        ]
+        logger.compact_writer.close()
+
+        assert list(iter_log_entries()) == written
+        assert tail_entries(2) == written[1:]
+        assert not Config.LOG_JSONL_FILE.exists()
+
+    def test_repeated_texts_stored_once(self, compact_logs):
+        writer = CompactLogWriter(compact_logs)
+        logger = StructuredLogger()
+        logger._ensure_configured()
+        logger.compact_writer = writer
+        for _ in range(5):
+            log_sample(logger, "same review text " * 20)
+        writer.close()
+
+        with sqlite3.connect(compact_logs / "texts.db") as conn:
+            assert conn.execute("SELECT COUNT(*) FROM texts").fetchone()[0] == 1
+        segment = next(compact_logs.glob("segment-*.jsonl.gz"))
+        with gzip.open(segment, "rt") as f:
+            lines = [json.loads(line) for line in f]
+        assert lines[0]["header"]["thresholds"] == {
+            "accept": Config.CONFIDENCE_THRESHOLDS["accept"],
+            "clarify": Config.CONFIDENCE_THRESHOLDS["clarify"]
+        }
+        assert all("input_text" not in line and "f" not in line for line in lines[1:])
+
+    def test_rotation_and_retention(self, compact_logs, monkeypatch):
+        logger = StructuredLogger()
+        logger._ensure_configured()
+        logger.compact_writer = CompactLogWriter(compact_logs, max_segment_entries=2, max_segments=2)
+        for i in range(7):
+            log_sample(logger, f"review {i}")
+        logger.compact_writer.close()
+
+        assert len(list(compact_logs.glob("segment-*.jsonl.gz"))) == 2
+        assert [entry["input_text"] for entry in iter_compact_entries(compact_logs)] == [
+            "review 4", "review 5", "review 6"
+        ]
+        assert logger.compact_writer.prune_texts() == 0
+        assert logger.compact_writer.prune_texts(grace_seconds=0) == 4
+
+    def test_retention_prunes_stale_texts(self, compact_logs):
+        clock = FakeClock()
+        writer = CompactLogWriter(compact_logs, max_segment_entries=2, max_segments=1, clock=clock)
+        logger = StructuredLogger()
+        logger._ensure_configured()
+        logger.compact_writer = writer
+        for i in range(4):
+            log_sample(logger, f"old review {i}")
+        clock.now += 2 * writer.known_text_ttl + writer.flush_seconds + 1
+        for i in range(3):
+            log_sample(logger, f"new review {i}")
+        writer.close()
+
+        with sqlite3.connect(compact_logs / "texts.db") as conn:
+            stored = conn.execute("SELECT COUNT(*) FROM texts").fetchone()[0]
+        assert stored == 3
+        assert [entry["input_text"] for entry in iter_compact_entries(compact_logs)] == ["new review 2"]
+
+    def test_text_pruning_runs_off_the_request_thread(self, compact_logs, monkeypatch):
+        writer = CompactLogWriter(compact_logs, max_segment_entries=1, max_segments=1)
+        logger = StructuredLogger()
+        logger._ensure_configured()
+        logger.compact_writer = writer
+        threads = []
+        monkeypatch.setattr(writer, "prune_texts", lambda: threads.append(threading.current_thread().name))
+        for i in range(3):
+            log_sample(logger, f"review {i}")
+        writer.close()
+
+        assert threads and set(threads) == {"log-text-prune"}
+
+    def test_retention_keeps_segments_of_live_workers(self, compact_logs):
+        compact_logs.mkdir(parents=True)
+        live = compact_logs / f"segment-20000101000000-{os.getppid()}-0001.jsonl.gz"
+        dead = compact_logs / "segment-20000101000000-99999999-0001.jsonl.gz"
+        for path in (live, dead):
+            with gzip.open(path, "wt") as f:
+                f.write(json.dumps({"header": {"thresholds": {}, "labels": []}}) + "\n")
+        writer = CompactLogWriter(compact_logs, max_segment_entries=1, max_segments=1)
+        logger = StructuredLogger()
+        logger._ensure_configured()
+        logger.compact_writer = writer
+        for i in range(3):
+            log_sample(logger, f"review {i}")
+        writer.close()
+
+        assert live.exists()
+        assert not dead.exists()
+        assert len(list(compact_logs.glob(f"segment-*-{os.getpid()}-*.jsonl.gz"))) == 1
+
+    def test_segments_are_flushed_in_batches(self, compact_logs, monkeypatch):
+        monkeypatch.setitem(Config.COMPACT_LOG_CONFIG, "flush_entries", 2)
+        writer = CompactLogWriter(compact_logs, clock=FakeClock())
+        logger = StructuredLogger()
+        logger._ensure_configured()
+        logger.compact_writer = writer
+        for i in range(3):
+            log_sample(logger, f"review {i}")
+
+        assert len(list(iter_compact_entries(compact_logs))) == 2
+        writer.close()
+        assert len(list(iter_compact_entries(compact_logs))) == 3
+
+    def test_threshold_change_starts_new_segment(self, compact_logs, monkeypatch):
+        logger = StructuredLogger()
+        log_sample(logger, "first")
+        monkeypatch.setitem(Config.CONFIDENCE_THRESHOLDS, "accept", 0.9)
+        log_sample(logger, "second")
+        logger.compact_writer.close()
+
+        entries = list(iter_compact_entries(compact_logs))
+        assert len(list(compact_logs.glob("segment-*.jsonl.gz"))) == 2
+        assert entries[1]["confidence_check"]["threshold_accept"] == 0.9
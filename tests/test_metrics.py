@@ -0,0 +1,123 @@
+import pytest
+from src.app.utils.metrics import ConfidenceSketch, StreamingMetrics
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+    
+    def __call__(self):
+        return self.now
+
+def make_metrics(clock, **drift):
+    return StreamingMetrics(
+        windows={"1m": 60, "10m": 600},
+        bucket_seconds=10,
+        drift={"window": "1m", "baseline_window": "10m", "min_samples": 10, "cooldown_seconds": 300, **drift},
+        clock=clock
+    )
+
+class TestConfidenceSketch:
+    def test_quantiles_are_within_bin_width(self):
+        sketch = ConfidenceSketch(bins=100)
+        for i in range(1000):
+            sketch.add(i / 1000)
+        
+        assert sketch.total == 1000
+        assert sketch.quantile(0.5) == pytest.approx(0.5, abs=0.01)
+        assert sketch.quantile(0.95) == pytest.approx(0.95, abs=0.01)
+        sketch.add(1.0)
+        assert sketch.counts[-1] > 0
+    
+    def test_empty_sketch_has_no_quantiles(self):
+        assert ConfidenceSketch().quantile(0.5) is None
+
+class TestStreamingMetrics:
+    def test_rolling_windows_expire_old_buckets(self):
+        clock = FakeClock()
+        metrics = make_metrics(clock)
+        for _ in range(5):
+            metrics.observe(0.9, "HIGH", "direct_prediction")
+        clock.now += 120
+        metrics.observe(0.4, "LOW", "backup_model")
+        
+        windows = metrics.snapshot()["windows"]
+        assert windows["1m"]["count"] == 1
+        assert windows["1m"]["status"] == {"LOW": 1}
+        assert windows["10m"]["count"] == 6
+        assert windows["10m"]["decision_via"] == {"direct_prediction": 5, "backup_model": 1}
+        assert windows["10m"]["fallback_rate"] == pytest.approx(1 / 6)
+    
+    def test_memory_is_bounded_by_longest_window(self):
+        clock = FakeClock()
+        metrics = make_metrics(clock)
+        for _ in range(500):
+            metrics.observe(0.9, "HIGH", "direct_prediction")
+            clock.now += 10
+        
+        assert len(metrics._buckets) == 61
+    
+    def test_alerts_when_fallback_rate_leaves_fixed_band(self, caplog):
+        clock = FakeClock()
+        metrics = make_metrics(clock, lower=0.0, upper=0.3)
+        for _ in range(10):
+            metrics.observe(0.9, "HIGH", "direct_prediction")
+        assert not metrics.alerts
+        
+        for _ in range(10):
+            metrics.observe(0.3, "LOW", "backup_model")
+        
+        assert len(metrics.alerts) == 1
+        assert metrics.alerts[0]["rate"] > 0.3
+        assert "Fallback rate drift" in caplog.text
+    
+    def test_alerts_respect_cooldown(self):
+        clock = FakeClock()
+        metrics = make_metrics(clock, lower=0.0, upper=0.1)
+        for _ in range(30):
+            metrics.observe(0.3, "LOW", "backup_model")
+        assert len(metrics.alerts) == 1
+        
+        clock.now += 301
+        for _ in range(10):
+            metrics.observe(0.3, "LOW", "backup_model")
+        assert len(metrics.alerts) == 2
+    
+    def test_band_follows_baseline_window(self):
+        clock = FakeClock()
+        metrics = make_metrics(clock, tolerance=0.1)
+        for _ in range(40):
+            metrics.observe(0.9, "HIGH", "direct_prediction")
+        clock.now += 120
+        for _ in range(20):
+            metrics.observe(0.6, "MEDIUM", "clarification")
+        
+        assert metrics.alerts
+        assert metrics.alerts[0]["rate"] == 1.0
+        assert metrics.snapshot()["drift_band"] == pytest.approx([0.0, 0.1])
+    
+    def test_observe_uses_running_totals_instead_of_merging_buckets(self, monkeypatch):
+        clock = FakeClock()
+        metrics = make_metrics(clock, tolerance=0.1)
+        monkeypatch.setattr(metrics, "_aggregate", lambda *args: pytest.fail("observe merged sketches"))
+        for i in range(300):
+            metrics.observe(0.9 if i < 200 else 0.3, "HIGH" if i < 200 else "LOW", "direct_prediction")
+            clock.now += 1
+        
+        assert metrics.alerts
+        monkeypatch.undo()
+        window = metrics._aggregate(60, metrics._buckets[-1].start)
+        assert metrics._window_totals[0] + metrics._buckets[-1].drift_count == window["sketch"].total
+    
+    def test_cached_and_degraded_decisions_do_not_feed_drift(self):
+        clock = FakeClock()
+        metrics = make_metrics(clock, lower=0.0, upper=0.3)
+        for _ in range(10):
+            metrics.observe(0.9, "HIGH", "direct_prediction")
+        for via in ("near_duplicate", "degraded"):
+            for _ in range(20):
+                metrics.observe(0.3, "LOW", via)
+        
+        assert not metrics.alerts
+        window = metrics.snapshot()["windows"]["1m"]
+        assert window["decision_via"] == {"direct_prediction": 10, "near_duplicate": 20, "degraded": 20}
+        assert window["count"] == 50
@@ -0,0 +1,164 @@
+import json
+import os
+import threading
+import time
+import pytest
+import torch
+from src.app.model.manager import ModelManager, estimate_size, model_manager
+from transformers import DistilBertConfig, DistilBertForSequenceClassification, DistilBertTokenizerFast
+from src.app.nodes.fallback_node import FallbackNode
+from src.app.nodes.inference_node import InferenceNode
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+def make_model(params):
+    return torch.nn.Linear(params, 1, bias=False)
+
+class TestModelManager:
+    def test_estimates_resident_size_of_modules_and_pipelines(self):
+        model = make_model(256)
+        pipeline = type("Pipeline", (), {"model": model})()
+        
+        assert estimate_size(model) == 256 * 4
+        assert estimate_size(pipeline) == 256 * 4
+        assert estimate_size(lambda text: text) == 0
+    
+    def test_loads_once_under_concurrency(self):
+        calls = []
+        def loader():
+            calls.append(1)
+            time.sleep(0.05)
+            return make_model(8)
+        
+        manager = ModelManager(budget_bytes=None, idle_ttl=0)
+        manager.register("zero_shot", loader)
+        threads = [threading.Thread(target=manager.get, args=("zero_shot",)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(calls) == 1
+        assert manager.stats()["models"]["zero_shot"]["loads"] == 1
+    
+    def test_evicts_idle_models_and_reloads_on_demand(self):
+        clock = FakeClock()
+        manager = ModelManager(budget_bytes=None, idle_ttl=60, clock=clock)
+        manager.register("zero_shot", lambda: make_model(16))
+        manager.put("primary", make_model(16), pinned=True)
+        manager.get("zero_shot")
+        
+        clock.now += 61
+        assert manager.evict_idle() == 1
+        assert not manager.is_loaded("zero_shot")
+        assert manager.is_loaded("primary")
+        
+        manager.get("zero_shot")
+        stats = manager.stats()["models"]["zero_shot"]
+        assert stats == {**stats, "loaded": True, "loads": 2, "evictions": 1}
+    
+    def test_budget_evicts_least_recently_used(self):
+        clock = FakeClock()
+        manager = ModelManager(budget_bytes=100 * 4, idle_ttl=0, clock=clock)
+        manager.register("a", lambda: make_model(60))
+        manager.register("b", lambda: make_model(60))
+        
+        manager.get("a")
+        clock.now += 1
+        manager.get("b")
+        
+        assert not manager.is_loaded("a")
+        assert manager.is_loaded("b")
+        assert manager.resident_bytes() == 60 * 4
+    
+    def test_models_in_use_are_not_evicted(self):
+        clock = FakeClock()
+        manager = ModelManager(budget_bytes=None, idle_ttl=1, clock=clock)
+        manager.register("zero_shot", lambda: make_model(4))
+        
+        with manager.use("zero_shot"):
+            clock.now += 10
+            assert manager.evict_idle() == 0
+        assert manager.is_loaded("zero_shot")
+    
+    def test_reaper_starts_on_first_use_in_each_process(self, tmp_path):
+        manager = ModelManager(budget_bytes=None, idle_ttl=60)
+        manager.register("zero_shot", lambda: make_model(4))
+        assert manager._reaper is None
+        
+        manager.get("zero_shot")
+        parent_reaper = manager._reaper
+        assert parent_reaper.is_alive()
+        
+        pid = os.fork()
+        if pid == 0:
+            manager.get("zero_shot")
+            child = {"restarted": manager._reaper is not parent_reaper, "alive": manager._reaper.is_alive()}
+            (tmp_path / "child").write_text(json.dumps(child))
+            os._exit(0)
+        os.waitpid(pid, 0)
+        
+        assert json.loads((tmp_path / "child").read_text()) == {"restarted": True, "alive": True}
+        assert manager._reaper is parent_reaper
+    
+    def test_models_inherited_from_parent_survive_idle_eviction_in_child(self, tmp_path):
+        clock = FakeClock()
+        manager = ModelManager(budget_bytes=None, idle_ttl=60, clock=clock)
+        manager.register("zero_shot", lambda: make_model(4))
+        manager.get("zero_shot")
+        clock.now += 120
+        
+        pid = os.fork()
+        if pid == 0:
+            evicted = manager.evict_idle()
+            manager.register("child_only", lambda: make_model(4))
+            manager.get("child_only")
+            clock.now += 120
+            child = {"evicted": evicted, "inherited": manager.is_loaded("zero_shot"), "own": manager.evict_idle()}
+            (tmp_path / "child").write_text(json.dumps(child))
+            os._exit(0)
+        os.waitpid(pid, 0)
+        
+        assert json.loads((tmp_path / "child").read_text()) == {"evicted": 0, "inherited": True, "own": 1}
+        assert manager.evict_idle() == 1
+    
+    def test_unknown_model_raises(self):
+        with pytest.raises(KeyError):
+            ModelManager().get("missing")
+
+class TestFallbackNodeManagedZeroShot:
+    def test_zero_shot_pipeline_is_loaded_through_manager(self):
+        manager = ModelManager(budget_bytes=None, idle_ttl=0)
+        node = FallbackNode(model_manager=manager)
+        node._load_zero_shot = lambda: (lambda text, candidate_labels, multi_label=False: {
+            "labels": ["negative", "positive"], "scores": [0.9, 0.1]
+        })
+        manager.register(node.zero_shot_key, node._load_zero_shot)
+        
+        result = node._classify_zero_shot("Confusing movie")
+        
+        assert result["labels"][0] == "negative"
+        assert manager.is_loaded(node.zero_shot_key)
+        assert manager.evict(node.zero_shot_key)
+        node._classify_zero_shot("Another movie")
+        assert manager.stats()["models"][node.zero_shot_key]["loads"] == 2
+
+class TestInferenceNodeRegistration:
+    def test_only_nodes_given_a_manager_are_pinned(self, tmp_path):
+        vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "great", "movie"]
+        DistilBertTokenizerFast(vocab={token: idx for idx, token in enumerate(vocab)}).save_pretrained(tmp_path)
+        DistilBertForSequenceClassification(
+            DistilBertConfig(vocab_size=len(vocab), dim=16, hidden_dim=32, n_layers=1, n_heads=2)
+        ).save_pretrained(tmp_path)
+        manager = ModelManager(budget_bytes=None, idle_ttl=0)
+        
+        InferenceNode(str(tmp_path))
+        assert f"primary:{tmp_path}" not in model_manager.stats()["models"]
+        
+        InferenceNode(str(tmp_path), model_manager=manager)
+        assert manager.stats()["models"][f"primary:{tmp_path}"]["pinned"] is True
@@ -0,0 +1,117 @@
+import pytest
+import torch
+from unittest.mock import patch
+from transformers import DistilBertConfig, DistilBertForSequenceClassification, DistilBertTokenizerFast
+from src.app.dag import SelfHealingDAG
+from src.app.model.manager import ModelManager
+from src.app.model.multitask import load_multitask
+from src.app.nodes.multitask_node import MultiTaskInferenceNode, parse_task_spec
+
+VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "great", "movie", "terrible", "plot"]
+EMOTIONS = {0: "joy", 1: "anger", 2: "sadness", 3: "surprise"}
+
+def save_checkpoint(path, model, vocab_file):
+    model.save_pretrained(path)
+    DistilBertTokenizerFast(vocab_file=str(vocab_file)).save_pretrained(path)
+    return str(path)
+
+@pytest.fixture
+def task_dirs(tmp_path):
+    torch.manual_seed(0)
+    vocab_file = tmp_path / "vocab.txt"
+    vocab_file.write_text("\n".join(VOCAB))
+    base = dict(vocab_size=len(VOCAB), dim=16, hidden_dim=32, n_layers=1, n_heads=2)
+
+    sentiment = DistilBertForSequenceClassification(DistilBertConfig(
+        **base, id2label={0: "negative", 1: "positive"}, label2id={"negative": 0, "positive": 1}
+    ))
+    emotion = DistilBertForSequenceClassification(DistilBertConfig(
+        **base, id2label=EMOTIONS, label2id={v: k for k, v in EMOTIONS.items()}
+    ))
+    emotion.distilbert.load_state_dict(sentiment.distilbert.state_dict())
+    topic = DistilBertForSequenceClassification(DistilBertConfig(**base, num_labels=3))
+
+    return {
+        "sentiment": save_checkpoint(tmp_path / "sentiment", sentiment, vocab_file),
+        "emotion": save_checkpoint(tmp_path / "emotion", emotion, vocab_file),
+        "topic": save_checkpoint(tmp_path / "topic", topic, vocab_file),
+        "models": {"sentiment": sentiment.eval(), "emotion": emotion.eval()}
+    }
+
+class TestMultiTaskModel:
+    def test_shared_encoder_matches_separate_models(self, task_dirs):
+        tokenizer, model, label_maps = load_multitask({
+            "sentiment": task_dirs["sentiment"], "emotion": task_dirs["emotion"]
+        })
+        inputs = tokenizer(["great movie", "terrible plot"], return_tensors="pt", padding=True)
+
+        with torch.no_grad():
+            logits = model(**inputs)
+            for task in ("sentiment", "emotion"):
+                expected = task_dirs["models"][task](**inputs).logits
+                assert torch.allclose(logits[task], expected, atol=1e-5)
+
+        assert len(model.encoders) == 1
+        assert label_maps["emotion"] == EMOTIONS
+
+    def test_tasks_with_their_own_encoder_get_a_separate_pass(self, task_dirs):
+        _, model, label_maps = load_multitask({
+            "sentiment": task_dirs["sentiment"], "topic": task_dirs["topic"]
+        })
+
+        assert model.task_groups == [["sentiment"], ["topic"]]
+        assert label_maps["topic"] == {0: "LABEL_0", 1: "LABEL_1", 2: "LABEL_2"}
+
+    def test_node_returns_primary_fields_and_all_tasks(self, task_dirs):
+        node = MultiTaskInferenceNode({"sentiment": task_dirs["sentiment"], "emotion": task_dirs["emotion"]})
+
+        result = node.run("great movie")
+
+        assert result["label"] in ("negative", "positive")
+        assert set(result["tasks"]) == {"sentiment", "emotion"}
+        assert set(result["tasks"]["emotion"]["probs"]) == set(EMOTIONS.values())
+        assert result["tasks"]["sentiment"]["label"] == result["label"]
+
+    def test_node_uses_each_checkpoints_calibrated_temperature(self, task_dirs, tmp_path):
+        emotion = task_dirs["models"]["emotion"]
+        emotion.config.calibrated_temperature = 2.5
+        calibrated = save_checkpoint(tmp_path / "calibrated", emotion, tmp_path / "vocab.txt")
+        manager = ModelManager(budget_bytes=None, idle_ttl=0)
+
+        node = MultiTaskInferenceNode({"sentiment": task_dirs["sentiment"], "emotion": calibrated}, model_manager=manager)
+
+        assert node.temperatures == {"sentiment": 1.0, "emotion": 2.5}
+        assert manager.is_loaded("multitask:sentiment,emotion")
+
+    def test_parses_task_specs(self):
+        assert parse_task_spec("emotion=checkpoints/emotion, topic=ckpt/topic") == {
+            "emotion": "checkpoints/emotion", "topic": "ckpt/topic"
+        }
+        with pytest.raises(ValueError):
+            parse_task_spec("emotion")
+
+class TestDAGMultiTaskRouting:
+    @patch('src.app.dag.FinalDecisionNode')
+    def test_secondary_tasks_route_through_their_own_fallback(self, mock_final, task_dirs):
+        mock_final.return_value.run.side_effect = lambda state: {
+            "request_id": "req",
+            "final_label": state.get("final_label", state["label"]),
+            "decision_via": state.get("final_decision_via", "direct_prediction")
+        }
+        dag = SelfHealingDAG(
+            model_path=task_dirs["sentiment"], interactive=False, tasks={"emotion": task_dirs["emotion"]},
+            model_manager=ModelManager(budget_bytes=None, idle_ttl=0)
+        )
+        _, emotion_fallback = dag.task_routes["emotion"]
+        emotion_fallback.zero_shot_pipeline = lambda text, candidate_labels, multi_label=False: {
+            "labels": ["surprise"] + [l for l in candidate_labels if l != "surprise"],
+            "scores": [0.7, 0.1, 0.1, 0.1]
+        }
+
+        result = dag.run("great movie")
+
+        emotion = result["tasks"]["emotion"]
+        assert emotion["status"] in ("MEDIUM", "LOW")
+        assert emotion["final_label"] == "surprise"
+        assert emotion["decision_via"].startswith("backup_model")
+        assert result["tasks"]["sentiment"]["decision_via"] == result["decision_via"]
@@ -0,0 +1,89 @@
+import pytest
+from unittest.mock import patch
+from src.app.dag import SelfHealingDAG
+from src.app.utils.near_duplicate import NearDuplicateIndex, normalize_text
+
+DECISION = {
+    "label": "positive",
+    "probs": {"positive": 0.91, "negative": 0.09},
+    "confidence": 0.91,
+    "status": "HIGH",
+    "final_label": "positive",
+    "final_decision_via": "direct_prediction"
+}
+
+class TestNearDuplicateIndex:
+    def test_normalizes_case_punctuation_and_whitespace(self):
+        assert normalize_text("  GREAT   movie!!!\n") == "great movie"
+    
+    def test_finds_reposts_and_ignores_unrelated_texts(self):
+        index = NearDuplicateIndex(threshold=0.8)
+        index.add("This movie was absolutely fantastic, I loved every minute of it!", DECISION)
+        
+        match = index.lookup("this movie was absolutely fantastic - i loved every minute of it")
+        
+        assert match is not None
+        assert match[0]["final_label"] == "positive"
+        assert match[1] >= 0.8
+        assert index.lookup("Dull plot and wooden acting, would not recommend.") is None
+        assert index.stats()["inference_avoided"] == 1
+    
+    def test_evicts_least_recently_used_entries(self):
+        index = NearDuplicateIndex(max_entries=2)
+        index.add("first review about a long boring film", DECISION)
+        index.add("second review about a wonderful comedy", DECISION)
+        index.lookup("first review about a long boring film")
+        index.add("third review about a forgettable sequel", DECISION)
+        
+        assert index.stats()["entries"] == 2
+        assert index.stats()["evictions"] == 1
+        assert index.lookup("first review about a long boring film") is not None
+        assert index.lookup("second review about a wonderful comedy") is None
+    
+    def test_rejects_uneven_bands(self):
+        with pytest.raises(ValueError):
+            NearDuplicateIndex(num_perm=10, bands=3)
+
+class TestDAGNearDuplicate:
+    @patch('src.app.dag.InferenceNode')
+    @patch('src.app.dag.FinalDecisionNode')
+    def test_reuses_decision_for_near_duplicate(self, mock_final, mock_inference):
+        mock_inference.return_value.run.side_effect = lambda text: {**DECISION, "label_idx": 1, "text": text}
+        mock_final.return_value.run.side_effect = lambda state: {
+            "request_id": "req",
+            "final_label": state.get("final_label", state["label"]),
+            "decision_via": state.get("final_decision_via", "direct_prediction")
+        }
+        
+        dag = SelfHealingDAG(model_path="fake-path", interactive=False, near_duplicate=True)
+        first = dag.run("Loved it, what a brilliant and moving film!")
+        second = dag.run("loved it -- what a brilliant and moving film")
+        
+        assert first["decision_via"] == "direct_prediction"
+        assert second["decision_via"] == "near_duplicate"
+        assert second["final_label"] == "positive"
+        assert mock_inference.return_value.run.call_count == 1
+        assert mock_final.return_value.run.call_count == 2
+        assert dag.get_stats()["near_duplicate"]["hits"] == 1
+    
+    @patch('src.app.dag.InferenceNode')
+    @patch('src.app.dag.FinalDecisionNode')
+    def test_degraded_decisions_are_flagged_only_when_skipped_and_not_reused(self, mock_final, mock_inference):
+        low = {"label": "positive", "probs": {"positive": 0.4, "negative": 0.6}, "confidence": 0.4, "status": "LOW"}
+        mock_inference.return_value.run.side_effect = lambda text: {
+            **(DECISION if "brilliant" in text else low), "label_idx": 1, "text": text
+        }
+        mock_final.return_value.run.side_effect = lambda state: {
+            "request_id": "req",
+            "final_label": state.get("final_label", state["label"]),
+            "decision_via": state.get("final_decision_via", "direct_prediction")
+        }
+        
+        dag = SelfHealingDAG(model_path="fake-path", interactive=False, near_duplicate=True, single_flight=False)
+        accepted = dag.run("Loved it, what a brilliant and moving film!", degraded=True)
+        skipped = dag.run("Not sure what to make of this long strange film", degraded=True)
+        
+        assert accepted["degraded"] is False
+        assert skipped["degraded"] is True
+        assert skipped["decision_via"] == "degraded"
+        assert dag.near_duplicate_index.lookup("Not sure what to make of this long strange film") is None
@@ -1,6 +1,9 @@
 import pytest
+import time
 import torch
 from unittest.mock import Mock, MagicMock, patch
+from src.app.config import Config
+from src.app.model.manager import ModelManager
 from src.app.nodes.inference_node import InferenceNode
 from src.app.nodes.confidence_node import ConfidenceCheckNode
 from src.app.nodes.fallback_node import FallbackNode
@@ -117,6 +120,75 @@ class TestFallbackNode:
         assert result["final_label"] == "positive"
         assert result["final_decision_via"] == "user_confirmed"
 
+class TestFallbackDeadline:
+    def _escalation(self, deadline):
+        return {
+            "action": "escalate",
+            "text": "Confusing movie",
+            "label": "positive",
+            "confidence": 0.45,
+            "status": "LOW",
+            "probs": {"positive": 0.45, "negative": 0.55},
+            "deadline": deadline
+        }
+    
+    def _slow_pipeline(self, delay):
+        def zero_shot(text, candidate_labels, multi_label=False):
+            time.sleep(delay)
+            return {"labels": ["negative", "positive"], "scores": [0.8, 0.2]}
+        return zero_shot
+    
+    def test_returns_primary_prediction_when_budget_exceeded(self):
+        node = FallbackNode(model_manager=ModelManager(budget_bytes=None, idle_ttl=0))
+        node.zero_shot_pipeline = self._slow_pipeline(0.3)
+        
+        result = node.run(self._escalation(time.monotonic() + 0.05), interactive=False)
+        
+        assert result["deadline_fallback"] is True
+        assert result["final_label"] == "positive"
+        assert result["final_decision_via"] == "deadline_fallback"
+        
+        node._submit_zero_shot("Confusing movie").result(timeout=5)
+        cached = node.run(self._escalation(time.monotonic() + 0.05), interactive=False)
+        
+        assert cached["final_label"] == "negative"
+        assert cached["final_decision_via"] == "backup_model_escalation"
+        assert node.stats["zero_shot_cache_hits"] == 1
+    
+    def test_waits_for_backup_within_budget(self):
+        node = FallbackNode(model_manager=ModelManager(budget_bytes=None, idle_ttl=0))
+        node.zero_shot_pipeline = self._slow_pipeline(0.01)
+        
+        result = node.run(self._escalation(time.monotonic() + 5), interactive=False)
+        
+        assert "deadline_fallback" not in result
+        assert result["final_label"] == "negative"
+    
+    def test_background_backlog_is_bounded(self, monkeypatch):
+        monkeypatch.setitem(Config.DEADLINE_CONFIG, "max_background_jobs", 1)
+        node = FallbackNode(model_manager=ModelManager(budget_bytes=None, idle_ttl=0))
+        node.zero_shot_pipeline = self._slow_pipeline(0.2)
+        
+        first = node._submit_zero_shot("first text")
+        
+        assert node._submit_zero_shot("first text") is first
+        assert node._submit_zero_shot("second text") is None
+        assert node.stats["background_dropped"] == 1
+        result = node.run({**self._escalation(time.monotonic() + 5), "text": "third text"}, interactive=False)
+        assert result["final_decision_via"] == "deadline_fallback"
+        first.result(timeout=5)
+    
+    def test_degraded_request_skips_zero_shot(self):
+        node = FallbackNode(model_manager=ModelManager(budget_bytes=None, idle_ttl=0))
+        node.zero_shot_pipeline = Mock()
+        
+        result = node.run({**self._escalation(None), "degraded": True}, interactive=False)
+        
+        node.zero_shot_pipeline.assert_not_called()
+        assert result["final_label"] == "positive"
+        assert result["final_decision_via"] == "degraded"
+        assert node.stats["degraded"] == 1
+
 class TestFinalDecisionNode:
     @patch('src.app.nodes.final_decision_node.logger_instance')
     def test_final_decision_logging(self, mock_logger):
@@ -141,3 +213,15 @@ class TestFinalDecisionNode:
         assert "final_label" in result
         assert result["final_label"] == "positive"
         mock_logger.log_inference.assert_called_once()
+    
+    @patch('src.app.nodes.final_decision_node.metrics_instance')
+    @patch('src.app.nodes.final_decision_node.logger_instance')
+    def test_unlogged_decisions_skip_log_and_metrics(self, mock_logger, mock_metrics):
+        node = FinalDecisionNode(log_requests=False)
+        
+        result = node.run({"text": "Test movie", "label": "positive", "probs": {"positive": 0.85, "negative": 0.15}, "confidence": 0.85, "status": "HIGH"})
+        
+        assert result["final_label"] == "positive"
+        assert result["decision_via"] == "direct_prediction"
+        mock_logger.log_inference.assert_not_called()
+        mock_metrics.observe.assert_not_called()
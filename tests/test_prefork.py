@@ -0,0 +1,49 @@
+import os
+from src.app.config import Config
+from src.app.prefork import PreforkServer, partition_threads
+from src.app.utils.tuning import save_profile
+
+class TestPartitionThreads:
+    def test_splits_cores_between_workers(self):
+        assert partition_threads(4, total_cores=16) == 4
+        assert partition_threads(3, total_cores=8) == 2
+
+    def test_always_at_least_one_thread(self):
+        assert partition_threads(8, total_cores=2) == 1
+
+class TestPreforkServer:
+    def test_tuned_threads_only_apply_to_matching_worker_count(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(Config, "TUNING_PROFILE_FILE", tmp_path / "profile.json")
+        monkeypatch.setitem(Config.SERVING_CONFIG, "threads_per_worker", None)
+        save_profile({"threads": 3, "batch_size": 8, "workers": 2, "throughput": 1.0, "p50_ms": 1.0, "p95_ms": 2.0})
+
+        assert PreforkServer(app=None, workers=2).threads_per_worker == 3
+        assert PreforkServer(app=None, workers=4).threads_per_worker == partition_threads(4)
+
+    def test_preloads_once_and_restarts_crashed_workers(self, tmp_path):
+        spawn_log = tmp_path / "spawns"
+        preload_calls = []
+
+        def crashing_serve(worker_id):
+            with open(spawn_log, "a") as f:
+                f.write(f"{worker_id}:{os.getpid()}\n")
+            raise RuntimeError("worker crashed")
+
+        server = PreforkServer(
+            app=None,
+            preload=lambda: preload_calls.append(os.getpid()),
+            workers=2,
+            threads_per_worker=1,
+            host="127.0.0.1",
+            port=0,
+            serve=crashing_serve
+        )
+        server.restart_backoff = 0
+        server.max_restarts_per_minute = 3
+        server.run()
+
+        spawns = spawn_log.read_text().splitlines()
+        assert preload_calls == [os.getpid()]
+        assert len(server.restarts) == 3
+        assert {line.split(":")[1] for line in spawns}.isdisjoint({str(os.getpid())})
+        assert server.children == {}
@@ -0,0 +1,84 @@
+import pytest
+from transformers import DistilBertTokenizerFast
+from src.app.nodes.inference_node import encode_batch
+from src.app.nodes.progressive import ProgressiveInference
+
+VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "great", "movie", "terrible", "plot", "but", "ending"]
+
+@pytest.fixture
+def tokenizer():
+    return DistilBertTokenizerFast(vocab={token: idx for idx, token in enumerate(VOCAB)})
+
+class FakeNode:
+    def __init__(self, tokenizer, short_confidence):
+        self.tokenizer = tokenizer
+        self.short_confidence = short_confidence
+        self.calls = []
+
+    def run_batch(self, texts, max_length=512, head_tail=False):
+        self.calls.append((len(texts), max_length, head_tail))
+        short = max_length < 512
+        return [
+            {
+                "text": text,
+                "label": "positive" if short else "negative",
+                "confidence": self.short_confidence if short else 0.95
+            }
+            for text in texts
+        ]
+
+def accept(result):
+    return result["confidence"] >= 0.75
+
+class TestHeadTailEncoding:
+    def test_keeps_head_and_tail_tokens(self, tokenizer):
+        text = "great " + "plot " * 20 + "terrible ending"
+
+        encoded = encode_batch(tokenizer, [text], max_length=10, head_tail=True)
+        tokens = tokenizer.convert_ids_to_tokens(encoded["input_ids"][0])
+
+        assert len(tokens) == 10
+        assert tokens[:3] == ["[CLS]", "great", "plot"]
+        assert tokens[-3:] == ["terrible", "ending", "[SEP]"]
+
+    def test_pads_mixed_lengths(self, tokenizer):
+        encoded = encode_batch(tokenizer, ["great movie", "plot " * 30], max_length=8, head_tail=True)
+
+        assert encoded["input_ids"].shape == (2, 8)
+        assert encoded["attention_mask"][0].sum() == 4
+
+class TestProgressiveInference:
+    def test_short_texts_never_rerun(self, tokenizer):
+        node = FakeNode(tokenizer, short_confidence=0.4)
+        progressive = ProgressiveInference(node, short_length=16, audit_rate=0.0)
+
+        results = progressive.run_batch(["great movie"], accept)
+
+        assert results[0]["inference_pass"] == "short"
+        assert node.calls == [(1, 16, True)]
+        assert progressive.stats()["truncated"] == 0
+
+    def test_reruns_unconfident_truncated_texts_at_full_length(self, tokenizer):
+        node = FakeNode(tokenizer, short_confidence=0.6)
+        progressive = ProgressiveInference(node, short_length=16, audit_rate=0.0)
+
+        results = progressive.run_batch(["great movie", "plot " * 40], accept)
+
+        assert [r["inference_pass"] for r in results] == ["short", "full"]
+        assert results[1]["label"] == "negative"
+        assert node.calls == [(2, 16, True), (1, 512, False)]
+        stats = progressive.stats()
+        assert stats["long_passes"] == 1
+        assert stats["long_pass_rate"] == 0.5
+
+    def test_audits_measure_agreement_with_full_length(self, tokenizer):
+        node = FakeNode(tokenizer, short_confidence=0.9)
+        progressive = ProgressiveInference(node, short_length=16, audit_rate=1.0)
+
+        results = progressive.run_batch(["plot " * 40, "movie " * 40], accept)
+
+        assert [r["inference_pass"] for r in results] == ["short", "short"]
+        stats = progressive.stats()
+        assert stats["audits"] == 2
+        assert stats["audit_agreement_rate"] == 0.0
+        assert stats["estimated_label_change_rate"] == 1.0
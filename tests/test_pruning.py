@@ -0,0 +1,96 @@
+import json
+import numpy as np
+import pytest
+import torch
+from transformers import (
+    AutoModelForSequenceClassification,
+    DistilBertConfig,
+    DistilBertForSequenceClassification,
+    DistilBertTokenizerFast
+)
+from src.app.config import Config
+from src.app.model.pruning import build_pruned, importance_scores, prune_ffn, prune_layers, prune_model, select_config
+from src.app.nodes.inference_node import InferenceNode
+
+VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "great", "movie", "terrible", "plot"]
+TEXTS = ["great movie", "terrible plot", "great great movie", "terrible movie plot"] * 4
+LABELS = np.array([int("great" in text) for text in TEXTS])
+
+@pytest.fixture
+def tiny_model():
+    torch.manual_seed(0)
+    tokenizer = DistilBertTokenizerFast(vocab={token: idx for idx, token in enumerate(VOCAB)})
+    model = DistilBertForSequenceClassification(
+        DistilBertConfig(vocab_size=len(VOCAB), dim=16, hidden_dim=32, n_layers=4, n_heads=2)
+    )
+    return tokenizer, model.eval()
+
+class TestStructuredPruning:
+    def test_scores_cover_every_head_and_neuron(self, tiny_model):
+        tokenizer, model = tiny_model
+
+        scores = importance_scores(model, tokenizer, TEXTS, LABELS, batch_size=8)
+
+        assert scores["heads"].shape == (4, 2)
+        assert scores["ffn"].shape == (4, 32)
+        assert np.allclose(np.linalg.norm(scores["heads"], axis=1), 1.0, atol=1e-5)
+        assert all(p.grad is None for p in model.parameters())
+
+    def test_pruned_checkpoint_loads_unchanged(self, tiny_model, tmp_path):
+        tokenizer, model = tiny_model
+        pruned = prune_layers(model, [0, 2])
+        prune_ffn(pruned, [list(range(0, 32, 2)), list(range(16))])
+        pruned.save_pretrained(tmp_path)
+        tokenizer.save_pretrained(tmp_path)
+
+        reloaded = AutoModelForSequenceClassification.from_pretrained(tmp_path).eval()
+        batch = tokenizer(TEXTS[:4], return_tensors="pt", padding=True)
+
+        assert reloaded.config.n_layers == 2
+        assert reloaded.config.hidden_dim == 16
+        with torch.no_grad():
+            assert torch.allclose(reloaded(**batch).logits, pruned(**batch).logits, atol=1e-5)
+        assert InferenceNode(str(tmp_path)).run("great movie")["label"] in ("negative", "positive")
+
+    def test_uneven_ffn_widths_rejected(self, tiny_model):
+        _, model = tiny_model
+        with pytest.raises(ValueError):
+            prune_ffn(model, [[0, 1], [0], [0, 1], [0, 1]])
+
+    def test_selected_config_meets_target_speedup(self, tiny_model):
+        tokenizer, model = tiny_model
+        scores = importance_scores(model, tokenizer, TEXTS, LABELS, batch_size=8)
+        scores["layers"] = np.array([0.3, 0.0, 0.2, 0.1])
+
+        selected = select_config(model, tokenizer, scores, TEXTS, LABELS, target_speedup=2.0, seq_length=4)
+
+        assert selected["estimated_speedup"] >= 2.0
+        assert selected["model"].config.n_layers == selected["n_layers"]
+        assert build_pruned(model, scores, 2, 1.0).config.n_layers == 2
+
+    def test_prune_model_writes_checkpoint_and_report(self, tiny_model, tmp_path, monkeypatch):
+        tokenizer, model = tiny_model
+        source = tmp_path / "source"
+        model.save_pretrained(source)
+        tokenizer.save_pretrained(source)
+        dataset = tmp_path / "reviews.jsonl"
+        dataset.write_text("".join(json.dumps({"text": t, "label": int(l)}) + "\n" for t, l in zip(TEXTS, LABELS)))
+        monkeypatch.setitem(Config.PRUNING_CONFIG, "report_file", tmp_path / "report.json")
+        monkeypatch.setitem(Config.PRUNING_CONFIG, "latency_repeats", 1)
+
+        result = prune_model(
+            str(source), str(tmp_path / "pruned"),
+            target_speedup=2.0, levels=[1.5, 2.0], dataset_name=str(dataset), max_samples=16
+        )
+
+        assert [row["target_speedup"] for row in result["levels"]] == [1.0, 1.5, 2.0]
+        assert result["levels"][0]["measured_speedup"] == 1.0
+        assert len(result["head_importance"]) == 4
+        saved = AutoModelForSequenceClassification.from_pretrained(tmp_path / "pruned")
+        assert saved.config.n_layers == result["levels"][-1]["n_layers"]
+        assert json.loads((tmp_path / "report.json").read_text())["target_speedup"] == 2.0
+
+    def test_prune_model_rejects_speedup_of_one_or_less(self, tmp_path):
+        for target in (1.0, 0.5):
+            with pytest.raises(ValueError, match="greater than 1.0"):
+                prune_model(str(tmp_path / "missing"), str(tmp_path / "pruned"), target_speedup=target)
@@ -0,0 +1,105 @@
+import json
+import os
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+from src.app.dag import SelfHealingDAG
+from src.app.utils.shadow import ShadowEvaluator
+
+def make_candidate(label="positive", confidence=0.8):
+    candidate = MagicMock()
+    candidate.run_batch.side_effect = lambda texts: [
+        {"label": label, "confidence": confidence, "text": text} for text in texts
+    ]
+    return candidate
+
+class TestShadowEvaluator:
+    def test_requires_candidate(self):
+        with pytest.raises(ValueError):
+            ShadowEvaluator()
+
+    def test_records_agreement_confidence_delta_and_latency(self, tmp_path):
+        shadow = ShadowEvaluator(candidate=make_candidate(), sample_rate=1.0, log_file=tmp_path / "shadow.jsonl")
+        shadow.submit({"text": "great", "label": "positive", "confidence": 0.9, "inference_latency_ms": 12.0})
+        shadow.submit({"text": "awful", "label": "negative", "confidence": 0.7, "inference_latency_ms": 8.0})
+        assert shadow.drain(timeout=5)
+
+        stats = shadow.stats()
+        assert stats["compared"] == 2
+        assert stats["agreement_rate"] == 0.5
+        assert stats["mean_abs_confidence_delta"] == pytest.approx(0.1)
+        assert stats["latency"]["primary"]["mean_ms"] == pytest.approx(10.0)
+        assert stats["latency"]["shadow"]["mean_ms"] is not None
+
+        records = [json.loads(line) for line in (tmp_path / "shadow.jsonl").read_text().splitlines()]
+        assert [r["agree"] for r in records] == [True, False]
+        shadow.close()
+
+    def test_respects_sample_rate(self):
+        shadow = ShadowEvaluator(candidate=make_candidate(), sample_rate=0.0)
+        assert shadow.submit({"text": "great", "label": "positive", "confidence": 0.9}) is False
+        assert shadow.stats()["sampled"] == 0
+        shadow.close()
+
+    def test_drops_when_queue_is_full_without_blocking(self):
+        release = threading.Event()
+        candidate = make_candidate()
+        candidate.run_batch.side_effect = lambda texts: release.wait(5) and [
+            {"label": "positive", "confidence": 0.8} for _ in texts
+        ]
+        shadow = ShadowEvaluator(candidate=candidate, sample_rate=1.0, queue_size=1, batch_size=1)
+
+        results = [shadow.submit({"text": f"t{i}", "label": "positive", "confidence": 0.9}) for i in range(5)]
+        release.set()
+
+        assert results.count(False) >= 3
+        assert shadow.stats()["dropped"] == results.count(False)
+        shadow.close()
+
+    def test_candidate_errors_are_counted(self):
+        candidate = MagicMock()
+        candidate.run_batch.side_effect = RuntimeError("boom")
+        shadow = ShadowEvaluator(candidate=candidate, sample_rate=1.0)
+        shadow.submit({"text": "great", "label": "positive", "confidence": 0.9})
+        assert shadow.drain(timeout=5)
+        assert shadow.stats()["errors"] == 1
+        shadow.close()
+
+    def test_worker_starts_lazily_and_restarts_after_fork(self, tmp_path):
+        shadow = ShadowEvaluator(candidate=make_candidate(), sample_rate=1.0)
+        assert shadow._worker is None
+        shadow.submit({"text": "great", "label": "positive", "confidence": 0.9})
+        assert shadow.drain(timeout=5)
+
+        pid = os.fork()
+        if pid == 0:
+            shadow.submit({"text": "awful", "label": "positive", "confidence": 0.9})
+            drained = shadow.drain(timeout=3)
+            (tmp_path / "child").write_text(json.dumps({"drained": drained, "compared": shadow.stats()["compared"]}))
+            os._exit(0)
+        os.waitpid(pid, 0)
+
+        assert json.loads((tmp_path / "child").read_text()) == {"drained": True, "compared": 2}
+        assert shadow.stats()["compared"] == 1
+        shadow.close()
+
+class TestDAGShadow:
+    @patch('src.app.dag.ShadowEvaluator')
+    @patch('src.app.dag.InferenceNode')
+    @patch('src.app.dag.FinalDecisionNode')
+    def test_submits_primary_inference_to_shadow(self, mock_final, mock_inference, mock_shadow):
+        mock_inference.return_value.run.side_effect = lambda text: {
+            "label": "positive", "label_idx": 1, "confidence": 0.95,
+            "probs": {"positive": 0.95, "negative": 0.05}, "text": text
+        }
+        mock_final.return_value.run.return_value = {
+            "request_id": "req", "final_label": "positive", "decision_via": "direct_prediction"
+        }
+
+        dag = SelfHealingDAG(model_path="fake-path", interactive=False, shadow_model_path="candidate-path")
+        dag.run("Brilliant film")
+
+        submitted = mock_shadow.return_value.submit.call_args[0][0]
+        assert submitted["text"] == "Brilliant film"
+        assert submitted["inference_latency_ms"] >= 0
+        assert "shadow" in dag.get_stats()
@@ -0,0 +1,124 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from unittest.mock import patch
+from src.app.dag import SelfHealingDAG
+from src.app.utils.clarification_store import ClarificationStore
+from src.app.utils.single_flight import SingleFlight, flight_key
+
+DECISION = {"label": "positive", "probs": {"negative": 0.1, "positive": 0.9}, "confidence": 0.9}
+
+def wait_for_followers(flight, count, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while flight.coalesced < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+class TestSingleFlight:
+    def test_concurrent_callers_share_one_execution(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def work():
+            calls.append(1)
+            release.wait(5)
+            return "result"
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(flight.do, "key", work) for _ in range(4)]
+            wait_for_followers(flight, 3)
+            release.set()
+            results = [f.result() for f in futures]
+
+        assert len(calls) == 1
+        assert sorted(shared for _, shared in results) == [False, True, True, True]
+        assert all(result == "result" for result, _ in results)
+        assert flight.stats()["in_flight"] == 0
+
+    def test_followers_receive_leader_error(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def fail():
+            release.wait(5)
+            raise RuntimeError("boom")
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [pool.submit(flight.do, "key", fail) for _ in range(2)]
+            wait_for_followers(flight, 1)
+            release.set()
+            for future in futures:
+                with pytest.raises(RuntimeError):
+                    future.result()
+
+    def test_flight_key_collapses_whitespace(self):
+        assert flight_key("  Great\tmovie \n") == flight_key("Great movie")
+        assert flight_key("Great movie") != flight_key("great movie")
+
+class TestDAGSingleFlight:
+    @patch('src.app.dag.InferenceNode')
+    @patch('src.app.dag.FinalDecisionNode')
+    def test_coalesced_requests_get_own_request_id_and_log(self, mock_final, mock_inference):
+        release = threading.Event()
+
+        def infer(text):
+            release.wait(5)
+            return {**DECISION, "label_idx": 1, "text": text}
+
+        mock_inference.return_value.run.side_effect = infer
+        mock_final.return_value.run.side_effect = lambda state: {
+            "request_id": str(uuid.uuid4()),
+            "final_label": state.get("final_label", state["label"]),
+            "decision_via": state.get("final_decision_via", "direct_prediction")
+        }
+
+        dag = SelfHealingDAG(model_path="fake-path", interactive=False, single_flight=True)
+        texts = ["A popular review", "A popular  review", "A popular review "]
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(dag.run, text) for text in texts]
+            wait_for_followers(dag.single_flight, 2)
+            release.set()
+            results = [f.result() for f in futures]
+
+        assert mock_inference.return_value.run.call_count == 1
+        assert mock_final.return_value.run.call_count == 3
+        assert len({result["request_id"] for result in results}) == 3
+        assert [result["text"] for result in results] == texts
+        assert all(result["final_label"] == "positive" for result in results)
+        assert dag.get_stats()["single_flight"]["coalesced"] == 2
+
+    @patch('src.app.dag.InferenceNode')
+    @patch('src.app.dag.FinalDecisionNode')
+    def test_disabled_only_for_prompting_sessions(self, mock_final, mock_inference):
+        prompting = SelfHealingDAG(model_path="fake-path", interactive=True, user_input_callback=input)
+        web = SelfHealingDAG(model_path="fake-path", interactive=True, clarification_mode="deferred")
+
+        assert prompting.single_flight is None
+        assert web.single_flight is not None
+
+    @patch('src.app.dag.InferenceNode')
+    @patch('src.app.dag.FinalDecisionNode')
+    def test_deferred_clarifications_share_inference_but_get_own_tickets(self, mock_final, mock_inference, tmp_path):
+        release = threading.Event()
+
+        def infer(text):
+            release.wait(5)
+            return {"label": "positive", "label_idx": 1, "probs": {"negative": 0.4, "positive": 0.6}, "confidence": 0.6, "text": text}
+
+        mock_inference.return_value.run.side_effect = infer
+        dag = SelfHealingDAG(model_path="fake-path", interactive=True, clarification_mode="deferred", single_flight=True)
+        dag._clarification_store = ClarificationStore(tmp_path / "clarifications.db")
+        texts = ["An unclear review", "An unclear  review"]
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [pool.submit(dag.run, text) for text in texts]
+            wait_for_followers(dag.single_flight, 1)
+            release.set()
+            results = [f.result() for f in futures]
+
+        assert mock_inference.return_value.run.call_count == 1
+        assert all(result["clarification_pending"] for result in results)
+        assert len({result["ticket_id"] for result in results}) == 2
+        pending = dag.clarification_store.list_pending()
+        assert sorted(ticket["state"]["text"] for ticket in pending) == sorted(texts)
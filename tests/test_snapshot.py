@@ -0,0 +1,49 @@
+import pytest
+import torch
+from transformers import DistilBertConfig, DistilBertForSequenceClassification, DistilBertTokenizerFast
+from src.app.model.snapshot import export_snapshot, load_snapshot, is_snapshot
+from src.app.nodes.inference_node import InferenceNode
+
+@pytest.fixture
+def tiny_model_dir(tmp_path):
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "great", "movie", "terrible", "plot"]
+    vocab_file = tmp_path / "vocab.txt"
+    vocab_file.write_text("\n".join(vocab))
+    
+    config = DistilBertConfig(
+        vocab_size=len(vocab), dim=16, hidden_dim=32, n_layers=1, n_heads=2,
+        id2label={0: "negative", 1: "positive"}, label2id={"negative": 0, "positive": 1}
+    )
+    model_dir = tmp_path / "model"
+    DistilBertForSequenceClassification(config).save_pretrained(model_dir)
+    DistilBertTokenizerFast(vocab_file=str(vocab_file)).save_pretrained(model_dir)
+    return model_dir
+
+class TestSnapshot:
+    def test_round_trip_matches_checkpoint(self, tiny_model_dir, tmp_path):
+        path = export_snapshot(str(tiny_model_dir), tmp_path / "model.snapshot", temperature=1.7)
+        
+        tokenizer, model, label_map, temperature = load_snapshot(str(path))
+        reference = DistilBertForSequenceClassification.from_pretrained(tiny_model_dir).eval()
+        inputs = tokenizer(["great movie", "terrible plot"], return_tensors="pt", padding=True)
+        
+        assert is_snapshot(path)
+        assert label_map == {0: "negative", 1: "positive"}
+        assert temperature == pytest.approx(1.7)
+        assert not any(buffer.is_meta for buffer in model.buffers())
+        with torch.no_grad():
+            assert torch.allclose(model(**inputs).logits, reference(**inputs).logits, atol=1e-6)
+    
+    def test_inference_node_loads_reduced_precision_snapshot(self, tiny_model_dir, tmp_path):
+        path = export_snapshot(str(tiny_model_dir), tmp_path / "model.snapshot", temperature=2.0, dtype="bfloat16")
+        
+        node = InferenceNode(str(path))
+        result = node.run("great movie")
+        
+        assert node.model.dtype == torch.bfloat16
+        assert node.temperature == 2.0
+        assert set(result["probs"]) == {"negative", "positive"}
+    
+    def test_rejects_unknown_dtype(self, tiny_model_dir, tmp_path):
+        with pytest.raises(ValueError):
+            export_snapshot(str(tiny_model_dir), tmp_path / "model.snapshot", dtype="int4")
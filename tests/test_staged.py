@@ -0,0 +1,119 @@
+import json
+import os
+import threading
+import pytest
+import torch
+from unittest.mock import Mock, patch
+from transformers import DistilBertConfig, DistilBertForSequenceClassification, DistilBertTokenizerFast
+from src.app.dag import SelfHealingDAG
+from src.app.model.manager import ModelManager
+from src.app.nodes.inference_node import InferenceNode
+from src.app.utils.staged import Stage, StagedInference, StagedPipeline
+
+VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "great", "movie", "terrible", "plot"]
+
+@pytest.fixture
+def node(tmp_path):
+    torch.manual_seed(0)
+    DistilBertTokenizerFast(vocab={token: idx for idx, token in enumerate(VOCAB)}).save_pretrained(tmp_path)
+    DistilBertForSequenceClassification(
+        DistilBertConfig(vocab_size=len(VOCAB), dim=16, hidden_dim=32, n_layers=1, n_heads=2)
+    ).save_pretrained(tmp_path)
+    return InferenceNode(str(tmp_path))
+
+class TestStagedPipeline:
+    def test_stages_run_on_separate_threads_and_chain_outputs(self):
+        threads = {}
+
+        def stage(name, fn):
+            def run(value):
+                threads[name] = threading.current_thread().name
+                return fn(value)
+            return Stage(name, run, queue_size=2)
+
+        pipeline = StagedPipeline([stage("double", lambda x: x * 2), stage("inc", lambda x: x + 1)])
+        futures = [pipeline.submit(i) for i in range(10)]
+
+        assert [f.result(timeout=5) for f in futures] == [i * 2 + 1 for i in range(10)]
+        assert threads["double"] != threads["inc"]
+        stats = pipeline.stats()
+        assert stats["double"]["processed"] == 10
+        assert stats["inc"]["queue_depth"] == 0
+        assert 0.0 <= stats["inc"]["utilization"] <= 1.0
+        pipeline.close()
+
+    def test_errors_propagate_without_stopping_workers(self):
+        def fail_on_two(value):
+            if value == 2:
+                raise ValueError("bad item")
+            return value
+
+        pipeline = StagedPipeline([Stage("check", fail_on_two), Stage("identity", lambda x: x)])
+
+        with pytest.raises(ValueError):
+            pipeline.submit(2).result(timeout=5)
+        assert pipeline.submit(3).result(timeout=5) == 3
+        pipeline.close()
+
+    def test_threads_start_lazily_and_restart_after_fork(self, tmp_path):
+        pipeline = StagedPipeline([Stage("double", lambda x: x * 2), Stage("inc", lambda x: x + 1)])
+        assert pipeline._threads == []
+        assert pipeline.submit(1).result(timeout=5) == 3
+
+        result_file = tmp_path / "child.json"
+        pid = os.fork()
+        if pid == 0:
+            try:
+                result = pipeline.submit(4).result(timeout=5)
+                result_file.write_text(json.dumps({
+                    "result": result,
+                    "processed": pipeline.stats()["double"]["processed"],
+                    "alive": all(thread.is_alive() for thread in pipeline._threads)
+                }))
+            finally:
+                os._exit(0)
+        os.waitpid(pid, 0)
+
+        assert json.loads(result_file.read_text()) == {"result": 9, "processed": 1, "alive": True}
+        assert pipeline.submit(2).result(timeout=5) == 5
+        pipeline.close()
+
+class TestStagedInference:
+    def test_matches_serial_inference(self, node):
+        staged = StagedInference(node, tokenizer_workers=2, queue_size=2)
+        batches = [["great movie", "terrible plot"], ["plot " * 20], ["great", "movie movie", "terrible"]]
+
+        futures = [staged.submit(batch) for batch in batches]
+        results = [future.result(timeout=10) for future in futures]
+
+        for batch, staged_results in zip(batches, results):
+            for expected, actual in zip(node.run_batch(batch), staged_results):
+                assert actual["label"] == expected["label"]
+                assert actual["confidence"] == pytest.approx(expected["confidence"], abs=1e-6)
+        stats = staged.stats()
+        assert stats["tokenize"]["workers"] == 2
+        assert stats["forward"]["processed"] == 3
+        assert stats["postprocess"]["processed"] == 3
+        staged.close()
+
+class TestDAGStaged:
+    @patch('src.app.dag.FinalDecisionNode')
+    def test_submit_batch_pipelines_micro_batches(self, mock_final, node):
+        mock_final.return_value.run.side_effect = lambda state: {
+            "request_id": "req",
+            "final_label": state.get("final_label", state["label"]),
+            "decision_via": state.get("final_decision_via", "direct_prediction")
+        }
+
+        dag = SelfHealingDAG(
+            model_path=node.model.name_or_path, interactive=False, staged=True, single_flight=False,
+            model_manager=ModelManager(budget_bytes=None, idle_ttl=0)
+        )
+        dag.fallback_node.zero_shot_pipeline = Mock(return_value={"labels": ["negative", "positive"], "scores": [0.6, 0.4]})
+        texts = ["great movie", "terrible plot", "plot plot", "great", "movie"]
+
+        results = dict(dag.run_batch(texts, batch_size=2))
+
+        assert sorted(results) == list(range(5))
+        assert [results[i]["text"] for i in range(5)] == texts
+        assert dag.get_stats()["pipeline"]["forward"]["processed"] == 3
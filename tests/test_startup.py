@@ -0,0 +1,33 @@
+import subprocess
+import sys
+from src.app.config import Config
+from src.app.utils.startup_bench import parse_importtime
+
+HEAVY_MODULES = ["torch", "transformers", "langgraph"]
+
+class TestLazyImports:
+    def test_light_entry_points_skip_heavy_dependencies(self):
+        code = (
+            "import sys, src.app.cli, src.app.logger, web_app; "
+            f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+        )
+        proc = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True, text=True, cwd=Config.PROJECT_ROOT, check=True
+        )
+        
+        assert proc.stdout.strip() == "[]"
+
+class TestParseImporttime:
+    def test_keeps_top_level_imports_sorted_by_cumulative_time(self):
+        stderr = "\n".join([
+            "import time: self [us] | cumulative | imported package",
+            "import time:       100 |        100 |   json.decoder",
+            "import time:       200 |        300 | json",
+            "import time:       500 |       5000 | torch",
+        ])
+        
+        assert parse_importtime(stderr) == [
+            {"module": "torch", "cumulative_ms": 5.0},
+            {"module": "json", "cumulative_ms": 0.3}
+        ]
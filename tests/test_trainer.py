@@ -0,0 +1,61 @@
+import json
+import pytest
+import torch
+from datasets import Dataset, DatasetDict
+from unittest.mock import patch
+from transformers import DistilBertConfig, DistilBertForSequenceClassification, DistilBertTokenizerFast
+from src.app.config import Config
+from src.app.model.trainer import ModelTrainer, resolve_training_profile
+
+VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "great", "movie", "terrible", "plot"]
+
+class TestTrainingProfile:
+    def test_auto_picks_cpu_profile_without_cuda(self):
+        with patch('torch.cuda.is_available', return_value=False), \
+             patch('src.app.model.trainer.cpu_supports_bf16', return_value=True):
+            profile = resolve_training_profile("auto")
+
+        assert profile["name"] == "cpu"
+        assert profile["bf16"] is True
+        assert profile["group_by_length"] is True
+        assert profile["dataloader_num_workers"] >= 0
+
+    def test_bf16_disabled_when_cpu_lacks_support(self):
+        with patch('src.app.model.trainer.cpu_supports_bf16', return_value=False):
+            assert resolve_training_profile("cpu")["bf16"] is False
+
+    def test_default_profile_and_unknown_profile(self):
+        assert resolve_training_profile("default") == {"name": "default"}
+        with pytest.raises(ValueError):
+            resolve_training_profile("tpu")
+
+class TestCpuTraining:
+    def test_trains_with_cpu_profile_and_logs_throughput(self, tmp_path, monkeypatch):
+        torch.manual_seed(0)
+        monkeypatch.setitem(Config.TRAINING_CONFIG, "num_train_epochs", 1)
+        monkeypatch.setitem(Config.TRAINING_CONFIG, "per_device_train_batch_size", 4)
+        monkeypatch.setitem(Config.TRAINING_CONFIG, "warmup_steps", 0)
+        monkeypatch.setitem(Config.CPU_TRAINING_PROFILE, "dataloader_num_workers", 0)
+        monkeypatch.setitem(Config.CPU_TRAINING_PROFILE, "gradient_accumulation_steps", 2)
+        monkeypatch.setattr(Config, "LOGS_DIR", tmp_path)
+        monkeypatch.setattr(Config, "TRAINING_THROUGHPUT_FILE", tmp_path / "throughput.jsonl")
+
+        tokenizer = DistilBertTokenizerFast(vocab={token: idx for idx, token in enumerate(VOCAB)})
+        texts = ["great movie", "terrible plot", "great great movie", "terrible movie plot"] * 4
+        rows = [{**tokenizer(text), "labels": int("great" in text)} for text in texts]
+        split = Dataset.from_list(rows)
+
+        trainer = ModelTrainer()
+        trainer.tokenizer = tokenizer
+        trainer.dataset = DatasetDict({"train": split, "test": split})
+        trainer.model = DistilBertForSequenceClassification(
+            DistilBertConfig(vocab_size=len(VOCAB), dim=16, hidden_dim=32, n_layers=1, n_heads=2)
+        )
+
+        _, results = trainer.train(output_dir=tmp_path / "model", profile="cpu")
+
+        assert results["throughput"][0]["profile"] == "cpu"
+        assert results["throughput"][0]["gradient_accumulation_steps"] == 2
+        assert results["throughput"][0]["samples_per_second"] > 0
+        logged = [json.loads(line) for line in (tmp_path / "throughput.jsonl").read_text().splitlines()]
+        assert logged == results["throughput"]
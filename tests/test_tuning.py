@@ -0,0 +1,69 @@
+import pytest
+from unittest.mock import patch
+from src.app.config import Config
+from src.app.dag import SelfHealingDAG
+from src.app.utils.tuning import benchmark_workers, pareto_frontier, choose_profile, save_profile, load_profile
+
+def _result(threads, batch_size, throughput, p95_ms, workers=1):
+    return {
+        "threads": threads,
+        "batch_size": batch_size,
+        "workers": workers,
+        "throughput": throughput,
+        "p50_ms": p95_ms / 2,
+        "p95_ms": p95_ms
+    }
+
+class TestParetoFrontier:
+    def test_drops_dominated_profiles(self):
+        fast = _result(4, 32, throughput=400.0, p95_ms=80.0)
+        responsive = _result(4, 1, throughput=100.0, p95_ms=10.0)
+        dominated = _result(2, 16, throughput=90.0, p95_ms=60.0)
+
+        frontier = pareto_frontier([fast, responsive, dominated])
+
+        assert frontier == [responsive, fast]
+
+    def test_choose_respects_latency_budget(self):
+        frontier = [_result(4, 1, 100.0, 10.0), _result(4, 8, 250.0, 40.0), _result(4, 32, 400.0, 80.0)]
+
+        assert choose_profile(frontier)["batch_size"] == 32
+        assert choose_profile(frontier, max_latency_ms=50)["batch_size"] == 8
+        assert choose_profile(frontier, max_latency_ms=5)["batch_size"] == 1
+
+    def test_choose_requires_candidates(self):
+        with pytest.raises(ValueError):
+            choose_profile([])
+
+class TestProfilePersistence:
+    def test_round_trip(self, tmp_path):
+        path = save_profile(_result(2, 8, 120.0, 30.0, workers=4), tmp_path / "profile.json")
+
+        profile = load_profile(path)
+
+        assert profile["threads"] == 2
+        assert profile["batch_size"] == 8
+        assert profile["workers"] == 4
+
+    def test_missing_profile_returns_none(self, tmp_path):
+        assert load_profile(tmp_path / "missing.json") is None
+
+    @patch('src.app.dag.apply_profile')
+    @patch('src.app.dag.InferenceNode')
+    def test_dag_applies_threads_only_for_matching_worker_count(self, mock_inference, mock_apply, tmp_path, monkeypatch):
+        monkeypatch.setattr(Config, "TUNING_PROFILE_FILE", tmp_path / "profile.json")
+        save_profile(_result(3, 8, 100.0, 20.0, workers=4))
+
+        monkeypatch.setitem(Config.SERVING_CONFIG, "workers", 1)
+        dag = SelfHealingDAG(model_path="fake-path", interactive=False)
+        assert dag.batch_size == 8
+        mock_apply.assert_not_called()
+
+        monkeypatch.setitem(Config.SERVING_CONFIG, "workers", 4)
+        SelfHealingDAG(model_path="fake-path", interactive=False)
+        mock_apply.assert_called_once()
+
+class TestBenchmarkWorkers:
+    def test_crashed_worker_raises_instead_of_hanging(self, tmp_path):
+        with pytest.raises(RuntimeError, match="exited with code"):
+            benchmark_workers(str(tmp_path / "missing-model"), ["great movie"], threads=1, batch_size=1, workers=2)
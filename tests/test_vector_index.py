@@ -0,0 +1,138 @@
+import numpy as np
+import pytest
+import torch
+from unittest.mock import Mock, patch
+from transformers import DistilBertConfig, DistilBertForSequenceClassification, DistilBertTokenizerFast
+from src.app.dag import SelfHealingDAG
+from src.app.model.manager import ModelManager
+from src.app.nodes.fallback_node import FallbackNode
+from src.app.nodes.inference_node import InferenceNode
+from src.app.utils.vector_index import VectorIndex
+
+VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "great", "movie", "terrible", "plot"]
+
+def unit(*values):
+    vector = np.asarray(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+class TestVectorIndex:
+    def test_resolves_when_neighbours_agree(self):
+        index = VectorIndex(max_entries=10)
+        for offset in (0.0, 0.05, 0.1):
+            index.add(unit(1.0, offset, 0.0), "negative", "backup_model_escalation")
+        index.add(unit(0.0, 0.0, 1.0), "positive", "user_clarification")
+
+        resolved = index.resolve(unit(1.0, 0.02, 0.0), k=3, min_similarity=0.9, min_neighbours=3, min_agreement=0.8)
+
+        assert resolved["label"] == "negative"
+        assert resolved["agreement"] == 1.0
+        assert resolved["neighbours"] == 3
+
+    def test_no_resolution_when_neighbours_disagree_or_are_far(self):
+        index = VectorIndex(max_entries=10)
+        index.add(unit(1.0, 0.0), "negative", "user_clarification")
+        index.add(unit(1.0, 0.01), "positive", "user_clarification")
+
+        assert index.resolve(unit(1.0, 0.0), k=2, min_neighbours=2, min_agreement=0.8) is None
+        assert index.resolve(unit(0.0, 1.0), k=2, min_neighbours=1, min_agreement=0.5) is None
+        assert index.stats()["resolved"] == 0
+
+    def test_persists_and_evicts_oldest(self, tmp_path):
+        path = tmp_path / "index.npz"
+        index = VectorIndex(path, max_entries=2, save_every=1)
+        index.add(unit(1.0, 0.0), "negative", "user_clarification")
+        index.add(unit(0.0, 1.0), "positive", "user_clarification")
+        index.add(unit(1.0, 1.0), "positive", "backup_model_escalation")
+        index.save()
+
+        reloaded = VectorIndex(path, max_entries=2)
+
+        assert len(reloaded) == 2
+        assert [n["label"] for n in reloaded.search(unit(1.0, 1.0), k=2)] == ["positive", "positive"]
+
+        reloaded.add(unit(-1.0, 0.0), "negative", "user_clarification")
+        assert sorted(n["source"] for n in reloaded.search(unit(1.0, 1.0), k=2)) == [
+            "backup_model_escalation", "user_clarification"
+        ]
+        assert reloaded.search(unit(0.0, 1.0), k=1)[0]["similarity"] < 0.8
+
+    def test_full_index_overwrites_in_place_and_saves_off_the_request_thread(self, tmp_path):
+        index = VectorIndex(tmp_path / "index.npz", max_entries=3, save_every=2)
+        with patch("src.app.utils.vector_index.threading.Thread") as thread:
+            for i in range(5):
+                index.add(unit(1.0, float(i)), "positive", "user_clarification")
+            buffer = index._vectors
+
+            index.add(unit(0.0, 1.0), "negative", "user_clarification")
+
+        assert index._vectors is buffer
+        assert len(index) == 3
+        assert index._labels == ["positive", "positive", "negative"]
+        assert thread.return_value.start.called
+        assert not (tmp_path / "index.npz").exists()
+
+class TestEmbeddingFallback:
+    def _escalation(self, embedding):
+        return {
+            "action": "escalate",
+            "text": "Confusing movie",
+            "label": "positive",
+            "confidence": 0.45,
+            "status": "LOW",
+            "probs": {"positive": 0.45, "negative": 0.55},
+            "embedding": embedding
+        }
+
+    def test_neighbours_resolve_before_zero_shot(self):
+        index = VectorIndex(max_entries=10)
+        for _ in range(3):
+            index.add(unit(1.0, 0.0), "negative", "backup_model_escalation")
+        node = FallbackNode(neighbour_index=index, model_manager=ModelManager(budget_bytes=None, idle_ttl=0))
+        node.zero_shot_pipeline = Mock()
+
+        result = node.run(self._escalation(unit(1.0, 0.0).tolist()), interactive=False)
+
+        node.zero_shot_pipeline.assert_not_called()
+        assert result["final_label"] == "negative"
+        assert result["final_decision_via"] == "nearest_neighbours"
+        assert result["nearest_neighbours"]["neighbours"] == 3
+
+    def test_inference_node_returns_normalized_embeddings(self, tmp_path):
+        torch.manual_seed(0)
+        DistilBertTokenizerFast(vocab={token: idx for idx, token in enumerate(VOCAB)}).save_pretrained(tmp_path)
+        DistilBertForSequenceClassification(
+            DistilBertConfig(vocab_size=len(VOCAB), dim=16, hidden_dim=32, n_layers=1, n_heads=2)
+        ).save_pretrained(tmp_path)
+
+        node = InferenceNode(str(tmp_path), return_embeddings=True)
+        results = node.run_batch(["great movie", "terrible plot plot plot"])
+
+        assert all(len(result["embedding"]) == 16 for result in results)
+        assert np.linalg.norm(results[0]["embedding"]) == pytest.approx(1.0, abs=1e-5)
+        assert "embedding" not in InferenceNode(str(tmp_path)).run("great movie")
+
+    @patch('src.app.dag.InferenceNode')
+    @patch('src.app.dag.FinalDecisionNode')
+    def test_dag_indexes_backup_resolutions(self, mock_final, mock_inference, tmp_path, monkeypatch):
+        from src.app.config import Config
+        monkeypatch.setitem(Config.EMBEDDING_FALLBACK_CONFIG, "index_path", tmp_path / "index.npz")
+        mock_inference.return_value.run.side_effect = lambda text: {
+            **self._escalation(unit(1.0, 0.0).tolist()), "label_idx": 0, "text": text
+        }
+        mock_final.return_value.run.side_effect = lambda state: {
+            "request_id": "req",
+            "final_label": state.get("final_label", state["label"]),
+            "decision_via": state.get("final_decision_via", "direct_prediction")
+        }
+
+        dag = SelfHealingDAG(
+            model_path="fake-path", interactive=False, embedding_fallback=True, single_flight=False,
+            model_manager=ModelManager(budget_bytes=None, idle_ttl=0)
+        )
+        dag.fallback_node.zero_shot_pipeline = Mock(return_value={"labels": ["negative", "positive"], "scores": [0.9, 0.1]})
+        vias = [dag.run(f"confusing movie {i}")["decision_via"] for i in range(4)]
+
+        assert vias == ["backup_model_escalation"] * 3 + ["nearest_neighbours"]
+        assert dag.fallback_node.zero_shot_pipeline.call_count == 3
+        assert dag.get_stats()["embedding_index"]["entries"] == 3
+        assert mock_inference.call_args.kwargs["return_embeddings"] is True
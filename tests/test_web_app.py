@@ -0,0 +1,186 @@
+import json
+import threading
+import time
+import pytest
+from concurrent.futures import Future
+from unittest.mock import MagicMock, patch
+import web_app
+from src.app.utils.admission import AdmissionController, AdmissionRejected
+
+def _result(label, via="direct_prediction"):
+    return {
+        "final_label": label,
+        "confidence": 0.9,
+        "status": "HIGH",
+        "probs": {"positive": 0.9, "negative": 0.1},
+        "decision_via": via,
+        "request_id": f"req-{label}"
+    }
+
+@pytest.fixture
+def client():
+    web_app.app.config["TESTING"] = True
+    return web_app.app.test_client()
+
+@pytest.fixture
+def fake_dag():
+    dag = MagicMock()
+    dag.batch_size = 2
+    
+    def submit_batch(texts, offset=0, degraded=False):
+        decided, pending = [], []
+        for i, text in enumerate(texts):
+            if text.startswith("escalate"):
+                future = Future()
+                future.idx = offset + i
+                future.set_result(
+                    {**_result("negative", via="degraded"), "degraded": True} if degraded
+                    else _result("negative", via="backup_model_escalation")
+                )
+                pending.append(future)
+            else:
+                decided.append((offset + i, _result("positive")))
+        return decided, pending
+    
+    dag.submit_batch.side_effect = submit_batch
+    with patch.object(web_app, "dag", dag):
+        yield dag
+
+class TestBatchEndpoint:
+    def test_streams_ndjson_for_json_list(self, client, fake_dag):
+        response = client.post("/classify/batch", json={"texts": ["good", "escalate me", "fine"]})
+        
+        lines = [json.loads(line) for line in response.data.decode().splitlines()]
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        assert sorted(line["index"] for line in lines) == [0, 1, 2]
+        assert {line["index"]: line["decision_via"] for line in lines}[1] == "backup_model_escalation"
+        assert web_app.batch_limiter.in_flight == 0
+    
+    def test_accepts_ndjson_request_body(self, client, fake_dag):
+        body = '{"text": "good"}\n"plain string"\n'
+        response = client.post("/classify/batch", data=body, content_type="application/x-ndjson")
+        
+        lines = [json.loads(line) for line in response.data.decode().splitlines()]
+        assert [line["input_text"] for line in lines] == ["good", "plain string"]
+    
+    def test_rejects_oversized_batches(self, client, fake_dag):
+        with patch.dict(web_app.Config.BATCH_ENDPOINT_CONFIG, {"max_items": 2}):
+            response = client.post("/classify/batch", json={"texts": ["a", "b", "c"]})
+        
+        assert response.status_code == 413
+    
+    def test_rejects_when_too_many_items_in_flight(self, client, fake_dag):
+        assert web_app.batch_limiter.try_acquire(web_app.batch_limiter.max_in_flight)
+        try:
+            response = client.post("/classify/batch", json={"texts": ["a"]})
+        finally:
+            web_app.batch_limiter.release(web_app.batch_limiter.max_in_flight)
+        
+        assert response.status_code == 429
+    
+    def test_batches_go_through_admission_control(self, client, fake_dag):
+        controller = AdmissionController(max_in_flight=1, max_queue=0)
+        controller.acquire()
+        
+        with patch.object(web_app, "admission", controller):
+            response = client.post("/classify/batch", json={"texts": ["good", "escalate me"]})
+        
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "1"
+        assert web_app.batch_limiter.in_flight == 0
+        fake_dag.submit_batch.assert_not_called()
+    
+    def test_degraded_batches_release_their_slot(self, client, fake_dag):
+        controller = AdmissionController(max_in_flight=1, max_queue=1)
+        
+        with patch.object(controller, "acquire", wraps=lambda: controller._admit(True)), \
+             patch.object(web_app, "admission", controller):
+            response = client.post("/classify/batch", json={"texts": ["good", "escalate me"]})
+            lines = {line["index"]: line for line in map(json.loads, response.data.decode().splitlines())}
+            response.close()
+        
+        assert "degraded" not in lines[0]
+        assert lines[1]["degraded"] is True
+        assert controller.stats["degraded"] == 1
+        assert controller.snapshot()["in_flight"] == 0
+
+class TestAdmissionControl:
+    def test_queues_then_sheds_when_queue_full(self):
+        controller = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout_ms=2000)
+        assert controller.acquire() is False
+        
+        waiter = threading.Thread(target=controller.acquire)
+        waiter.start()
+        while controller.queued == 0:
+            time.sleep(0.01)
+        
+        with pytest.raises(AdmissionRejected) as rejected:
+            controller.acquire()
+        assert rejected.value.status == 429
+        
+        controller.release()
+        waiter.join(timeout=5)
+        assert controller.snapshot()["in_flight"] == 1
+        assert controller.stats["shed_queue_full"] == 1
+    
+    def test_times_out_in_queue_with_503(self):
+        controller = AdmissionController(max_in_flight=1, max_queue=4, queue_timeout_ms=20)
+        controller.acquire()
+        
+        with pytest.raises(AdmissionRejected) as rejected:
+            controller.acquire()
+        
+        assert rejected.value.status == 503
+        assert controller.snapshot()["queued"] == 0
+    
+    def test_queued_requests_are_degraded_when_enabled(self):
+        controller = AdmissionController(max_in_flight=1, max_queue=4, queue_timeout_ms=2000, degrade=True)
+        controller.acquire()
+        results = []
+        
+        waiter = threading.Thread(target=lambda: results.append(controller.acquire()))
+        waiter.start()
+        while controller.queued == 0:
+            time.sleep(0.01)
+        controller.release()
+        waiter.join(timeout=5)
+        
+        assert results == [True]
+        assert controller.stats["degraded"] == 0
+        controller.record_degraded()
+        assert controller.snapshot()["degraded"] == 1
+    
+    def test_classify_returns_429_with_retry_after(self, client, fake_dag):
+        controller = AdmissionController(max_in_flight=1, max_queue=0)
+        controller.acquire()
+        
+        with patch.object(web_app, "admission", controller):
+            response = client.post("/classify", json={"text": "great movie"})
+        
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "1"
+        fake_dag.run.assert_not_called()
+    
+    def test_classify_passes_degraded_flag(self, client, fake_dag):
+        fake_dag.run.return_value = {**_result("positive", via="degraded"), "degraded": True}
+        controller = AdmissionController(max_in_flight=1, max_queue=1)
+        
+        with patch.object(controller, "acquire", return_value=True), \
+             patch.object(web_app, "admission", controller):
+            response = client.post("/classify", json={"text": "great movie"})
+        
+        fake_dag.run.assert_called_once_with("great movie", deadline_ms=None, degraded=True)
+        assert response.get_json()["degraded"] is True
+        assert controller.stats["degraded"] == 1
+
+    def test_accepted_requests_in_degrade_mode_are_not_reported_degraded(self, client, fake_dag):
+        fake_dag.run.return_value = {**_result("positive"), "degraded": False}
+        controller = AdmissionController(max_in_flight=1, max_queue=1)
+
+        with patch.object(controller, "acquire", return_value=True), \
+             patch.object(web_app, "admission", controller):
+            response = client.post("/classify", json={"text": "great movie"})
+
+        assert "degraded" not in response.get_json()
+        assert controller.stats["degraded"] == 0
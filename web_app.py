@@ -1,33 +1,107 @@
 import os
 os.environ['TOKENIZERS_PARALLELISM'] = 'false'
 
-from flask import Flask, render_template, request, jsonify
+import json
+from concurrent.futures import as_completed
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
 from flask_cors import CORS
-from src.app.dag import SelfHealingDAG
 from src.app.config import Config
+from src.app.utils.admission import AdmissionController, AdmissionRejected, InFlightLimiter
+from src.app.utils.clarification_store import ClarificationStore, resume_clarification
+from src.app.model.manager import model_manager
+from src.app.utils.metrics import metrics_instance
 from pathlib import Path
 
 app = Flask(__name__)
 CORS(app)
 
-model_path = str(Config.CHECKPOINTS_DIR / "model")
+model_path = str(Config.SNAPSHOT_FILE if Config.SNAPSHOT_FILE.exists() else Config.CHECKPOINTS_DIR / "model")
 dag = None
+batch_limiter = InFlightLimiter(Config.BATCH_ENDPOINT_CONFIG["max_in_flight_items"])
+admission = AdmissionController()
 
 def init_model():
     global dag
     if dag is None:
+        from src.app.dag import SelfHealingDAG
         print("Loading Self-Healing Classification System...")
         dag = SelfHealingDAG(
             model_path=model_path,
-            interactive=False,
+            interactive=Config.CLARIFICATION_CONFIG["mode"] == "deferred",
             device="cpu"
         )
         print("Model loaded successfully!")
 
+def preload_models():
+    init_model()
+    if Config.SERVING_CONFIG["preload_zero_shot"]:
+        print("Preloading zero-shot backup model...")
+        dag.fallback_node._init_zero_shot()
+
 @app.route('/')
 def index():
     return render_template('index.html')
 
+def format_result(text, result):
+    response = {
+        'input_text': text,
+        'predicted_label': result['final_label'],
+        'confidence': round(result['confidence'] * 100, 2),
+        'status': result['status'],
+        'probabilities': {k: round(v * 100, 2) for k, v in result['probs'].items()},
+        'fallback_activated': result.get('fallback_activated', False),
+        'fallback_strategy': result.get('fallback_strategy'),
+        'decision_via': result.get('decision_via', 'direct_prediction'),
+        'request_id': result.get('request_id')
+    }
+    
+    if result.get('deadline_fallback'):
+        response['deadline_fallback'] = True
+    
+    if result.get('degraded'):
+        response['degraded'] = True
+    
+    if result.get('clarification_pending'):
+        response['clarification'] = {
+            'ticket_id': result['ticket_id'],
+            'question': result['fallback_question']
+        }
+    
+    if result.get('tasks'):
+        response['tasks'] = {
+            name: {
+                'predicted_label': task.get('final_label') or task['label'],
+                'confidence': round(task['confidence'] * 100, 2),
+                'status': task.get('status'),
+                'decision_via': task.get('decision_via') or 'direct_prediction'
+            }
+            for name, task in result['tasks'].items()
+        }
+    
+    if result.get('backup_model'):
+        response['backup_model'] = {
+            'label': result['backup_model']['label'],
+            'confidence': round(result['backup_model']['confidence'] * 100, 2)
+        }
+    
+    return response
+
+def parse_batch_texts():
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        texts = []
+        for line in request.stream:
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            texts.append(item.get('text') if isinstance(item, dict) else item)
+            if len(texts) > Config.BATCH_ENDPOINT_CONFIG["max_items"]:
+                break
+        return texts
+    
+    data = request.get_json()
+    return data.get('texts') if isinstance(data, dict) else data
+
 @app.route('/classify', methods=['POST'])
 def classify():
     try:
@@ -37,29 +111,26 @@ def classify():
         if not text:
             return jsonify({'error': 'No text provided'}), 400
         
+        deadline_ms = data.get('deadline_ms')
+        if deadline_ms is not None and (not isinstance(deadline_ms, (int, float)) or deadline_ms <= 0):
+            return jsonify({'error': 'deadline_ms must be a positive number'}), 400
+        
         if dag is None:
             init_model()
         
-        result = dag.run(text)
-        
-        response = {
-            'input_text': text,
-            'predicted_label': result['final_label'],
-            'confidence': round(result['confidence'] * 100, 2),
-            'status': result['status'],
-            'probabilities': {k: round(v * 100, 2) for k, v in result['probs'].items()},
-            'fallback_activated': result.get('fallback_activated', False),
-            'fallback_strategy': result.get('fallback_strategy'),
-            'decision_via': result.get('decision_via', 'direct_prediction'),
-            'request_id': result['request_id']
-        }
-        
-        if result.get('backup_model'):
-            response['backup_model'] = {
-                'label': result['backup_model']['label'],
-                'confidence': round(result['backup_model']['confidence'] * 100, 2)
-            }
+        try:
+            with admission.admit() as degraded:
+                result = dag.run(text, deadline_ms=deadline_ms, degraded=degraded)
+            if result.get('degraded'):
+                admission.record_degraded()
+        except AdmissionRejected as e:
+            response = jsonify({'error': e.reason})
+            response.headers['Retry-After'] = '1'
+            return response, e.status
+        response = format_result(text, result)
         
+        if result.get('clarification_pending'):
+            return jsonify(response), 202
         return jsonify(response)
     
     except Exception as e:
@@ -67,12 +138,136 @@ def classify():
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
+@app.route('/classify/batch', methods=['POST'])
+def classify_batch():
+    limits = Config.BATCH_ENDPOINT_CONFIG
+    if request.content_length is not None and request.content_length > limits["max_payload_bytes"]:
+        return jsonify({'error': f"Payload exceeds {limits['max_payload_bytes']} bytes"}), 413
+    request.max_content_length = limits["max_payload_bytes"]
+    
+    try:
+        texts = parse_batch_texts()
+    except ValueError as e:
+        return jsonify({'error': f'Invalid batch payload: {e}'}), 400
+    
+    if not isinstance(texts, list) or not texts:
+        return jsonify({'error': 'No texts provided'}), 400
+    if len(texts) > limits["max_items"]:
+        return jsonify({'error': f"Batch exceeds {limits['max_items']} items"}), 413
+    if not all(isinstance(text, str) and text for text in texts):
+        return jsonify({'error': 'Every item must be a non-empty string'}), 400
+    
+    if dag is None:
+        init_model()
+    
+    if not batch_limiter.try_acquire(len(texts)):
+        return jsonify({'error': 'Too many items in flight, retry later'}), 429
+    try:
+        degraded = admission.acquire()
+    except AdmissionRejected as e:
+        batch_limiter.release(len(texts))
+        response = jsonify({'error': e.reason})
+        response.headers['Retry-After'] = '1'
+        return response, e.status
+    in_flight = {'remaining': len(texts)}
+    
+    def emit(idx, result=None, error=None):
+        in_flight['remaining'] -= 1
+        batch_limiter.release()
+        if result is not None and result.get('degraded'):
+            admission.record_degraded()
+        line = {'index': idx, 'error': error} if error else {'index': idx, **format_result(texts[idx], result)}
+        return json.dumps(line) + '\n'
+    
+    def emit_future(future):
+        try:
+            return emit(future.idx, result=future.result())
+        except Exception as e:
+            return emit(future.idx, error=str(e))
+    
+    def generate():
+        pending = []
+        for start in range(0, len(texts), dag.batch_size):
+            decided, futures = dag.submit_batch(texts[start:start + dag.batch_size], offset=start, degraded=degraded)
+            pending.extend(futures)
+            
+            for idx, result in decided:
+                yield emit(idx, result=result)
+            
+            for future in [f for f in pending if f.done()]:
+                pending.remove(future)
+                yield emit_future(future)
+        
+        for future in as_completed(pending):
+            yield emit_future(future)
+    
+    def release_remaining():
+        batch_limiter.release(in_flight['remaining'])
+        in_flight['remaining'] = 0
+        admission.release()
+    
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    response.call_on_close(release_remaining)
+    return response
+
+@app.route('/clarify/pending')
+def clarify_pending():
+    store = dag.clarification_store if dag is not None else ClarificationStore()
+    limit = request.args.get('limit', 50, type=int)
+    return jsonify([
+        {
+            'ticket_id': ticket['ticket_id'],
+            'created_at': ticket['created_at'],
+            'question': ticket['question'],
+            'input_text': ticket['state']['text']
+        }
+        for ticket in store.list_pending(limit)
+    ])
+
+@app.route('/clarify/<ticket_id>', methods=['POST'])
+def clarify(ticket_id):
+    data = request.get_json(silent=True) or {}
+    answer = data.get('answer', '')
+    if not answer:
+        return jsonify({'error': 'No answer provided'}), 400
+    
+    try:
+        if dag is not None:
+            result = dag.resume(ticket_id, answer)
+        else:
+            result = resume_clarification(ticket_id, answer)
+    except KeyError as e:
+        return jsonify({'error': e.args[0]}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 409
+    
+    response = format_result(result['text'], result)
+    response['ticket_id'] = ticket_id
+    return jsonify(response)
+
+@app.route('/metrics')
+def metrics():
+    stats = dag.get_stats() if dag is not None else {}
+    stats['batch_in_flight'] = batch_limiter.in_flight
+    stats['admission'] = admission.snapshot()
+    stats['monitoring'] = metrics_instance.snapshot()
+    stats['models'] = model_manager.stats()
+    return jsonify(stats)
+
 @app.route('/health')
 def health():
-    return jsonify({'status': 'healthy', 'model_loaded': dag is not None})
+    return jsonify({'status': 'healthy', 'model_loaded': dag is not None, 'worker_pid': os.getpid()})
 
 if __name__ == '__main__':
     print("Starting Self-Healing Classification Web App...")
-    print(f"Server will be available at http://0.0.0.0:5000")
-    print("Model will load on first classification request...")
-    app.run(host='0.0.0.0', port=5000, debug=False)
+    host = Config.SERVING_CONFIG["host"]
+    port = Config.SERVING_CONFIG["port"]
+
+    if Config.SERVING_CONFIG["workers"] > 1:
+        from src.app.prefork import PreforkServer
+        print("Loading models once before forking workers...")
+        PreforkServer(app, preload=preload_models).run()
+    else:
+        print(f"Server will be available at http://{host}:{port}")
+        print("Model will load on first classification request...")
+        app.run(host=host, port=port, debug=False)